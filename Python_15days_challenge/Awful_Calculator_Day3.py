@@ -1,5 +1,11 @@
+import tempfile
+
 import streamlit as st
-import pandas as pd
+
+from calc_batch import OPERATIONS, run_batch
+from calc_expr import ExprError, compile_expr
+from calc_history import HistoryStore
+from tabular_io import MIME_TYPES, ResultWriter, available_formats, read_columns
 
 # -------------------------------
 # Page config
@@ -14,7 +20,7 @@ st.set_page_config(
 # Session State Init (History)
 # -------------------------------
 if "history" not in st.session_state:
-    st.session_state.history = []  # list of dicts: {"a":..,"b":..,"op":..,"res":..}
+    st.session_state.history = HistoryStore()  # newest CALC_HISTORY_CAP in memory, older on disk
 
 
 # -------------------------------
@@ -251,18 +257,76 @@ st.markdown(
 # -------------------------------
 # Inputs
 # -------------------------------
-c1, c2 = st.columns(2)
-
-with c1:
-    num1_str = st.text_input("🔢 First number", value="0.0")
-
-with c2:
-    num2_str = st.text_input("🔢 Second number", value="0.0")
-
-operation = st.selectbox(
-    "👉 Choose operation",
-    ["+", "-", "×", "÷", "A % of B (A% of B)"]
-)
+calc_mode = st.radio("Mode", ["Two numbers", "Expression", "Batch file"], horizontal=True,
+                     label_visibility="collapsed")
+
+if calc_mode == "Batch file":
+    # Whole files of operands, computed column-wise; results go to a temp file, not the session
+    uploaded = st.file_uploader("📂 Operands file (CSV or Parquet)", type=["csv", "parquet"])
+    if uploaded:
+        same_op = "(same for every row)"
+        try:
+            columns = read_columns(uploaded, uploaded.name)
+        except Exception as e:
+            st.error(f"⚠️ Could not read the file: {e}")
+            columns = []
+        if columns:
+            b1, b2, b3 = st.columns(3)
+            a_col = b1.selectbox("A column", columns, index=0)
+            b_col = b2.selectbox("B column", columns, index=min(1, len(columns) - 1))
+            op_choices = [same_op] + columns
+            op_col = b3.selectbox("Operator column", op_choices,
+                                  index=op_choices.index("op") if "op" in columns else 0)
+            batch_op = st.selectbox("👉 Operation for every row", OPERATIONS) if op_col == same_op else None
+            out_fmt = st.selectbox("Output format", available_formats())
+
+            if st.button("💥 RUN BATCH 💥"):
+                out = tempfile.SpooledTemporaryFile(max_size=32 << 20)  # spills to disk when large
+                try:
+                    uploaded.seek(0)
+                    with ResultWriter(out, out_fmt) as w:
+                        stats = run_batch(uploaded, w, a_col, b_col, None if op_col == same_op else op_col,
+                                          batch_op, name=uploaded.name)
+                except (ValueError, RuntimeError) as e:
+                    out.close()
+                    st.error(f"⚠️ {e}")
+                else:
+                    old = st.session_state.get("batch")
+                    if old:
+                        old["file"].close()
+                    st.session_state.batch = {"file": out, "fmt": out_fmt, "stats": stats}
+
+    batch = st.session_state.get("batch")
+    if batch:
+        stats = batch["stats"]
+        st.success(f"✅ {stats.rows:,} rows in {stats.seconds:.2f}s ({stats.rows_per_s:,.0f} rows/s)")
+        if stats.errors:
+            st.warning("Masked rows: " + ", ".join(f"{k} {n:,}" for k, n in stats.errors.items()))
+        st.dataframe(stats.preview, use_container_width=True, hide_index=True)
+
+        def batch_bytes(f=batch["file"]):
+            f.seek(0)
+            return f.read()
+
+        st.download_button("⬇️ Download results", data=batch_bytes, file_name=f"calc_results.{batch['fmt']}",
+                           mime=MIME_TYPES[batch["fmt"]], on_click="ignore")
+
+elif calc_mode == "Expression":
+    expr_str = st.text_input("🧮 Expression", value="(2 + 3) × 4 - 15% of 80",
+                             help="+ - × ÷ ^, parentheses, 15% of 80, sqrt, round, min, max, log, sin, pi, ...")
+else:
+    c1, c2 = st.columns(2)
+
+    with c1:
+        num1_str = st.text_input("🔢 First number", value="0.0")
+
+    with c2:
+        num2_str = st.text_input("🔢 Second number", value="0.0")
+
+    operation = st.selectbox(
+        "👉 Choose operation",
+        ["+", "-", "×", "÷", "A % of B (A% of B)"]
+    )
 
 # -------------------------------
 # Calculation
@@ -270,7 +334,19 @@ operation = st.selectbox(
 result = None
 error_msg = ""
 
-if st.button("💥 CALCULATE 💥"):
+calculate = calc_mode != "Batch file" and st.button("💥 CALCULATE 💥")
+
+if calculate and calc_mode == "Expression":
+    try:
+        # Compiled once per distinct expression (cached), then evaluated
+        result = compile_expr(expr_str).evaluate()
+        st.session_state.history.append(
+            {"First": None, "Op": expr_str.strip(), "Second": None, "Result": result}
+        )
+    except ExprError as e:
+        error_msg = f"⚠️ {e}"
+
+elif calculate:
     try:
         a = float(num1_str)
         b = float(num2_str)
@@ -311,10 +387,40 @@ elif result is not None:
 # -------------------------------
 # History
 # -------------------------------
-if st.session_state.history:
+history = st.session_state.history
+if history:
     st.markdown('<div class="history-title">📜 Calculation history</div>', unsafe_allow_html=True)
-    df = pd.DataFrame(st.session_state.history)
-    st.dataframe(df, use_container_width=True)
+    info = history.stats()
+    st.caption(f"{info['entries']:,} calculations · {info['in_memory']:,} in memory · "
+               f"{info['spilled']:,} on disk ({info['disk_bytes'] / 1024:,.0f} KiB)")
+
+    query = st.text_input("🔍 Search history", placeholder="e.g. ÷, sqrt, 42")
+    if query.strip():
+        found = history.search(query)
+        st.caption(f"Newest {len(found)} match(es)")
+        st.dataframe(found, use_container_width=True, hide_index=True)
+    else:
+        h1, h2 = st.columns(2)
+        with h1:
+            page_size = st.selectbox("Rows per page", [10, 25, 50, 100], index=1)
+        with h2:
+            page_count = history.pages(page_size)
+            page_no = st.number_input(f"Page (1 = newest, of {page_count:,})", min_value=1,
+                                      max_value=page_count, value=1)
+        st.dataframe(history.page(page_no - 1, page_size), use_container_width=True, hide_index=True)
+
+    def history_csv() -> bytes:
+        with history.export_csv() as f:   # streamed from the log, built only when downloaded
+            return f.read()
+
+    h1, h2 = st.columns(2)
+    with h1:
+        st.download_button("⬇️ Export history (CSV)", data=history_csv,
+                           file_name="calc_history.csv", mime="text/csv", on_click="ignore")
+    with h2:
+        if st.button("🗑️ Clear history"):
+            history.clear()
+            st.rerun()
 
 # -------------------------------
 # Voice Input Helper (Web Speech API)
@@ -323,8 +429,8 @@ voice_html = """
 <div class="voice-card">
   <div class="voice-title">🎙️ Voice Input Helper (experimental)</div>
   <p style="font-size:0.95rem; margin-bottom:0.6rem;">
-    Click <strong>Start voice</strong>, speak a number or expression (like "twenty three point five"),<br>
-    then copy the recognized text into the calculator boxes.
+    Click <strong>Start voice</strong>, speak a number or expression (like "23.5 times 4 plus 10 percent of 80"),<br>
+    then copy the recognized text into the number boxes or the <strong>Expression</strong> box.
   </p>
   <button class="voice-btn" onclick="startDictation()">🎙️ Start voice</button>
   <p id="voice-status" style="margin-top:0.6rem; font-size:0.9rem; opacity:0.9;">Status: idle</p>
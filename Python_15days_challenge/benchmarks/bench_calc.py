@@ -0,0 +1,141 @@
+"""
+Calculator evaluation: the original two-operand if/elif path vs `calc_expr`.
+
+For the five original operations and for a longer formula, times (best of
+--repeat, microseconds per evaluation):
+
+    legacy      float() both inputs + the app's if/elif chain (two operands only)
+    parse       tokenise + parse + compile + evaluate every time (cache bypassed)
+    cached      `evaluate(text)` on a repeated text (compile cache hit)
+    variables   one compiled formula, evaluated with new values each time
+
+Every engine result is checked against the legacy result first.
+
+The batch section computes --batch-rows random (a, b, operator) rows with the
+legacy function in a Python loop and with `calc_batch` (kernel only, and
+end to end from a CSV file to CSV / Parquet output), in rows per second.
+
+Usage:
+    python benchmarks/bench_calc.py
+    python benchmarks/bench_calc.py --n 50000 --repeat 5 --batch-rows 2000000
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "benchmarks"))
+import calc_expr  # noqa: E402
+from bench_common import best_time  # noqa: E402
+from calc_batch import calculate, operation_codes, run_batch  # noqa: E402
+from calc_expr import compile_expr, evaluate  # noqa: E402
+from tabular_io import ResultWriter, available_formats  # noqa: E402
+
+OPERATIONS = ["+", "-", "×", "÷", "A % of B (A% of B)"]
+EXPR_OP = {"+": "a + b", "-": "a - b", "×": "a × b", "÷": "a ÷ b", "A % of B (A% of B)": "a% of b"}
+FORMULA = "(a + b) × 1.2 - sqrt(a^2 + b^2) / 4 + 15% of b"
+
+# -------------------------------
+# Reference: original app code path
+# -------------------------------
+def legacy_calculate(num1_str: str, num2_str: str, operation: str) -> Optional[float]:
+    result = None
+    a = float(num1_str)
+    b = float(num2_str)
+    if operation == "+":
+        result = a + b
+    elif operation == "-":
+        result = a - b
+    elif operation == "×":
+        result = a * b
+    elif operation == "÷":
+        if b == 0:
+            return None
+        result = a / b
+    elif operation.startswith("A % of B"):
+        result = (a / 100.0) * b
+    return result
+
+def best_us(fn: Callable[[], None], n: int, repeat: int) -> float:
+    return best_time(fn, repeat)[0] / n * 1e6
+
+def main(args) -> int:
+    rng = random.Random(0)
+    pairs: List[Tuple[str, str]] = [(f"{rng.uniform(1, 1000):.2f}", f"{rng.uniform(1, 1000):.2f}") for _ in range(args.n)]
+    uncached = calc_expr._compile_cached.__wrapped__
+
+    print(f"{'case':20} {'legacy':>9} {'parse':>9} {'cached':>9} {'variables':>10}   (us/eval)")
+    for op in OPERATIONS:
+        template = EXPR_OP[op]
+        texts = [template.replace("a", a, 1).replace("b", b, 1) for a, b in pairs]
+        values = [{"a": float(a), "b": float(b)} for a, b in pairs]
+        compiled = compile_expr(template)
+        for (a, b), text, env in zip(pairs[:200], texts, values):
+            expected = legacy_calculate(a, b, op)
+            for got in (evaluate(text), compiled(env)):
+                if abs(got - expected) > 1e-9 * max(1.0, abs(expected)):
+                    print(f"MISMATCH {op}: {text} -> {got} vs {expected}")
+                    return 1
+        hot = texts[0]
+        legacy = best_us(lambda: [legacy_calculate(a, b, op) for a, b in pairs], args.n, args.repeat)
+        parse = best_us(lambda: [uncached(t).evaluate() for t in texts], args.n, args.repeat)
+        cached = best_us(lambda: [evaluate(hot) for _ in range(args.n)], args.n, args.repeat)
+        subst = best_us(lambda: [compiled.evaluate(env) for env in values], args.n, args.repeat)
+        print(f"{op[:20]:20} {legacy:>9.2f} {parse:>9.2f} {cached:>9.2f} {subst:>10.2f}")
+
+    values = [{"a": float(a), "b": float(b)} for a, b in pairs]
+    texts = [FORMULA.replace("a", a).replace("b", b) for a, b in pairs]
+    compiled = compile_expr(FORMULA)
+    parse = best_us(lambda: [uncached(t).evaluate() for t in texts], args.n, args.repeat)
+    cached = best_us(lambda: [evaluate(texts[0]) for _ in range(args.n)], args.n, args.repeat)
+    subst = best_us(lambda: [compiled.evaluate(env) for env in values], args.n, args.repeat)
+    print(f"{'formula':20} {'n/a':>9} {parse:>9.2f} {cached:>9.2f} {subst:>10.2f}")
+    print(f"\nformula: {FORMULA}")
+    if args.batch_rows:
+        return bench_batch(args.batch_rows)
+    return 0
+
+def bench_batch(rows: int) -> int:
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({
+        "a": np.round(rng.uniform(-1000, 1000, rows), 2).astype(str),
+        "b": np.round(rng.uniform(-5, 5, rows)).astype(str),   # some zeros, for masked divisions
+        "op": np.array(OPERATIONS, dtype=object)[rng.integers(0, len(OPERATIONS), rows)],
+    })
+    print(f"\nbatch: {rows:,} rows")
+    sample = frame.head(min(rows, 200_000))
+    t0 = time.perf_counter()
+    expected = [legacy_calculate(a, b, op) for a, b, op in sample.itertuples(index=False)]
+    loop_rate = len(sample) / (time.perf_counter() - t0)
+    a, b = frame["a"].astype(float).to_numpy(), frame["b"].astype(float).to_numpy()
+    t0 = time.perf_counter()
+    result, _ = calculate(a, b, operation_codes(frame["op"]))
+    kernel_rate = rows / (time.perf_counter() - t0)
+    want = np.array([np.nan if e is None else e for e in expected])
+    if not np.allclose(result[:len(sample)], want, equal_nan=True, rtol=0, atol=0):
+        print("MISMATCH between legacy and vectorized batch results")
+        return 1
+    print(f"{'legacy loop':28} {loop_rate:>14,.0f} rows/s")
+    print(f"{'kernel':28} {kernel_rate:>14,.0f} rows/s")
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "ops.csv"
+        frame.to_csv(src, index=False)
+        for fmt in [f for f in ("csv", "parquet") if f in available_formats()]:
+            with ResultWriter(Path(tmp) / f"out.{fmt}") as w:
+                stats = run_batch(src, w)
+            print(f"{'csv -> ' + fmt + ' (end to end)':28} {stats.rows_per_s:>14,.0f} rows/s")
+    return 0
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Benchmark calculator evaluation paths")
+    ap.add_argument("--n", type=int, default=20_000, help="Evaluations per timed run (default: 20000)")
+    ap.add_argument("--repeat", type=int, default=3, help="Timed runs per case; best is kept")
+    ap.add_argument("--batch-rows", type=int, default=1_000_000, help="Rows for the batch section (0 = skip)")
+    raise SystemExit(main(ap.parse_args()))
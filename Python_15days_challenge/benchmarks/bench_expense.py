@@ -0,0 +1,208 @@
+"""
+Benchmarks for the Expense Splitter hot paths: balance computation and
+settlement, on synthetic ledgers from 10 to 1M participants.
+
+For every (size, skew) case it records wall time (best of --repeat), peak
+traced memory and the number of transfers, for the current engine
+(`expense_core`) and, up to --legacy-max people, for the original
+row-by-row implementation kept below as a reference. Legacy shares are
+float-rounded rather than exact, so transfer counts can differ between the
+two; each legacy case also checks that the engine returns the same transfers
+as the legacy greedy when both see the same balances.
+
+Skews:
+    balanced       about half the people paid, half owe
+    few_creditors  1% of people paid for everyone (many debtors)
+    few_debtors    99% paid a bit, 1% owe a lot
+
+Usage:
+    python benchmarks/bench_expense.py --save-baseline            # write baseline.json
+    python benchmarks/bench_expense.py --check                    # compare against it
+    python benchmarks/bench_expense.py --sizes 10,1000 --repeat 5 --out run.json
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "benchmarks"))
+from bench_common import measure  # noqa: E402
+from expense_core import Ledger, minimal_settlements, normalize_name  # noqa: E402
+
+HERE = Path(__file__).resolve().parent
+DEFAULT_BASELINE = HERE / "baseline.json"
+DEFAULT_SIZES = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+SKEWS = ["balanced", "few_creditors", "few_debtors"]
+
+# -------------------------------
+# Reference: original implementation
+# -------------------------------
+def legacy_balances(edited: pd.DataFrame, total_amount: float, decimals: int) -> pd.DataFrame:
+    participants = []
+    for i, row in edited.iterrows():
+        nm = normalize_name(i, str(row.get("name", "")))
+        paid = float(row.get("paid", 0.0) or 0.0)
+        participants.append({"name": nm, "paid": paid})
+    df = pd.DataFrame(participants)
+    paid_total = round(float(df["paid"].sum()), decimals)
+    pot = round(total_amount if total_amount > 0 else paid_total, decimals)
+    share = round(pot / len(df), decimals) if len(df) else 0.0
+    df["share"] = share
+    df["balance"] = (df["paid"] - df["share"]).round(decimals)
+    return df
+
+def legacy_settlements(balances: Dict[str, float], decimals: int = 2) -> List[Tuple[str, str, float]]:
+    bal = {k: round(v, decimals) for k, v in balances.items()}
+    debtors = [(p, -amt) for p, amt in bal.items() if amt < 0]
+    creditors = [(p, amt) for p, amt in bal.items() if amt > 0]
+    debtors.sort(key=lambda x: x[1], reverse=True)
+    creditors.sort(key=lambda x: x[1], reverse=True)
+    i = j = 0
+    transfers: List[Tuple[str, str, float]] = []
+    while i < len(debtors) and j < len(creditors):
+        d_name, d_amt = debtors[i]
+        c_name, c_amt = creditors[j]
+        pay = min(d_amt, c_amt)
+        pay_r = round(pay, decimals)
+        if pay_r > 0:
+            transfers.append((d_name, c_name, pay_r))
+        d_amt = round(d_amt - pay, decimals)
+        c_amt = round(c_amt - pay, decimals)
+        if d_amt == 0:
+            i += 1
+        else:
+            debtors[i] = (d_name, d_amt)
+        if c_amt == 0:
+            j += 1
+        else:
+            creditors[j] = (c_name, c_amt)
+    return transfers
+
+# -------------------------------
+# Synthetic ledgers
+# -------------------------------
+def make_ledger(n: int, skew: str, seed: int = 0) -> pd.DataFrame:
+    """name,paid table of `n` people; same (n, skew, seed) => same table."""
+    rng = np.random.default_rng(seed + n)
+    paid = np.zeros(n)
+    k = max(1, n // 100)
+    if skew == "balanced":
+        payers = rng.random(n) < 0.5
+        paid[payers] = rng.gamma(2.0, 50.0, payers.sum())
+    elif skew == "few_creditors":
+        paid[rng.choice(n, k, replace=False)] = rng.gamma(2.0, 50.0 * n / k, k)
+    elif skew == "few_debtors":
+        paid[:] = rng.gamma(2.0, 50.0, n)
+        paid[rng.choice(n, k, replace=False)] = 0.0
+    else:
+        raise ValueError(f"Unknown skew {skew!r}")
+    return pd.DataFrame({"name": [f"P{i}" for i in range(n)], "paid": paid.round(2)})
+
+def run_case(n: int, skew: str, repeat: int, legacy_max: int, decimals: int = 2) -> Dict[str, Dict]:
+    table = make_ledger(n, skew)
+    out: Dict[str, Dict] = {}
+    case = f"{skew}/{n}"
+    reps = repeat if n <= 100_000 else 1
+
+    t, peak, ledger = measure(lambda: Ledger.equal_split(table["name"], table["paid"], 0.0, decimals), reps)
+    out[f"{case}/engine/balances"] = {"seconds": t, "peak_bytes": peak}
+    t, peak, res = measure(lambda: ledger.settle(), reps)
+    out[f"{case}/engine/settle"] = {"seconds": t, "peak_bytes": peak, "transfers": len(res)}
+
+    if n <= legacy_max:
+        t, peak, df = measure(lambda: legacy_balances(table, 0.0, decimals), reps)
+        out[f"{case}/legacy/balances"] = {"seconds": t, "peak_bytes": peak}
+        balances = {r["name"]: float(r["balance"]) for _, r in df.iterrows()}
+        t, peak, legacy = measure(lambda: legacy_settlements(balances, decimals), reps)
+        out[f"{case}/legacy/settle"] = {"seconds": t, "peak_bytes": peak, "transfers": len(legacy),
+                                        # the engine must give the same transfers on the same balances
+                                        "engine_matches": minimal_settlements(balances, decimals) == legacy}
+    return out
+
+# -------------------------------
+# Baseline comparison
+# -------------------------------
+def compare(current: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float, min_seconds: float) -> List[str]:
+    """
+    Human-readable regressions of the engine: slower/bigger beyond tolerance,
+    or a changed transfer count. Legacy rows are reference numbers only.
+    """
+    problems = []
+    for key, base in baseline.items():
+        cur = current.get(key)
+        if cur is None or "/engine/" not in key:
+            continue
+        if cur["seconds"] > base["seconds"] * (1 + tolerance) and cur["seconds"] - base["seconds"] > min_seconds:
+            problems.append(f"{key}: time {base['seconds'] * 1000:.2f} ms -> {cur['seconds'] * 1000:.2f} ms")
+        if cur["peak_bytes"] > base["peak_bytes"] * (1 + tolerance) and cur["peak_bytes"] - base["peak_bytes"] > 1 << 20:
+            problems.append(f"{key}: peak memory {base['peak_bytes'] / 2**20:.1f} MiB -> {cur['peak_bytes'] / 2**20:.1f} MiB")
+        if "transfers" in base and cur.get("transfers") != base["transfers"]:
+            problems.append(f"{key}: transfers {base['transfers']} -> {cur.get('transfers')}")
+    return problems
+
+def main(args) -> int:
+    if args.check and not args.save_baseline and not Path(args.baseline).exists():
+        print(f"No baseline at {args.baseline}; run with --save-baseline first.")
+        return 2
+    sizes = [int(s) for s in args.sizes.split(",")] if args.sizes else DEFAULT_SIZES
+    skews = args.skews.split(",") if args.skews else SKEWS
+    results: Dict[str, Dict] = {}
+    print(f"{'case':42} {'ms':>10} {'peak MiB':>9} {'transfers':>10}")
+    for n in sizes:
+        for skew in skews:
+            for key, row in run_case(n, skew, args.repeat, args.legacy_max).items():
+                results[key] = row
+                print(f"{key:42} {row['seconds'] * 1000:>10.2f} {row['peak_bytes'] / 2**20:>9.1f} "
+                      f"{row.get('transfers', ''):>10}")
+            leg = results.get(f"{skew}/{n}/legacy/settle")
+            if leg and not leg["engine_matches"]:
+                print(f"  ! {skew}/{n}: engine transfers differ from the legacy greedy on the same balances")
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2))
+        print(f"\nSaved: {Path(args.out).resolve()}")
+    if args.save_baseline:
+        Path(args.baseline).write_text(json.dumps(report, indent=2))
+        print(f"\nBaseline saved: {Path(args.baseline).resolve()}")
+        return 0
+    if args.check:
+        baseline = json.loads(Path(args.baseline).read_text())["results"]
+        problems = compare(results, baseline, args.tolerance, args.min_ms / 1000)
+        if problems:
+            print(f"\nREGRESSIONS vs {args.baseline} (tolerance {args.tolerance:.0%}):")
+            for p in problems:
+                print("  -", p)
+            return 1
+        print(f"\nNo regressions vs {args.baseline}.")
+    return 0
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Benchmark expense balances and settlements")
+    ap.add_argument("--sizes", help="Comma-separated participant counts (default: 10..1M)")
+    ap.add_argument("--skews", help=f"Comma-separated skews (default: {','.join(SKEWS)})")
+    ap.add_argument("--repeat", type=int, default=3, help="Timed runs per case; best is kept (1 above 100k)")
+    ap.add_argument("--legacy-max", type=int, default=100_000, help="Largest size to run the legacy code on")
+    ap.add_argument("--out", help="Write this run's results to a JSON file")
+    ap.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON path")
+    ap.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    ap.add_argument("--check", action="store_true", help="Compare against the baseline; exit 1 on regressions")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown/growth (default: 0.25)")
+    ap.add_argument("--min-ms", type=float, default=1.0, help="Ignore time differences smaller than this")
+    raise SystemExit(main(ap.parse_args()))
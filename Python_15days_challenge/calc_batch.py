@@ -0,0 +1,192 @@
+"""
+Vectorized batch mode for the Vivid Calculator.
+
+Takes a CSV or Parquet file of operands (and optionally a per-row operator)
+and computes every row with whole-column NumPy operations: operators are
+mapped to small integer codes once per distinct spelling, then each of the
+five operations is one masked ufunc call over the chunk. Division by zero,
+non-numeric operands and unknown operators are masked (result left empty,
+reason in the `error` column) instead of raising.
+
+Input is read and results are written chunk by chunk (`tabular_io`, so any
+of the export formats), so memory stays bounded by the chunk size, not the
+file size.
+
+Usage:
+    python calc_batch.py prices.csv -o results.csv --a price --b rate --operation "A % of B"
+    python calc_batch.py operands.parquet -o results.parquet       # columns a, b, op
+"""
+import argparse
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from tabular_io import CHUNK_ROWS, ResultWriter, available_formats, format_from_path, iter_columns, read_columns
+
+# Optional: Arrow output tables and faster number parsing
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    HAS_PYARROW = True
+except Exception:
+    HAS_PYARROW = False
+
+BATCH_CHUNK_ROWS = CHUNK_ROWS
+PREVIEW_ROWS = 20
+OPERATIONS = ("+", "-", "×", "÷", "A % of B (A% of B)")  # the app's labels; codes are their indexes
+PERCENT_OF = 4
+
+# Accepted spellings (lower-cased, spaces removed) -> operation code
+_OP_CODES: Dict[str, int] = {}
+for _code, _names in enumerate((
+    ("+", "plus", "add"),
+    ("-", "−", "minus", "subtract"),
+    ("×", "*", "x", "times", "multiply"),
+    ("÷", "/", "divide", "dividedby"),
+    ("%", "%of", "of", "percentof", "a%ofb", "a%ofb(a%ofb)"),
+)):
+    for _name in _names:
+        _OP_CODES[_name] = _code
+
+# What float() / pd.to_numeric accept, minus the rarely wanted "nan"
+_NUMBER = r"^\s*[-+]?(?:(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?|[iI][nN][fF](?:[iI][nN][iI][tT][yY])?)\s*$"
+
+OK, INVALID_NUMBER, UNKNOWN_OPERATOR, DIVISION_BY_ZERO = range(4)
+ERRORS = np.array(["", "invalid number", "unknown operator", "division by zero"], dtype=object)
+
+def operation_code(op: str) -> int:
+    """Code for one operator spelling, -1 if unknown."""
+    return _OP_CODES.get("".join(str(op).split()).lower(), -1)
+
+def operation_codes(ops: pd.Series) -> np.ndarray:
+    """Per-row operator codes; each distinct spelling is looked up once."""
+    labels, uniques = pd.factorize(ops, use_na_sentinel=True)
+    lookup = np.array([operation_code(u) for u in uniques] + [-1], dtype=np.int8)
+    return lookup[labels]  # the NA sentinel (-1) picks the trailing "unknown"
+
+# -------------------------------
+# Kernel
+# -------------------------------
+def calculate(a: np.ndarray, b: np.ndarray, codes: np.ndarray) -> tuple:
+    """
+    (result, status) for float operand columns and operator codes. Rows that
+    can't be computed get NaN and a non-zero status (see ERRORS).
+    """
+    result = np.full(len(a), np.nan)
+    status = np.zeros(len(a), dtype=np.int8)
+    valid = ~(np.isnan(a) | np.isnan(b))
+    status[~valid] = INVALID_NUMBER
+    status[valid & (codes < 0)] = UNKNOWN_OPERATOR
+    zero = valid & (codes == 3) & (b == 0)
+    status[zero] = DIVISION_BY_ZERO
+    ok = status == OK
+    np.add(a, b, out=result, where=ok & (codes == 0))
+    np.subtract(a, b, out=result, where=ok & (codes == 1))
+    np.multiply(a, b, out=result, where=ok & (codes == 2))
+    np.divide(a, b, out=result, where=ok & (codes == 3))
+    pct = ok & (codes == PERCENT_OF)
+    if pct.any():
+        result[pct] = (a[pct] / 100.0) * b[pct]  # same formula as the single calculation
+    return result, status
+
+# -------------------------------
+# Output
+# -------------------------------
+def result_frame(chunk: pd.DataFrame, result: np.ndarray, status: np.ndarray) -> Union[pd.DataFrame, "pa.Table"]:
+    """Input columns + `result` (empty where masked) + `error`; an Arrow table when pyarrow is there."""
+    if HAS_PYARROW:
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        table = table.append_column("result", pa.array(result, mask=status != OK))
+        return table.append_column("error", pa.DictionaryArray.from_arrays(status, ERRORS.tolist()))
+    return chunk.assign(result=result, error=ERRORS[status])
+
+def to_float(col: pd.Series) -> np.ndarray:
+    """Numbers as float64, NaN where a value isn't one."""
+    if pd.api.types.is_numeric_dtype(col):
+        return col.to_numpy(dtype=np.float64, na_value=np.nan)
+    if HAS_PYARROW:
+        # Validate with one regex pass, then a strict cast of only the valid strings
+        arr = pa.array(col, type=pa.string())
+        arr = pc.if_else(pc.match_substring_regex(arr, _NUMBER), arr, "nan")
+        return pc.cast(pc.utf8_trim_whitespace(arr), pa.float64()).to_numpy(zero_copy_only=False)
+    return pd.to_numeric(col.astype(str).str.strip(), errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+
+# -------------------------------
+# Batch
+# -------------------------------
+@dataclass
+class BatchStats:
+    rows: int = 0
+    seconds: float = 0.0
+    errors: Dict[str, int] = field(default_factory=dict)
+    preview: Optional[pd.DataFrame] = None   # first PREVIEW_ROWS output rows
+
+    @property
+    def rows_per_s(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+def run_batch(source: Union[str, Path, BinaryIO], writer: ResultWriter, a_col: str = "a", b_col: str = "b",
+              op_col: Optional[str] = "op", operation: Optional[str] = None, name: str = "",
+              chunk_rows: int = BATCH_CHUNK_ROWS) -> BatchStats:
+    """
+    Compute every row of `source` into `writer`: the input columns (each
+    once, so A and B may be the same column) plus `result` and `error`.
+    Operators come from `op_col`, or `operation` for all rows. ValueError
+    for missing columns or an unknown `operation`.
+    """
+    columns = read_columns(source, name)
+    wanted = list(dict.fromkeys([a_col, b_col] + ([op_col] if op_col else [])))
+    missing = [c for c in wanted if c not in columns]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+    fixed = None
+    if not op_col:
+        fixed = operation_code(operation or "")
+        if fixed < 0:
+            raise ValueError(f"Unknown operation {operation!r}; use one of {', '.join(OPERATIONS)}")
+
+    stats = BatchStats()
+    counts = np.zeros(len(ERRORS), dtype=np.int64)
+    start = time.perf_counter()
+    for chunk in iter_columns(source, wanted, name, chunk_rows):
+        a, b = to_float(chunk[a_col]), to_float(chunk[b_col])
+        codes = operation_codes(chunk[op_col]) if op_col else np.full(len(chunk), fixed, dtype=np.int8)
+        result, status = calculate(a, b, codes)
+        counts += np.bincount(status, minlength=len(ERRORS))
+        out = result_frame(chunk, result, status)
+        writer.write(out)
+        if stats.preview is None:
+            head = out.slice(0, PREVIEW_ROWS) if HAS_PYARROW else out.head(PREVIEW_ROWS)
+            stats.preview = head.to_pandas() if HAS_PYARROW else head
+        stats.rows += len(chunk)
+    stats.seconds = time.perf_counter() - start
+    stats.errors = {ERRORS[i]: int(n) for i, n in enumerate(counts) if i != OK and n}
+    return stats
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Compute a file of calculator operations in bulk")
+    ap.add_argument("input", help="CSV or Parquet file with operand (and operator) columns")
+    ap.add_argument("-o", "--out", default="calc_results.csv", help="Output file; format from the extension")
+    ap.add_argument("--a", default="a", help="Column with A (default: a)")
+    ap.add_argument("--b", default="b", help="Column with B (default: b)")
+    ap.add_argument("--op", default="op", help="Column with the operator (default: op)")
+    ap.add_argument("--operation", help="Apply this operation to every row instead of an operator column")
+    ap.add_argument("--chunk", type=int, default=BATCH_CHUNK_ROWS, help="Rows per chunk")
+    args = ap.parse_args()
+    fmt = format_from_path(args.out)
+    if fmt not in available_formats():
+        raise SystemExit(f"{fmt} output needs pyarrow (pip install pyarrow)")
+    try:
+        with ResultWriter(args.out, fmt) as w:
+            s = run_batch(args.input, w, args.a, args.b, None if args.operation else args.op, args.operation,
+                          chunk_rows=args.chunk)
+    except ValueError as e:
+        raise SystemExit(f"Error: {e}")
+    print(f"Rows       : {s.rows:,}")
+    print(f"Errors     : {', '.join(f'{k} {n:,}' for k, n in s.errors.items()) or 'none'}")
+    print(f"Time       : {s.seconds:.2f}s ({s.rows_per_s:,.0f} rows/s)")
+    print(f"Saved      : {Path(args.out).resolve()}")
@@ -0,0 +1,341 @@
+"""
+Safe expression engine for the Vivid Calculator.
+
+Expressions are tokenised and parsed (precedence climbing) into a small
+AST, which is then compiled into nested Python closures; nothing is ever
+passed to `eval`/`exec`, and only the numbers, operators, constants and
+functions listed here exist. Compiled expressions are cached by text, so
+re-evaluating an expression (or the same formula with different variable
+values) skips tokenising and parsing. Constant sub-expressions are folded
+at compile time.
+
+Syntax:
+    numbers        2, 2.5, .5, 1e3
+    operators      + - * / ^ (also ×, ÷, −, **), unary + and -
+    percent        50% is 0.5; "15% of 80" is 12 (same as the "A % of B" operation)
+    grouping       ( ... )
+    functions      sqrt(x), abs(x), round(x[, n]), min(a, b, ...), max(...),
+                   log(x[, base]), ln, log10, log2, exp, sin, cos, tan (radians),
+                   asin, acos, atan, radians, degrees, floor, ceil
+    constants      pi, e, tau
+    variables      any other name, supplied at evaluation time
+    words          plus, minus, times, over, "divided by", percent (for dictated input)
+
+`^` binds tighter than unary minus (-2^2 = -4) and is right-associative.
+Everything is evaluated in floats; errors of any kind raise `ExprError`.
+
+Usage:
+    python calc_expr.py "(2 + 3) × 4 - 15% of 80"
+    python calc_expr.py "price * (1 + vat%)" --var price=120 --var vat=20
+"""
+import argparse
+import math
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+MAX_LENGTH = 1_000          # characters per expression
+COMPILE_CACHE_SIZE = 1_024  # compiled expressions kept per process
+
+class ExprError(ValueError):
+    """Invalid expression, unknown name, or a failed evaluation (e.g. division by zero)."""
+
+# -------------------------------
+# Vocabulary
+# -------------------------------
+CONSTANTS: Dict[str, float] = {"pi": math.pi, "e": math.e, "tau": math.tau}
+
+def _round(x: float, n: float = 0) -> float:
+    return float(round(x, int(n)))
+
+def _log(x: float, base: float = math.e) -> float:
+    return math.log(x, base)
+
+def _min(*args: float) -> float:
+    return min(args)  # builtin min(x) would try to iterate a single number
+
+def _max(*args: float) -> float:
+    return max(args)
+
+# name -> (function, min args, max args or None for any)
+FUNCTIONS: Dict[str, Tuple[Callable[..., float], int, Optional[int]]] = {
+    "sqrt": (math.sqrt, 1, 1),
+    "abs": (abs, 1, 1),
+    "round": (_round, 1, 2),
+    "min": (_min, 1, None),
+    "max": (_max, 1, None),
+    "log": (_log, 1, 2),
+    "ln": (math.log, 1, 1),
+    "log10": (math.log10, 1, 1),
+    "log2": (math.log2, 1, 1),
+    "exp": (math.exp, 1, 1),
+    "sin": (math.sin, 1, 1),
+    "cos": (math.cos, 1, 1),
+    "tan": (math.tan, 1, 1),
+    "asin": (math.asin, 1, 1),
+    "acos": (math.acos, 1, 1),
+    "atan": (math.atan, 1, 1),
+    "radians": (math.radians, 1, 1),
+    "degrees": (math.degrees, 1, 1),
+    "floor": (lambda x: float(math.floor(x)), 1, 1),
+    "ceil": (lambda x: float(math.ceil(x)), 1, 1),
+}
+
+BINARY: Dict[str, Callable[[float, float], float]] = {
+    "+": lambda a, b: a + b,
+    "-": lambda a, b: a - b,
+    "*": lambda a, b: a * b,
+    "/": lambda a, b: a / b,
+    "^": math.pow,                      # raises instead of returning complex/huge ints
+    "of": lambda a, b: a * b,           # "15% of 80": the percent is already a fraction
+}
+
+# -------------------------------
+# Tokens
+# -------------------------------
+_TOKEN = re.compile(r"""
+    \s*(?:
+      (?P<num>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+    | (?P<word>divided\s+by\b|[A-Za-z_][A-Za-z_0-9]*)
+    | (?P<op>\*\*|[-+*/^%(),×÷−])
+    )""", re.VERBOSE)
+_ALIASES = {"×": "*", "÷": "/", "−": "-", "**": "^", "plus": "+", "minus": "-", "times": "*",
+            "over": "/", "percent": "%"}
+
+Token = Tuple[str, str, int]  # (kind, text, position)
+
+def tokenize(text: str) -> List[Token]:
+    tokens: List[Token] = []
+    pos = 0
+    end = len(text.rstrip())
+    while pos < end:
+        m = _TOKEN.match(text, pos)
+        if m is None or m.end() == pos:
+            at = len(text) - len(text[pos:].lstrip())
+            raise ExprError(f"Unexpected character {text[at]!r} at position {at + 1}")
+        kind = m.lastgroup
+        value = m.group(kind)
+        start = m.start(kind)
+        if kind == "word":
+            value = "/" if value.startswith("divided") else value
+            if value in _ALIASES or value == "/":
+                kind, value = "op", _ALIASES.get(value, value)
+            elif value == "of":
+                kind = "op"
+        elif kind == "op":
+            value = _ALIASES.get(value, value)
+        tokens.append((kind, value, start))
+        pos = m.end()
+    tokens.append(("end", "", end))
+    return tokens
+
+# -------------------------------
+# Parsing (precedence climbing) -> AST tuples
+# -------------------------------
+# AST: ("num", value) | ("name", name) | ("neg", node) | ("pct", node)
+#      | ("bin", op, left, right) | ("call", name, (args...))
+Node = tuple
+
+# binary operator -> (left binding power, right binding power)
+_INFIX = {"+": (10, 11), "-": (10, 11), "*": (20, 21), "/": (20, 21), "of": (20, 21), "^": (41, 40)}
+_PREFIX_BP = 30   # unary minus: tighter than * and /, looser than ^
+_PERCENT_BP = 50
+
+class _Parser:
+    def __init__(self, text: str):
+        self.tokens = tokenize(text)
+        self.i = 0
+
+    def peek(self) -> Token:
+        return self.tokens[self.i]
+
+    def take(self) -> Token:
+        tok = self.tokens[self.i]
+        self.i += 1
+        return tok
+
+    def expect(self, value: str) -> None:
+        kind, text, pos = self.take()
+        if text != value:
+            found = f"{text!r}" if kind != "end" else "the end"
+            raise ExprError(f"Expected {value!r} at position {pos + 1}, found {found}")
+
+    def parse(self) -> Node:
+        node = self.expr(0)
+        kind, text, pos = self.peek()
+        if kind != "end":
+            raise ExprError(f"Unexpected {text!r} at position {pos + 1}")
+        return node
+
+    def expr(self, min_bp: int) -> Node:
+        left = self.prefix()
+        while True:
+            kind, op, _ = self.peek()
+            if kind != "op":
+                break
+            if op == "%":
+                if _PERCENT_BP < min_bp:
+                    break
+                self.take()
+                left = ("pct", left)
+                continue
+            if op not in _INFIX:
+                break
+            lbp, rbp = _INFIX[op]
+            if lbp < min_bp:
+                break
+            self.take()
+            left = ("bin", op, left, self.expr(rbp))
+        return left
+
+    def prefix(self) -> Node:
+        kind, text, pos = self.take()
+        if kind == "num":
+            return ("num", float(text))
+        if kind == "word":
+            if self.peek()[1] == "(":
+                return self.call(text, pos)
+            return ("name", text)
+        if text in ("-", "+"):
+            operand = self.expr(_PREFIX_BP)
+            return ("neg", operand) if text == "-" else operand
+        if text == "(":
+            node = self.expr(0)
+            self.expect(")")
+            return node
+        found = f"{text!r}" if kind != "end" else "the end of the expression"
+        raise ExprError(f"Expected a number, name or '(' at position {pos + 1}, found {found}")
+
+    def call(self, name: str, pos: int) -> Node:
+        if name not in FUNCTIONS:
+            raise ExprError(f"Unknown function {name!r} at position {pos + 1}")
+        self.expect("(")
+        args: List[Node] = []
+        if self.peek()[1] != ")":
+            args.append(self.expr(0))
+            while self.peek()[1] == ",":
+                self.take()
+                args.append(self.expr(0))
+        self.expect(")")
+        _, lo, hi = FUNCTIONS[name]
+        if len(args) < lo or (hi is not None and len(args) > hi):
+            want = str(lo) if lo == hi else f"{lo}+" if hi is None else f"{lo}-{hi}"
+            raise ExprError(f"{name}() takes {want} argument(s), got {len(args)}")
+        return ("call", name, tuple(args))
+
+def parse(text: str) -> Node:
+    if len(text) > MAX_LENGTH:
+        raise ExprError(f"Expression is longer than {MAX_LENGTH} characters")
+    if not text.strip():
+        raise ExprError("Expression is empty")
+    return _Parser(text).parse()
+
+# -------------------------------
+# Compilation -> closures
+# -------------------------------
+Env = Mapping[str, float]
+Compiled = Callable[[Env], float]
+
+def _compile(node: Node, names: set) -> Tuple[Compiled, bool]:
+    """(closure, whether it depends on variables); variable-free parts are folded to constants."""
+    kind = node[0]
+    if kind == "num":
+        value = node[1]
+        return (lambda env: value), False
+    if kind == "name":
+        name = node[1]
+        if name in CONSTANTS:
+            value = CONSTANTS[name]
+            return (lambda env: value), False
+        names.add(name)
+        return (lambda env: env[name]), True
+    if kind == "neg":
+        inner, dynamic = _compile(node[1], names)
+        fn: Compiled = lambda env: -inner(env)
+    elif kind == "pct":
+        inner, dynamic = _compile(node[1], names)
+        fn = lambda env: inner(env) / 100.0
+    elif kind == "bin":
+        op = BINARY[node[1]]
+        (left, dl), (right, dr) = _compile(node[2], names), _compile(node[3], names)
+        dynamic = dl or dr
+        fn = lambda env: op(left(env), right(env))
+    else:  # call
+        func = FUNCTIONS[node[1]][0]
+        parts = [_compile(a, names) for a in node[2]]
+        args = [a for a, _ in parts]
+        dynamic = any(d for _, d in parts)
+        if len(args) == 1:
+            only = args[0]
+            fn = lambda env: func(only(env))
+        else:
+            fn = lambda env: func(*[a(env) for a in args])
+    if dynamic:
+        return fn, True
+    try:
+        value = float(fn({}))
+    except (ArithmeticError, ValueError, TypeError):
+        return fn, False  # e.g. 1/0: keep it, so the error surfaces at evaluation time
+    return (lambda env: value), False
+
+@dataclass(frozen=True)
+class Expression:
+    """A compiled expression; call it (or `evaluate`) with values for its variables."""
+    text: str
+    variables: FrozenSet[str]
+    _fn: Compiled = field(repr=False, compare=False)
+
+    def evaluate(self, variables: Optional[Env] = None) -> float:
+        env = variables or {}
+        missing = self.variables.difference(env)
+        if missing:
+            raise ExprError(f"No value for {', '.join(sorted(missing))}")
+        try:
+            result = float(self._fn(env))
+        except ZeroDivisionError:
+            raise ExprError("Division by zero") from None
+        except OverflowError:
+            raise ExprError("Result is too large") from None
+        except (ValueError, TypeError) as e:
+            raise ExprError(f"Math error: {e}") from None
+        except RecursionError:
+            raise ExprError("Expression is nested too deeply") from None
+        if math.isnan(result) or math.isinf(result):
+            raise ExprError("Result is not a finite number")
+        return result
+
+    def __call__(self, variables: Optional[Env] = None, **kwargs: float) -> float:
+        return self.evaluate({**(variables or {}), **kwargs} if kwargs else variables)
+
+@lru_cache(maxsize=COMPILE_CACHE_SIZE)
+def _compile_cached(text: str) -> Expression:
+    names: set = set()
+    try:
+        fn, _ = _compile(parse(text), names)
+    except RecursionError:
+        raise ExprError("Expression is nested too deeply") from None
+    return Expression(text=text, variables=frozenset(names), _fn=fn)
+
+def compile_expr(text: str) -> Expression:
+    """Parse and compile `text` (cached by its stripped text). ExprError if it is invalid."""
+    return _compile_cached(text.strip())
+
+def evaluate(text: str, variables: Optional[Env] = None) -> float:
+    """One-shot evaluation through the compile cache."""
+    return compile_expr(text).evaluate(variables)
+
+def cache_info() -> Dict[str, int]:
+    info = _compile_cached.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "maxsize": info.maxsize}
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Evaluate a calculator expression")
+    ap.add_argument("expression")
+    ap.add_argument("--var", action="append", default=[], metavar="NAME=VALUE", help="Variable value (repeatable)")
+    args = ap.parse_args()
+    try:
+        values = {k.strip(): float(v) for k, v in (item.split("=", 1) for item in args.var)}
+        print(evaluate(args.expression, values))
+    except (ExprError, ValueError) as e:
+        raise SystemExit(f"Error: {e}")
@@ -0,0 +1,159 @@
+"""
+Bounded calculation history for the Vivid Calculator.
+
+`HistoryStore` keeps the newest `cap` entries in memory (a ring buffer);
+when it fills up, the oldest block is appended to a per-session JSON-lines
+log on disk, so memory per session stays flat however long it lives. A
+sparse offset index (one byte offset every INDEX_EVERY spilled entries)
+lets a page of old entries be read with one seek, and search and export
+stream the log instead of loading it. The log is deleted with the store.
+
+Entries are (#, First, Op, Second, Result) rows; "#" counts from 1.
+"""
+import csv
+import io
+import json
+import os
+import tempfile
+import weakref
+from array import array
+from collections import deque
+from pathlib import Path
+from typing import Any, BinaryIO, Deque, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+from uuid import uuid4
+
+import pandas as pd
+
+HISTORY_CAP = int(os.environ.get("CALC_HISTORY_CAP", 500))      # entries kept in memory per session
+HISTORY_DIR = Path(os.environ.get("CALC_HISTORY_DIR", Path(tempfile.gettempdir()) / "vivid_calc_history"))
+INDEX_EVERY = 256                                                # spilled entries per offset-index slot
+COLUMNS = ("#", "First", "Op", "Second", "Result")
+
+Entry = Tuple[int, Any, str, Any, float]
+
+def _unlink(path: Path) -> None:
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+class HistoryStore:
+    """In-memory ring of the newest entries, older ones spilled to an append-only log."""
+
+    def __init__(self, cap: int = HISTORY_CAP, spill_dir: Union[str, Path] = HISTORY_DIR,
+                 index_every: int = INDEX_EVERY):
+        self.cap = max(1, cap)
+        self.spill_block = max(1, self.cap // 4)   # spill in blocks, not one entry per append
+        self.index_every = index_every
+        self.path = Path(spill_dir) / f"{uuid4().hex}.jsonl"
+        self.spilled = 0
+        self._ring: Deque[Entry] = deque()
+        self._offsets = array("Q")                 # byte offset of spilled entry k * index_every
+        self._size = 0                             # bytes written to the log
+        self._finalizer = weakref.finalize(self, _unlink, self.path)
+
+    def __len__(self) -> int:
+        return self.spilled + len(self._ring)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    # -------------------------------
+    # Writing
+    # -------------------------------
+    def append(self, entry: Mapping[str, Any]) -> int:
+        """Add {"First", "Op", "Second", "Result"}; returns the entry's number."""
+        n = len(self) + 1
+        self._ring.append((n, entry.get("First"), entry.get("Op", ""), entry.get("Second"), entry.get("Result")))
+        if len(self._ring) > self.cap:
+            self._spill(min(self.spill_block, len(self._ring) - 1))
+        return n
+
+    def _spill(self, count: int) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as f:
+            for _ in range(count):
+                if self.spilled % self.index_every == 0:
+                    self._offsets.append(self._size)
+                line = (json.dumps(self._ring.popleft(), ensure_ascii=False) + "\n").encode("utf-8")
+                f.write(line)
+                self._size += len(line)
+                self.spilled += 1
+
+    def clear(self) -> None:
+        self._ring.clear()
+        self._offsets = array("Q")
+        self.spilled = 0
+        self._size = 0
+        _unlink(self.path)
+
+    # -------------------------------
+    # Reading
+    # -------------------------------
+    def _read_spilled(self, start: int, stop: int) -> List[Entry]:
+        """Spilled entries [start, stop) in order: one seek to the nearest indexed offset."""
+        if start >= stop:
+            return []
+        slot = start // self.index_every
+        out: List[Entry] = []
+        with open(self.path, "rb") as f:
+            f.seek(self._offsets[slot])
+            for i, line in enumerate(f, slot * self.index_every):
+                if i >= stop:
+                    break
+                if i >= start:
+                    out.append(tuple(json.loads(line)))
+        return out
+
+    def _iter_all(self, prefilter: bytes = b"") -> Iterator[Entry]:
+        """Every entry, oldest first, streamed; logged lines not containing `prefilter` are skipped unparsed."""
+        if self.spilled:
+            with open(self.path, "rb") as f:
+                for line in f:
+                    if prefilter and prefilter not in line.lower():
+                        continue
+                    yield tuple(json.loads(line))
+        yield from list(self._ring)
+
+    def entries(self, start: int, stop: int) -> List[Entry]:
+        """Entries [start, stop) in chronological order (0 = oldest)."""
+        start, stop = max(0, start), min(len(self), stop)
+        disk = self._read_spilled(start, min(stop, self.spilled))
+        lo, hi = max(start, self.spilled) - self.spilled, stop - self.spilled
+        return disk + [self._ring[i] for i in range(lo, hi)] if hi > lo else disk
+
+    def pages(self, size: int) -> int:
+        return max(1, -(-len(self) // size))
+
+    def page(self, number: int, size: int = 50) -> pd.DataFrame:
+        """Page `number` (0 = newest) of `size` entries, newest first."""
+        stop = len(self) - number * size
+        rows = self.entries(stop - size, stop)
+        rows.reverse()
+        return pd.DataFrame(rows, columns=COLUMNS)
+
+    def search(self, query: str, limit: int = 100) -> pd.DataFrame:
+        """Newest `limit` entries whose operands, operation or result contain `query`."""
+        q = query.strip().lower()
+        raw = json.dumps(q, ensure_ascii=False)[1:-1].encode("utf-8")  # as it appears inside a logged line
+        found: Deque[Entry] = deque(maxlen=limit)
+        for e in self._iter_all(raw):
+            if any(q in str(v).lower() for v in e[1:] if v is not None):
+                found.append(e)
+        return pd.DataFrame(list(reversed(found)), columns=COLUMNS)
+
+    def export_csv(self, fh: Optional[BinaryIO] = None) -> BinaryIO:
+        """Whole history as CSV into `fh` (a spooled temp file by default), positioned at 0."""
+        fh = fh or tempfile.SpooledTemporaryFile(max_size=8 << 20)
+        text = io.TextIOWrapper(fh, encoding="utf-8", newline="")
+        w = csv.writer(text)
+        w.writerow(COLUMNS)
+        w.writerows(("" if v is None else v for v in e) for e in self._iter_all())
+        text.flush()
+        text.detach()
+        fh.seek(0)
+        return fh
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self), "in_memory": len(self._ring), "spilled": self.spilled,
+                "disk_bytes": self._size}
@@ -0,0 +1,140 @@
+"""
+Headless batch settlement for many expense groups.
+
+Each input CSV is one group with `name,paid` columns (same format as the
+Streamlit uploader). Every group is split equally and settled, and the
+results are written next to each other in the output directory:
+
+    <group>_balances.<fmt>     Name, Paid, Fair Share, Balance
+    <group>_settlements.<fmt>  Payer, Receiver, Amount
+    summary.csv                one row per group (rows, people, transfers, timing, error)
+
+With --combined FORMAT, all groups are also streamed into
+all_balances.<fmt> / all_settlements.<fmt> (with a leading `group` column)
+as results come back from the workers.
+
+Usage:
+    python expense_batch.py groups/ -o out/
+    python expense_batch.py "exports/2025-*/*.csv" -o out/ --workers 8 --solver exact
+    python expense_batch.py groups/ -o out/ --format parquet --combined parquet
+"""
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from expense_core import EXACT, GREEDY, Ledger, read_contributions
+from expense_export import balances_frame, settlements_frame, with_group
+from tabular_io import CSV, ResultWriter, available_formats
+
+def find_group_files(target: str) -> List[Path]:
+    """A directory (all *.csv inside) or a glob pattern, sorted."""
+    p = Path(target)
+    if p.is_dir():
+        return sorted(p.glob("*.csv"))
+    return sorted(Path(f) for f in glob.glob(target, recursive=True) if f.lower().endswith(".csv"))
+
+def settle_group(path: Path, out_dir: Path, decimals: int, solver: str, budget_s: float, fmt: str = CSV,
+                 combined: Optional[str] = None) -> Tuple[Dict, Optional[tuple]]:
+    """
+    Settle one group file and write its outputs. Never raises; errors go in
+    the summary row. With `combined`, also returns the (balances, settlements)
+    frames in that format for the parent to append to the combined files.
+    """
+    start = time.perf_counter()
+    stats = {"group": path.stem, "rows": 0, "people": 0, "transfers": 0, "method": "", "seconds": 0.0, "error": ""}
+    frames = None
+    try:
+        df, stats["rows"] = read_contributions(str(path), decimals)
+        ledger = Ledger.equal_split(df["name"], df["paid"], 0.0, decimals)
+        result = ledger.settle(solver=solver, budget_s=budget_s)
+        with ResultWriter(out_dir / f"{path.stem}_balances.{fmt}") as w:
+            w.write(balances_frame(ledger, fmt))
+        with ResultWriter(out_dir / f"{path.stem}_settlements.{fmt}") as w:
+            w.write(settlements_frame(result, decimals, fmt))
+        if combined:
+            frames = (with_group(balances_frame(ledger, combined), path.stem),
+                      with_group(settlements_frame(result, decimals, combined), path.stem))
+        stats.update(people=len(ledger), transfers=len(result), method=result.method)
+    except Exception as e:
+        stats["error"] = f"{type(e).__name__}: {e}"
+    stats["seconds"] = time.perf_counter() - start
+    return stats, frames
+
+def _settle_group_args(args: tuple) -> Tuple[Dict, Optional[tuple]]:
+    return settle_group(*args)
+
+def main(target: str, out_dir: Path, workers: int, decimals: int, solver: str, budget_s: float,
+         fmt: str = CSV, combined: Optional[str] = None):
+    files = find_group_files(target)
+    if not files:
+        print(f"No CSV files found for {target!r}")
+        return 1
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    jobs = [(f, out_dir, decimals, solver, budget_s, fmt, combined) for f in files]
+    results: List[Dict] = []
+    writers = []
+    if combined:
+        writers = [ResultWriter(out_dir / f"all_balances.{combined}"),
+                   ResultWriter(out_dir / f"all_settlements.{combined}")]
+
+    def collect(outputs):
+        # Results arrive one group at a time; combined files grow as they do
+        for stats, frames in outputs:
+            results.append(stats)
+            if frames:
+                for w, frame in zip(writers, frames):
+                    if len(frame):
+                        w.write(frame)
+
+    try:
+        if workers == 1:
+            collect(_settle_group_args(j) for j in jobs)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                # Small groups are cheap, so hand them out in batches to keep IPC overhead down
+                chunksize = max(1, len(jobs) // (workers * 8))
+                collect(pool.map(_settle_group_args, jobs, chunksize=chunksize))
+    finally:
+        for w in writers:
+            w.close()
+    wall = time.perf_counter() - start
+
+    summary = pd.DataFrame(results)
+    summary.to_csv(out_dir / "summary.csv", index=False)
+
+    ok = summary[summary["error"] == ""]
+    per_group = ok["seconds"].to_numpy() if len(ok) else np.zeros(1)
+    print(f"Groups     : {len(summary):,} ({len(summary) - len(ok):,} failed)")
+    print(f"Rows       : {int(summary['rows'].sum()):,}")
+    print(f"Transfers  : {int(summary['transfers'].sum()):,}")
+    print(f"Wall time  : {wall:.2f}s with {workers} worker(s)")
+    print(f"Throughput : {len(summary) / wall:,.1f} groups/s, {summary['rows'].sum() / wall:,.0f} rows/s")
+    print(f"Per group  : p50 {np.percentile(per_group, 50) * 1000:.1f} ms, "
+          f"p95 {np.percentile(per_group, 95) * 1000:.1f} ms, max {per_group.max() * 1000:.1f} ms")
+    print(f"Saved      : {out_dir.resolve()}")
+    for _, row in summary[summary["error"] != ""].head(10).iterrows():
+        print(f"  ! {row['group']}: {row['error']}")
+    return 0 if len(ok) == len(summary) else 2
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Settle many expense groups (name,paid CSVs) in parallel")
+    ap.add_argument("target", help="Directory of group CSVs, or a glob pattern such as 'groups/**/*.csv'")
+    ap.add_argument("-o", "--out", default="settlements_out", help="Output directory (default: settlements_out)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Process pool size (1 = no pool)")
+    ap.add_argument("--decimals", type=int, default=2, help="Rounding decimals / minor units (default: 2)")
+    ap.add_argument("--solver", choices=[GREEDY, EXACT], default=GREEDY)
+    ap.add_argument("--budget", type=float, default=1.0, help="Exact solver time budget per group, seconds")
+    ap.add_argument("--format", choices=available_formats(), default=CSV, help="Per-group output format")
+    ap.add_argument("--combined", choices=available_formats(), help="Also stream all groups into one file per table")
+    args = ap.parse_args()
+    raise SystemExit(main(args.target, Path(args.out), args.workers, args.decimals, args.solver, args.budget,
+                          args.format, args.combined))
@@ -0,0 +1,766 @@
+"""
+Settlement engine for the Expense Splitter.
+
+Everything here is plain NumPy/pandas with no Streamlit imports, so it can be
+used from scripts, notebooks and batch jobs as well as from the app.
+"""
+import hashlib
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Hashable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from tabular_io import CHUNK_ROWS, csv_header, iter_columns
+
+# -------------------------------
+# Helpers
+# -------------------------------
+def normalize_name(i: int, name: str) -> str:
+    n = (name or "").strip()
+    return n if n else f"Person {i+1}"
+
+def to_currency(x: float, symbol: str, decimals: int) -> str:
+    return f"{symbol}{x:,.{decimals}f}"
+
+# -------------------------------
+# Balances
+# -------------------------------
+def normalize_names(names: Sequence[str]) -> np.ndarray:
+    """
+    Vectorized `normalize_name`: strip every name and replace blanks
+    with "Person i" (1-based row position).
+    """
+    s = pd.Series(names, dtype="object").fillna("").astype(str).str.strip()
+    blank = s.eq("").to_numpy()
+    out = s.to_numpy(dtype=object)
+    if blank.any():
+        out[blank] = [f"Person {i + 1}" for i in np.flatnonzero(blank)]
+    return out
+
+def allocate(total: int, weights: Sequence[float]) -> np.ndarray:
+    """
+    Split the integer `total` in proportion to `weights` with largest-remainder
+    rounding: everyone gets the floor of their quota, and the leftover units go
+    to the largest fractional parts (ties in input order). The result always
+    sums exactly to `total`.
+    """
+    w = np.asarray(weights)
+    if len(w) == 0:
+        return np.zeros(0, dtype=np.int64)
+    if np.issubdtype(w.dtype, np.integer):
+        w = w.astype(np.int64)
+        w_sum = int(w.sum())
+        if w_sum <= 0:
+            raise ValueError("Weights must add up to a positive number.")
+        base, rem = np.divmod(total * w, w_sum)
+    else:
+        w = w.astype(np.float64)
+        w_sum = float(w.sum())
+        if w_sum <= 0:
+            raise ValueError("Weights must add up to a positive number.")
+        raw = total * (w / w_sum)
+        base = np.floor(raw).astype(np.int64)
+        rem = raw - base
+    leftover = int(np.clip(total - base.sum(), 0, len(w)))
+    if leftover:
+        base[np.argsort(-rem, kind="stable")[:leftover]] += 1
+    return base
+
+# Share modes: how the pot is divided between people
+EQUAL = "equal"
+WEIGHTS = "weights"
+PERCENT = "percent"
+FIXED = "fixed"
+SHARE_MODES = [EQUAL, WEIGHTS, PERCENT, FIXED]
+SHARE_BASIS_LABELS = {WEIGHTS: "Weight", PERCENT: "Percent", FIXED: "Fixed Share"}
+
+def allocate_shares(pot: int, n: int, mode: str = EQUAL, values: Optional[Sequence[float]] = None,
+                    decimals: int = 2) -> np.ndarray:
+    """
+    Shares of the integer `pot` (minor units) for `n` people, summing exactly to it.
+
+    - equal:   same share each
+    - weights: proportional to `values` (nights stayed, headcount, ...)
+    - percent: `values` are percentages and must add up to 100
+    - fixed:   `values` are fixed amounts in currency units; people left blank
+               (NaN) split whatever remains equally
+
+    Raises ValueError when the values can't produce a valid split.
+    """
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    if mode == EQUAL:
+        return allocate(pot, np.ones(n, dtype=np.int64))
+    vals = pd.to_numeric(pd.Series(values, dtype="object"), errors="coerce").to_numpy(dtype=np.float64)
+    if len(vals) != n:
+        raise ValueError(f"Expected {n} share values, got {len(vals)}.")
+    if mode in (WEIGHTS, PERCENT):
+        vals = np.nan_to_num(vals, nan=0.0)
+        if (vals < 0).any():
+            raise ValueError("Weights and percentages can't be negative.")
+        if mode == PERCENT and not np.isclose(vals.sum(), 100.0, atol=1e-6):
+            raise ValueError(f"Percentages add up to {vals.sum():g}%, not 100%.")
+        return allocate(pot, vals)
+    if mode == FIXED:
+        open_rows = np.isnan(vals)
+        share = np.zeros(n, dtype=np.int64)
+        share[~open_rows] = to_minor_units(vals[~open_rows], decimals)
+        if (share < 0).any():
+            raise ValueError("Fixed shares can't be negative.")
+        remainder = pot - int(share.sum())
+        if remainder < 0:
+            raise ValueError("Fixed shares add up to more than the total.")
+        if open_rows.any():
+            share[open_rows] = allocate(remainder, np.ones(int(open_rows.sum()), dtype=np.int64))
+        elif remainder:
+            raise ValueError("Fixed shares don't add up to the total; leave someone blank to take the remainder.")
+        return share
+    raise ValueError(f"Unknown share mode {mode!r}.")
+
+# -------------------------------
+# Currencies (local FX table, no network)
+# -------------------------------
+FX_RATES_FILE = Path(__file__).with_name("fx_rates.csv")
+
+def _build_fx_table(raw: pd.DataFrame) -> pd.DataFrame:
+    """
+    `date,from,to,rate` rows (1 `from` = `rate` `to`) -> lookup frame with
+    columns pair ("EUR/INR"), date, rate, sorted by date. Inverse pairs are
+    added where the file doesn't list them directly.
+    """
+    raw = raw.rename(columns={c: c.strip().lower() for c in raw.columns})
+    missing = {"date", "from", "to", "rate"} - set(raw.columns)
+    if missing:
+        raise ValueError(f"FX file is missing column(s): {', '.join(sorted(missing))}")
+    src = raw["from"].astype(str).str.strip().str.upper()
+    dst = raw["to"].astype(str).str.strip().str.upper()
+    rate = pd.to_numeric(raw["rate"], errors="coerce")
+    date = pd.to_datetime(raw["date"], errors="coerce").astype("datetime64[ns]")
+    ok = rate.gt(0) & date.notna()
+    direct = pd.DataFrame({"pair": (src + "/" + dst)[ok], "date": date[ok], "rate": rate[ok]})
+    inverse = pd.DataFrame({"pair": (dst + "/" + src)[ok], "date": date[ok], "rate": 1.0 / rate[ok]})
+    table = pd.concat([direct, inverse], ignore_index=True).drop_duplicates(["pair", "date"], keep="first")
+    return table.sort_values("date", kind="stable").reset_index(drop=True)
+
+@lru_cache(maxsize=8)
+def _fx_from_path(path: str, mtime: float) -> pd.DataFrame:
+    return _build_fx_table(pd.read_csv(path))
+
+@lru_cache(maxsize=8)
+def _fx_from_bytes(data: bytes) -> pd.DataFrame:
+    return _build_fx_table(pd.read_csv(io.BytesIO(data)))
+
+def load_fx_table(source: Union[str, Path, bytes] = FX_RATES_FILE) -> pd.DataFrame:
+    """
+    Load a local FX rate file (path or raw bytes) once per process. Files are
+    cached by path + modification time, uploads by content, so reruns reuse
+    the parsed table.
+    """
+    if isinstance(source, bytes):
+        return _fx_from_bytes(source)
+    return _fx_from_path(str(source), os.path.getmtime(source))
+
+def convert_to_base(amounts: Sequence[float], currencies: Sequence[str], base: str, fx: Optional[pd.DataFrame],
+                    dates: Optional[Sequence] = None) -> np.ndarray:
+    """
+    Convert every amount to the `base` currency in one vectorized pass.
+    Blank currency means base. Each row uses the latest rate on or before its
+    date (the latest rate overall when it has no date; the earliest one when
+    it predates the table). Raises ValueError for pairs the table lacks.
+    """
+    amt = np.asarray(amounts, dtype=np.float64)
+    base = (base or "").strip().upper()
+    cur = pd.Series(currencies, dtype="object").fillna("").astype(str).str.strip().str.upper().to_numpy()
+    foreign = (cur != "") & (cur != base)
+    if not foreign.any():
+        return amt.copy()
+
+    if fx is None:
+        raise ValueError(f"Amounts in {', '.join(sorted(set(cur[foreign])))} need an FX rate file.")
+
+    rows = np.flatnonzero(foreign)
+    when = pd.Series(pd.NaT, index=range(len(amt)), dtype="datetime64[ns]")
+    if dates is not None:
+        when = pd.to_datetime(pd.Series(dates, dtype="object"), errors="coerce").astype("datetime64[ns]")
+    query = pd.DataFrame({
+        "row": rows,
+        "pair": cur[rows] + "/" + base,
+        "date": when.to_numpy()[rows],
+    })
+    query["date"] = query["date"].fillna(pd.Timestamp.max.floor("D")).astype("datetime64[ns]")
+    query = query.sort_values("date", kind="stable")
+    looked_up = pd.merge_asof(query, fx, on="date", by="pair", direction="backward")
+    if looked_up["rate"].isna().any():
+        earliest = pd.merge_asof(query, fx, on="date", by="pair", direction="forward")["rate"]
+        looked_up["rate"] = looked_up["rate"].fillna(pd.Series(earliest.to_numpy(), index=looked_up.index))
+    unknown = looked_up.loc[looked_up["rate"].isna(), "pair"].unique()
+    if len(unknown):
+        raise ValueError(f"No FX rate for {', '.join(sorted(unknown))}.")
+
+    out = amt.copy()
+    out[looked_up["row"].to_numpy()] *= looked_up["rate"].to_numpy()
+    return out
+
+# -------------------------------
+# Minor units (fixed point)
+# -------------------------------
+def to_minor_units(amounts: Sequence[float], decimals: int = 2) -> np.ndarray:
+    """Round amounts to `decimals` and return them as int64 minor units (e.g. cents)."""
+    arr = np.asarray(amounts, dtype=np.float64)
+    return np.rint(np.round(arr, decimals) * 10 ** decimals).astype(np.int64)
+
+def from_minor_units(units: Sequence[int], decimals: int = 2) -> np.ndarray:
+    """Minor units back to floats, for display only."""
+    return np.asarray(units, dtype=np.int64) / 10 ** decimals
+
+def format_minor_units(units: Sequence[int], decimals: int = 2) -> np.ndarray:
+    """Exact fixed-point strings ("-12.30") for int64 minor units, without going through floats."""
+    units = np.asarray(units, dtype=np.int64)
+    if not len(units):
+        return np.empty(0, dtype=object)
+    whole, frac = np.divmod(np.abs(units), 10 ** decimals)
+    sign = np.where(units < 0, "-", "")
+    out = np.char.add(sign, whole.astype(str))
+    if decimals:
+        out = np.char.add(np.char.add(out, "."), np.char.zfill(frac.astype(str), decimals))
+    return out.astype(object)
+
+# -------------------------------
+# Settlements
+# -------------------------------
+def settle_arrays(units: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Greedy creditor/debtor matching on integer balances (positive = receive).
+
+    Debtors and creditors are each sorted largest first (stable, so ties keep
+    input order) and walked with two pointers. The walk is done in one pass
+    over the merged cumulative sums: every breakpoint in either running total
+    closes one transfer, so no Python-level loop is needed.
+
+    Returns (payer_idx, receiver_idx, amount) arrays, in transfer order.
+    """
+    units = np.asarray(units, dtype=np.int64)
+    d_idx = np.flatnonzero(units < 0)
+    c_idx = np.flatnonzero(units > 0)
+    empty = np.empty(0, dtype=np.int64)
+    if len(d_idx) == 0 or len(c_idx) == 0:
+        return empty, empty, empty
+
+    d_amt = -units[d_idx]
+    c_amt = units[c_idx]
+    d_order = np.argsort(-d_amt, kind="stable")
+    c_order = np.argsort(-c_amt, kind="stable")
+    d_idx, d_amt = d_idx[d_order], d_amt[d_order]
+    c_idx, c_amt = c_idx[c_order], c_amt[c_order]
+
+    d_cum = np.cumsum(d_amt)
+    c_cum = np.cumsum(c_amt)
+    limit = min(d_cum[-1], c_cum[-1])  # unmatched remainder is left as-is, like the loop did
+
+    cuts = np.union1d(d_cum, c_cum)
+    cuts = cuts[cuts <= limit]
+    starts = np.concatenate(([0], cuts[:-1]))
+    payer = d_idx[np.searchsorted(d_cum, starts, side="right")]
+    receiver = c_idx[np.searchsorted(c_cum, starts, side="right")]
+    return payer, receiver, cuts - starts
+
+def settle(names: Sequence[str], balances: Sequence[float], decimals: int = 2) -> List[Tuple[str, str, float]]:
+    """
+    Positional version of `minimal_settlements`: `names[i]` has `balances[i]`.
+    Duplicate names are kept apart instead of overwriting each other.
+    """
+    payer, receiver, amount = settle_arrays(to_minor_units(balances, decimals))
+    names_arr = np.asarray(names, dtype=object)
+    scale = 10 ** decimals
+    return list(zip(names_arr[payer].tolist(), names_arr[receiver].tolist(), (amount / scale).tolist()))
+
+def minimal_settlements(balances: Dict[str, float], decimals: int = 2) -> List[Tuple[str, str, float]]:
+    """
+    Given per-person balances (positive = should receive, negative = owes),
+    return a minimal set of transfers (payer -> receiver -> amount).
+    Greedy creditor/debtor matching.
+    """
+    return settle(list(balances.keys()), list(balances.values()), decimals=decimals)
+
+# -------------------------------
+# Exact solver (fewest transfers)
+# -------------------------------
+GREEDY = "greedy"
+EXACT = "exact"
+EXACT_MAX_PEOPLE = 20  # 2**20 subset sums; beyond this the DP tables get too large
+
+@dataclass
+class SettlementResult:
+    payer: np.ndarray      # indices (or names, once labelled by a Ledger)
+    receiver: np.ndarray
+    amount: np.ndarray     # int64 minor units
+    method: str            # which solver produced the answer (and why, for fallbacks)
+    seconds: float
+
+    def __len__(self) -> int:
+        return len(self.amount)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({"payer": self.payer, "receiver": self.receiver, "amount": self.amount})
+
+    def to_csv_frame(self, decimals: int = 2) -> pd.DataFrame:
+        """Export edge: amounts as exact fixed-point strings."""
+        return pd.DataFrame({
+            "Payer": self.payer,
+            "Receiver": self.receiver,
+            "Amount": format_minor_units(self.amount, decimals),
+        })
+
+def _zero_sum_groups(vals: np.ndarray, deadline: float) -> Optional[List[np.ndarray]]:
+    """
+    Partition `vals` (summing to 0) into the largest number of zero-sum groups.
+
+    Bitmask DP over all subsets: best[mask] = zero[mask] + max best[mask - {i}],
+    evaluated one popcount layer at a time so every layer is a few array ops.
+    The number of groups is then read off the path back from the full mask.
+    Returns None if `deadline` (a perf_counter value) passes first.
+    """
+    m = len(vals)
+    sums = np.zeros(1, dtype=np.int64)
+    popcount = np.zeros(1, dtype=np.int8)
+    for v in vals:
+        sums = np.concatenate([sums, sums + v])
+        popcount = np.concatenate([popcount, popcount + 1])
+    zero = (sums == 0).astype(np.int16)
+    best = np.zeros(1 << m, dtype=np.int16)
+    by_layer = np.argsort(popcount, kind="stable")
+    bounds = np.searchsorted(popcount[by_layer], np.arange(m + 2))
+    for k in range(1, m + 1):
+        if time.perf_counter() > deadline:
+            return None
+        layer = by_layer[bounds[k]:bounds[k + 1]]
+        top = np.full(len(layer), -1, dtype=np.int16)
+        for i in range(m):
+            has = (layer >> i) & 1 == 1
+            np.maximum(top, np.where(has, best[layer ^ (1 << i)], -1), out=top)
+        best[layer] = top + zero[layer]
+
+    groups: List[np.ndarray] = []
+    mask, current = (1 << m) - 1, []
+    while mask:
+        if zero[mask] and current:
+            groups.append(np.array(current))
+            current = []
+        for i in range(m):
+            bit = 1 << i
+            if mask & bit and best[mask ^ bit] == best[mask] - zero[mask]:
+                current.append(i)
+                mask ^= bit
+                break
+    groups.append(np.array(current))
+    return groups
+
+def solve_settlements(units: np.ndarray, solver: str = GREEDY, budget_s: float = 1.0,
+                      max_people: int = EXACT_MAX_PEOPLE) -> SettlementResult:
+    """
+    Settle integer balances with the greedy matcher or, for solver=EXACT, with
+    the fewest possible transfers (n - number of zero-sum subgroups).
+
+    The exact path first pairs off exact opposites (x owes what y is owed),
+    which is always part of some optimal answer, then runs the subset DP on
+    what is left. It falls back to the greedy result when the balances don't
+    sum to zero, when too many people remain, or when `budget_s` runs out.
+    """
+    start = time.perf_counter()
+    units = np.asarray(units, dtype=np.int64)
+
+    def greedy(method: str) -> SettlementResult:
+        payer, receiver, amount = settle_arrays(units)
+        return SettlementResult(payer, receiver, amount, method, time.perf_counter() - start)
+
+    if solver != EXACT:
+        return greedy(GREEDY)
+    if units.sum() != 0:
+        return greedy(f"{GREEDY} (balances don't sum to zero)")
+
+    # Pair exact opposites
+    waiting: Dict[int, List[int]] = {}
+    pairs: List[Tuple[int, int]] = []
+    rest: List[int] = []
+    for i in np.flatnonzero(units).tolist():
+        v = int(units[i])
+        match = waiting.get(-v)
+        if match:
+            pairs.append((i, match.pop()))
+        else:
+            waiting.setdefault(v, []).append(i)
+    for idxs in waiting.values():
+        rest.extend(idxs)
+    rest.sort()
+    if len(rest) > max_people:
+        return greedy(f"{GREEDY} ({len(rest)} unpaired people > exact limit of {max_people})")
+
+    rest_arr = np.array(rest, dtype=np.int64)
+    groups = _zero_sum_groups(units[rest_arr], start + budget_s) if len(rest) else []
+    if groups is None:
+        return greedy(f"{GREEDY} (exact solver exceeded {budget_s:g}s budget)")
+
+    payer: List[int] = []
+    receiver: List[int] = []
+    amount: List[int] = []
+    for a, b in pairs:
+        d, c = (a, b) if units[a] < 0 else (b, a)
+        payer.append(d)
+        receiver.append(c)
+        amount.append(int(units[c]))
+    for g in groups:
+        idx = rest_arr[g]
+        p, r, amt = settle_arrays(units[idx])
+        payer.extend(idx[p].tolist())
+        receiver.extend(idx[r].tolist())
+        amount.extend(amt.tolist())
+    return SettlementResult(np.array(payer, dtype=np.int64), np.array(receiver, dtype=np.int64),
+                            np.array(amount, dtype=np.int64), EXACT, time.perf_counter() - start)
+
+# -------------------------------
+# Fixed-point ledger
+# -------------------------------
+@dataclass
+class Ledger:
+    """
+    Paid and share amounts as int64 minor units (10 ** decimals per unit of
+    currency), so balances and settlements are exact integers. Convert to
+    floats/strings only when displaying or exporting.
+    """
+    names: np.ndarray   # object array of display names
+    paid: np.ndarray    # int64 minor units
+    share: np.ndarray   # int64 minor units, sums exactly to the pot
+    decimals: int = 2
+    share_mode: str = EQUAL
+    basis: Optional[np.ndarray] = None  # per-person weight / percent / fixed amount behind `share`
+
+    @classmethod
+    def split(cls, names: Sequence[str], paid: Sequence[float], total: float = 0.0, decimals: int = 2,
+              share_mode: str = EQUAL, basis: Optional[Sequence[float]] = None) -> "Ledger":
+        """
+        Split `total` (or the sum paid when total <= 0) using `share_mode`
+        (see `allocate_shares`). Leftover minor units go to the largest
+        remainders, ties to the first people in the table.
+        """
+        paid_num = pd.to_numeric(pd.Series(paid, dtype="object"), errors="coerce").fillna(0.0)
+        paid_units = to_minor_units(paid_num.to_numpy(dtype=np.float64), decimals)
+        n = len(paid_units)
+        pot = int(to_minor_units([total], decimals)[0]) if total > 0 else int(paid_units.sum())
+        share = allocate_shares(pot, n, share_mode, basis, decimals)
+        basis_arr = None
+        if share_mode != EQUAL:
+            basis_arr = pd.to_numeric(pd.Series(basis, dtype="object"), errors="coerce").to_numpy(dtype=np.float64)
+        return cls(names=normalize_names(names), paid=paid_units, share=share, decimals=decimals,
+                   share_mode=share_mode, basis=basis_arr)
+
+    @classmethod
+    def equal_split(cls, names: Sequence[str], paid: Sequence[float], total: float = 0.0,
+                    decimals: int = 2) -> "Ledger":
+        """Equal split of `total` (or of the sum paid when total <= 0)."""
+        return cls.split(names, paid, total, decimals)
+
+    @property
+    def balance(self) -> np.ndarray:
+        """Positive = should receive, negative = owes."""
+        return self.paid - self.share
+
+    @property
+    def pot(self) -> int:
+        return int(self.share.sum())
+
+    @property
+    def paid_total(self) -> int:
+        return int(self.paid.sum())
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def to_frame(self) -> pd.DataFrame:
+        """name, paid, [basis,] share, balance as floats (display edge)."""
+        df = pd.DataFrame({
+            "name": self.names,
+            "paid": from_minor_units(self.paid, self.decimals),
+            "share": from_minor_units(self.share, self.decimals),
+            "balance": from_minor_units(self.balance, self.decimals),
+        })
+        if self.basis is not None:
+            df.insert(2, "basis", self.basis)
+        return df
+
+    def to_csv_frame(self) -> pd.DataFrame:
+        """Export edge: exact fixed-point strings, so the CSV has no float noise."""
+        df = pd.DataFrame({
+            "Name": self.names,
+            "Paid": format_minor_units(self.paid, self.decimals),
+            "Fair Share": format_minor_units(self.share, self.decimals),
+            "Balance": format_minor_units(self.balance, self.decimals),
+        })
+        if self.basis is not None:
+            df.insert(2, SHARE_BASIS_LABELS[self.share_mode], self.basis)
+        return df
+
+    def settle(self, solver: str = GREEDY, budget_s: float = 1.0) -> SettlementResult:
+        """Settlements with payer/receiver as names and amounts in int64 minor units."""
+        res = solve_settlements(self.balance, solver=solver, budget_s=budget_s)
+        res.payer = self.names[res.payer]
+        res.receiver = self.names[res.receiver]
+        return res
+
+# -------------------------------
+# Itemised expenses (append-only event log)
+# -------------------------------
+@dataclass(frozen=True)
+class Expense:
+    expense_id: int
+    payer: str
+    amount: int                     # minor units at the log's precision
+    beneficiaries: Tuple[str, ...]  # split equally between these people
+    description: str = ""
+    entered: float = 0.0            # amount as entered, so a change of precision never compounds rounding
+
+class ExpenseLog:
+    """
+    Append-only log of add/edit/delete events for itemised expenses.
+
+    Per-person paid/share totals are kept as int64 minor-unit vectors and
+    updated in place, so each event costs O(beneficiaries) instead of a replay
+    of the whole history. Settlements are only computed on request.
+    """
+
+    def __init__(self, decimals: int = 2):
+        self.decimals = decimals
+        self.events: List[Tuple[str, Expense]] = []  # ("add" | "edit" | "delete", expense)
+        self.expenses: Dict[int, Expense] = {}       # live expenses by id
+        self._slot: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._paid = np.zeros(16, dtype=np.int64)
+        self._share = np.zeros(16, dtype=np.int64)
+        self._next_id = 1
+
+    def __len__(self) -> int:
+        return len(self.expenses)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._names)
+
+    def person(self, name: str) -> int:
+        """Slot of `name` in the balance vectors, registering new people on first use."""
+        slot = self._slot.get(name)
+        if slot is None:
+            slot = len(self._names)
+            if slot == len(self._paid):
+                self._paid = np.concatenate([self._paid, np.zeros_like(self._paid)])
+                self._share = np.concatenate([self._share, np.zeros_like(self._share)])
+            self._slot[name] = slot
+            self._names.append(name)
+        return slot
+
+    def _apply(self, exp: Expense, sign: int) -> None:
+        self._paid[self.person(exp.payer)] += sign * exp.amount
+        slots = np.array([self.person(b) for b in exp.beneficiaries], dtype=np.int64)
+        shares = allocate(exp.amount, np.ones(len(slots), dtype=np.int64))
+        self._share[slots] += sign * shares  # beneficiaries are unique, so fancy-index add is safe
+
+    def _make(self, expense_id: int, payer: str, amount: float, beneficiaries: Sequence[str],
+              description: str) -> Expense:
+        payer = (payer or "").strip()
+        benef = tuple(dict.fromkeys(b.strip() for b in beneficiaries if b and b.strip()))
+        units = int(to_minor_units([amount], self.decimals)[0])
+        if not payer:
+            raise ValueError("An expense needs a payer.")
+        if not benef:
+            raise ValueError("An expense needs at least one beneficiary.")
+        if units <= 0:
+            raise ValueError("Expense amount must be positive.")
+        return Expense(expense_id, payer, units, benef, (description or "").strip(), float(amount))
+
+    def add(self, payer: str, amount: float, beneficiaries: Sequence[str], description: str = "") -> int:
+        exp = self._make(self._next_id, payer, amount, beneficiaries, description)
+        self._next_id += 1
+        self._apply(exp, +1)
+        self.expenses[exp.expense_id] = exp
+        self.events.append(("add", exp))
+        return exp.expense_id
+
+    def edit(self, expense_id: int, payer: str, amount: float, beneficiaries: Sequence[str],
+             description: str = "") -> None:
+        old = self.expenses[expense_id]
+        new = self._make(expense_id, payer, amount, beneficiaries, description)
+        self._apply(old, -1)
+        self._apply(new, +1)
+        self.expenses[expense_id] = new
+        self.events.append(("edit", new))
+
+    def delete(self, expense_id: int) -> None:
+        old = self.expenses.pop(expense_id)
+        self._apply(old, -1)
+        self.events.append(("delete", old))
+
+    def rescaled(self, decimals: int) -> "ExpenseLog":
+        """
+        A fresh log at a different precision, built from the entered amounts
+        of the live expenses (ids kept). Only the minor-unit amounts and the
+        balance vectors are re-rounded, so going 2 -> 0 -> 2 decimals gets the
+        original amounts back; an amount may round to 0 at a coarse precision.
+        """
+        log = ExpenseLog(decimals)
+        for name in self._names:
+            log.person(name)
+        for exp in self.expenses.values():
+            units = int(to_minor_units([exp.entered], decimals)[0])
+            new = Expense(exp.expense_id, exp.payer, units, exp.beneficiaries, exp.description, exp.entered)
+            log._apply(new, +1)
+            log.expenses[new.expense_id] = new
+            log.events.append(("add", new))
+        log._next_id = self._next_id
+        return log
+
+    def to_ledger(self) -> Ledger:
+        """Current totals as a Ledger (shares/balances ready for settlement)."""
+        n = len(self._names)
+        return Ledger(
+            names=np.array(self._names, dtype=object),
+            paid=self._paid[:n].copy(),
+            share=self._share[:n].copy(),
+            decimals=self.decimals,
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """Live expenses, one row each, with display amounts."""
+        scale = 10 ** self.decimals
+        exps = list(self.expenses.values())
+        return pd.DataFrame({
+            "id": [e.expense_id for e in exps],
+            "description": [e.description for e in exps],
+            "payer": [e.payer for e in exps],
+            "amount": [e.amount / scale for e in exps],
+            "beneficiaries": [", ".join(e.beneficiaries) for e in exps],
+        })
+
+# -------------------------------
+# Streaming CSV ingestion
+# -------------------------------
+INGEST_CHUNK_ROWS = CHUNK_ROWS
+
+def read_contributions(source: Union[str, BinaryIO], decimals: int = 2, chunk_rows: int = INGEST_CHUNK_ROWS,
+                       base: str = "", fx: Optional[pd.DataFrame] = None) -> Tuple[pd.DataFrame, int]:
+    """
+    Stream a `name,paid` CSV (path or binary file object) and total `paid`
+    per normalised name as it goes, in int64 minor units. Memory stays
+    bounded by the number of distinct people rather than the file size.
+    Blank names become "Person i" for their row, as in the table.
+
+    Optional `currency` (and `date`) columns are converted to `base` chunk by
+    chunk with `convert_to_base` before aggregating. Without a `base`, the
+    amounts are added as they are, which needs a single currency in the file.
+
+    Returns (frame with name/paid in first-seen order, rows read).
+    Raises ValueError when the name/paid columns are missing, or for several
+    currencies without a base.
+    """
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            return read_contributions(f, decimals, chunk_rows, base, fx)
+
+    cols = {c.strip().lower(): c for c in csv_header(source)}
+    if "name" not in cols or "paid" not in cols:
+        raise ValueError("CSV must contain 'name' and 'paid' columns.")
+    name_col, paid_col = cols["name"], cols["paid"]
+    cur_col, date_col = cols.get("currency"), cols.get("date")
+    wanted = [c for c in (name_col, paid_col, cur_col, date_col) if c]
+
+    totals = pd.Series(dtype=np.int64)
+    rows = 0
+    currencies: set = set()   # seen without a base currency
+    for chunk in iter_columns(source, wanted, chunk_rows=chunk_rows):
+        names = chunk[name_col].str.strip()
+        blank = names.eq("").to_numpy()
+        if blank.any():
+            names = names.to_numpy(dtype=object)
+            names[blank] = [f"Person {rows + i + 1}" for i in np.flatnonzero(blank)]
+        paid = pd.to_numeric(chunk[paid_col].str.strip(), errors="coerce").fillna(0.0).to_numpy(dtype=np.float64)
+        if cur_col and base:
+            paid = convert_to_base(paid, chunk[cur_col], base, fx, chunk[date_col] if date_col else None)
+        elif cur_col:
+            currencies.update(chunk[cur_col].str.strip().str.upper().unique())
+            currencies.discard("")
+            if len(currencies) > 1:
+                raise ValueError(f"Amounts in several currencies ({', '.join(sorted(currencies))}): "
+                                 "set a base currency to convert them.")
+        units = pd.Series(to_minor_units(paid, decimals))
+        part = units.groupby(np.asarray(names, dtype=object), sort=False).sum()
+        totals = pd.concat([totals, part]).groupby(level=0, sort=False).sum()
+        rows += len(chunk)
+
+    return pd.DataFrame({
+        "name": totals.index.to_numpy(dtype=object),
+        "paid": from_minor_units(totals.to_numpy(dtype=np.int64), decimals),
+    }), rows
+
+# -------------------------------
+# Memoization
+# -------------------------------
+def frame_digest(df: pd.DataFrame, *extras: Any) -> str:
+    """Content hash of a frame (values, column names, dtypes) plus any extra settings."""
+    h = hashlib.sha256()
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    h.update(repr((list(df.columns), [str(t) for t in df.dtypes], extras)).encode("utf-8"))
+    return h.hexdigest()
+
+class LRUCache:
+    """
+    Bounded least-recently-used map with hit/miss counters. Thread-safe, so a
+    single instance can be shared by all sessions of a Streamlit process.
+    """
+
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        value = compute()  # outside the lock; a concurrent miss on the same key just computes twice
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
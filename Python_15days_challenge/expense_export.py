@@ -0,0 +1,64 @@
+"""
+Export shapes for splitter results: balances and settlements as frames for
+CSV / gzip CSV, or Arrow tables for Parquet and Arrow IPC. Serialising and
+streaming them to files is `tabular_io`'s job (`export_frames`,
+`ResultWriter`).
+
+Parquet/Arrow need pyarrow; amounts are written there as exact decimals
+(decimal128 with `decimals` digits) built from the int64 minor units.
+"""
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+from expense_core import Ledger, SettlementResult
+from tabular_io import CSV, CSV_GZ
+
+# Optional columnar formats
+try:
+    import pyarrow as pa
+    HAS_PYARROW = True
+except Exception:
+    HAS_PYARROW = False
+
+# -------------------------------
+# Result frames
+# -------------------------------
+def _decimal_array(units: np.ndarray, decimals: int) -> "pa.Array":
+    """int64 minor units -> exact decimal128(38, decimals), reusing the integers as the unscaled values."""
+    units = np.ascontiguousarray(units, dtype="<i8")
+    words = np.empty((len(units), 2), dtype="<i8")
+    words[:, 0] = units
+    words[:, 1] = units >> 63  # sign-extend to 128 bits
+    return pa.Array.from_buffers(pa.decimal128(38, decimals), len(units), [None, pa.py_buffer(words)])
+
+def balances_frame(ledger: Ledger, fmt: str = CSV) -> Union[pd.DataFrame, "pa.Table"]:
+    """Balances in the export shape: fixed-point strings for CSV, decimals for columnar formats."""
+    if fmt in (CSV, CSV_GZ):
+        return ledger.to_csv_frame()
+    d = ledger.decimals
+    cols = {
+        "name": pa.array(ledger.names, pa.string()),
+        "paid": _decimal_array(ledger.paid, d),
+        "share": _decimal_array(ledger.share, d),
+        "balance": _decimal_array(ledger.balance, d),
+    }
+    if ledger.basis is not None:
+        cols["share_basis"] = pa.array(ledger.basis, pa.float64())
+    return pa.table(cols)
+
+def settlements_frame(result: SettlementResult, decimals: int, fmt: str = CSV) -> Union[pd.DataFrame, "pa.Table"]:
+    if fmt in (CSV, CSV_GZ):
+        return result.to_csv_frame(decimals)
+    return pa.table({
+        "payer": pa.array(result.payer, pa.string()),
+        "receiver": pa.array(result.receiver, pa.string()),
+        "amount": _decimal_array(result.amount, decimals),
+    })
+
+def with_group(data: Union[pd.DataFrame, "pa.Table"], group: str) -> Union[pd.DataFrame, "pa.Table"]:
+    """Prefix a `group` column, for combined outputs across many groups."""
+    if HAS_PYARROW and isinstance(data, pa.Table):
+        return data.add_column(0, "group", pa.array([group] * len(data), pa.string()))
+    return data.assign(group=group)[["group", *data.columns]]
@@ -1,59 +1,17 @@
+import hashlib
 import io
-from typing import List, Dict, Tuple
+from typing import Dict, Optional, Tuple
 import pandas as pd
 import streamlit as st
 
-st.set_page_config(page_title="Expense Splitter", page_icon="🧮", layout="centered")
-
-# -------------------------------
-# Helpers
-# -------------------------------
-def normalize_name(i: int, name: str) -> str:
-    n = (name or "").strip()
-    return n if n else f"Person {i+1}"
-
-def minimal_settlements(balances: Dict[str, float], decimals: int = 2) -> List[Tuple[str, str, float]]:
-    """
-    Given per-person balances (positive = should receive, negative = owes),
-    return a minimal set of transfers (payer -> receiver -> amount).
-    Greedy creditor/debtor matching.
-    """
-    # Round small floating noise
-    bal = {k: round(v, decimals) for k, v in balances.items()}
-    debtors = [(p, -amt) for p, amt in bal.items() if amt < 0]   # owes (positive magnitude)
-    creditors = [(p, amt) for p, amt in bal.items() if amt > 0]  # to receive
-
-    debtors.sort(key=lambda x: x[1], reverse=True)   # largest debtor first
-    creditors.sort(key=lambda x: x[1], reverse=True) # largest creditor first
-
-    i = j = 0
-    transfers: List[Tuple[str, str, float]] = []
-    while i < len(debtors) and j < len(creditors):
-        d_name, d_amt = debtors[i]
-        c_name, c_amt = creditors[j]
-        pay = min(d_amt, c_amt)
-        pay_r = round(pay, decimals)
-
-        if pay_r > 0:
-            transfers.append((d_name, c_name, pay_r))
-
-        d_amt = round(d_amt - pay, decimals)
-        c_amt = round(c_amt - pay, decimals)
-
-        if d_amt == 0:
-            i += 1
-        else:
-            debtors[i] = (d_name, d_amt)
-
-        if c_amt == 0:
-            j += 1
-        else:
-            creditors[j] = (c_name, c_amt)
-
-    return transfers
+from expense_core import (
+    EQUAL, EXACT, FIXED, GREEDY, PERCENT, SHARE_BASIS_LABELS, SHARE_MODES, WEIGHTS, ExpenseLog, Ledger, LRUCache,
+    FX_RATES_FILE, convert_to_base, frame_digest, load_fx_table, normalize_names, read_contributions, to_currency,
+)
+from expense_export import balances_frame, settlements_frame
+from tabular_io import MIME_TYPES, available_formats, export_frames
 
-def to_currency(x: float, symbol: str, decimals: int) -> str:
-    return f"{symbol}{x:,.{decimals}f}"
+st.set_page_config(page_title="Expense Splitter", page_icon="🧮", layout="centered")
 
 # -------------------------------
 # Sidebar: settings
@@ -63,6 +21,72 @@ currency = st.sidebar.text_input("Currency symbol", value="₹", help="Examples:
 decimals = st.sidebar.number_input("Rounding decimals", min_value=0, max_value=4, value=2, step=1)
 st.sidebar.caption("Note: All outputs are rounded to this precision.")
 
+# Multi-currency (optional): amounts in other currencies are converted with a local FX file
+base_currency = st.sidebar.text_input(
+    "Base currency code (optional)", value="",
+    help="e.g. INR. When set, each row can have its own currency and is converted to this one.",
+).strip().upper()
+fx_table = None
+fx_token = None
+if base_currency:
+    fx_upload = st.sidebar.file_uploader(
+        "FX rates CSV", type=["csv"],
+        help="Columns: date, from, to, rate (1 `from` = rate `to`). "
+             f"Defaults to {FX_RATES_FILE.name} next to this app if present.",
+    )
+    try:
+        if fx_upload is not None:
+            fx_bytes = fx_upload.getvalue()
+            fx_table = load_fx_table(fx_bytes)
+            fx_token = hashlib.sha256(fx_bytes).hexdigest()
+        elif FX_RATES_FILE.exists():
+            fx_table = load_fx_table(FX_RATES_FILE)
+            fx_token = (str(FX_RATES_FILE), FX_RATES_FILE.stat().st_mtime)
+    except Exception as e:
+        st.sidebar.error(f"Failed to load FX rates: {e}")
+    if fx_table is None:
+        st.sidebar.caption("No FX rates loaded: only base-currency amounts can be used.")
+    else:
+        st.sidebar.caption(f"{fx_table['pair'].nunique()} currency pairs, {len(fx_table):,} rates loaded.")
+
+SINGLE_POT = "Single pot"
+ITEMISED = "Itemised expenses"
+solver_label = st.sidebar.selectbox(
+    "Settlement solver",
+    ["Greedy (fast)", "Exact (fewest transfers)"],
+    help="Exact finds the fewest transfers by splitting the group into zero-sum subgroups. "
+         "It falls back to greedy for large groups or when the time budget runs out.",
+)
+solver = EXACT if solver_label.startswith("Exact") else GREEDY
+budget_ms = st.sidebar.number_input("Exact solver time budget (ms)", min_value=10, max_value=60000, value=1000, step=100,
+                                    disabled=solver != EXACT)
+
+split_mode = st.sidebar.radio(
+    "Split mode",
+    [SINGLE_POT, ITEMISED],
+    help="Single pot: one total split equally. Itemised: many expenses, each with its own payer and beneficiaries.",
+)
+
+SHARE_MODE_LABELS = {
+    EQUAL: "Equal",
+    WEIGHTS: "Weights (e.g. nights, headcount)",
+    PERCENT: "Percentages",
+    FIXED: "Fixed amounts + remainder",
+}
+share_mode = st.sidebar.selectbox(
+    "Share mode",
+    SHARE_MODES,
+    format_func=SHARE_MODE_LABELS.get,
+    disabled=split_mode != SINGLE_POT,
+    help="How the total is divided. Fixed: people with an amount pay exactly that; blanks split the rest equally.",
+)
+
+export_format = st.sidebar.selectbox(
+    "Download format",
+    available_formats(),
+    help="csv.gz is compressed CSV; parquet and arrow keep amounts as exact decimals for analytics tools.",
+)
+
 # Upload (optional)
 uploaded = st.sidebar.file_uploader("Upload CSV (optional)", type=["csv"], help="Columns: name, paid")
 st.sidebar.divider()
@@ -72,51 +96,59 @@ st.sidebar.divider()
 # -------------------------------
 st.title("🧮 Expense Splitter (Splitwise-style)")
 
+# -------------------------------
+# Upload (streamed + aggregated by name; parsed once per file)
+# -------------------------------
+df_upload = None
+if uploaded is not None:
+    upload_key = (uploaded.file_id, decimals, base_currency, fx_token)
+    if st.session_state.get("upload_key") != upload_key:
+        try:
+            uploaded.seek(0)
+            st.session_state.upload_df, st.session_state.upload_rows = read_contributions(
+                uploaded, decimals, base=base_currency, fx=fx_table)
+            st.session_state.upload_key = upload_key
+        except Exception as e:
+            st.error(f"Failed to parse CSV: {e}")
+            st.stop()
+    df_upload = st.session_state.upload_df
+    st.sidebar.caption(f"Read {st.session_state.upload_rows:,} rows → {len(df_upload):,} people.")
+
 colA, colB = st.columns(2)
 with colA:
     total_amount = st.number_input("Total amount (bill/overall spend)", min_value=0.0, value=0.0, step=100.0, format="%.2f")
 with colB:
-    n_people = st.number_input("Number of people", min_value=1, value=3, step=1)
+    if df_upload is not None:
+        # Participant count comes from the file, never truncates it
+        n_people = st.number_input("Number of people", min_value=1, value=max(1, len(df_upload)), step=1, disabled=True)
+    else:
+        n_people = st.number_input("Number of people", min_value=1, value=3, step=1)
 
 st.caption("Tip: You can either enter the *total* and split equally, **or** enter per-person contributions (the app will reconcile both).")
 
 # -------------------------------
 # Editable table: names & contributions
 # -------------------------------
-if uploaded is not None:
-    try:
-        df_init = pd.read_csv(uploaded)
-        # normalize columns
-        df_init.columns = [c.strip().lower() for c in df_init.columns]
-        if "name" not in df_init.columns or "paid" not in df_init.columns:
-            st.error("CSV must contain 'name' and 'paid' columns.")
-            st.stop()
-        # Coerce
-        df_init = df_init[["name", "paid"]].copy()
-        df_init["name"] = df_init["name"].astype(str)
-        df_init["paid"] = pd.to_numeric(df_init["paid"], errors="coerce").fillna(0.0)
-        # If uploaded has different count than n_people, pad/trim
-        if len(df_init) < n_people:
-            for i in range(n_people - len(df_init)):
-                df_init.loc[len(df_init)] = ["", 0.0]
-        elif len(df_init) > n_people:
-            df_init = df_init.head(n_people)
-    except Exception as e:
-        st.error(f"Failed to parse CSV: {e}")
-        st.stop()
+if df_upload is not None:
+    df_init = df_upload
 else:
     df_init = pd.DataFrame({
         "name": [f"Person {i+1}" for i in range(n_people)],
         "paid": [0.0] * n_people
     })
 
-# Allow dynamic row count to match n_people
-if len(df_init) != n_people:
-    if len(df_init) < n_people:
-        for _ in range(n_people - len(df_init)):
-            df_init.loc[len(df_init)] = ["", 0.0]
-    else:
-        df_init = df_init.head(n_people)
+# Per-person share basis column for the non-equal share modes
+if split_mode == SINGLE_POT and share_mode != EQUAL:
+    n_rows = len(df_init)
+    default_basis = {WEIGHTS: 1.0, PERCENT: round(100.0 / n_rows, 4) if n_rows else 0.0, FIXED: None}[share_mode]
+    df_init = df_init.assign(basis=pd.Series([default_basis] * n_rows, dtype="float64", index=df_init.index))
+
+# Per-row currency (+ optional rate date) when a base currency is set
+if base_currency and split_mode == SINGLE_POT:
+    df_init = df_init.assign(
+        currency=base_currency,
+        date=pd.Series(pd.NaT, index=df_init.index, dtype="datetime64[ns]"),
+    )
 
 st.subheader("Participants & Contributions")
 edited = st.data_editor(
@@ -124,84 +156,238 @@ edited = st.data_editor(
     column_config={
         "name": st.column_config.TextColumn("Name", help="Optional; leave blank for Person i"),
         "paid": st.column_config.NumberColumn("Paid", help="Amount contributed/paid", format="%.2f", step=0.5),
+        "basis": st.column_config.NumberColumn(
+            SHARE_BASIS_LABELS.get(share_mode, ""),
+            help={
+                WEIGHTS: "Relative weight; shares are proportional to it",
+                PERCENT: "Percent of the total; must add up to 100",
+                FIXED: "Fixed amount this person owes; leave blank to share the remainder",
+            }.get(share_mode),
+            min_value=0.0,
+        ),
+        "currency": st.column_config.TextColumn("Currency", help=f"Currency of this payment; blank = {base_currency}"),
+        "date": st.column_config.DateColumn("Date", help="Date for the FX rate; blank = latest rate"),
     },
     hide_index=True,
     num_rows="fixed",
-    key="editor",
+    key=f"editor_{share_mode if split_mode == SINGLE_POT else EQUAL}_{base_currency}",
 )
 
-compute = st.button("Compute Split", type="primary", width="stretch")
+if split_mode == SINGLE_POT:
+    compute = st.button("Compute Split", type="primary", width="stretch")
+else:
+    compute = False
+    st.caption("Itemised mode uses the names above; who paid what comes from the expenses below.")
 
 # -------------------------------
 # Compute results
 # -------------------------------
-if compute:
-    # Prepare participants
-    participants = []
-    for i, row in edited.iterrows():
-        nm = normalize_name(i, str(row.get("name", "")))
-        paid = float(row.get("paid", 0.0) or 0.0)
-        participants.append({"name": nm, "paid": paid})
-
-    df = pd.DataFrame(participants)
-    paid_total = round(float(df["paid"].sum()), decimals)
-
-    # Determine pot/total to split:
-    # - If user entered TOTAL > 0: we use that as ground truth.
-    # - Else: we use the sum of "paid".
-    pot = round(total_amount if total_amount > 0 else paid_total, decimals)
-
-    # Equal share target
-    share = round(pot / len(df), decimals) if len(df) else 0.0
+@st.cache_resource
+def split_cache() -> LRUCache:
+    """One bounded cache per server process, shared by every session."""
+    return LRUCache(maxsize=32)
+
+def build_split(ledger: Ledger) -> Dict:
+    """Everything the results view needs: display frames and settlements (exports are built on download)."""
+    scale = 10 ** decimals
+    result = ledger.settle(solver=solver, budget_s=budget_ms / 1000)
+    show_df = ledger.to_frame().rename(columns={
+        "name": "Name",
+        "paid": "Paid",
+        "basis": SHARE_BASIS_LABELS.get(ledger.share_mode, ""),
+        "share": "Fair Share",
+        "balance": "Balance (receive + / owe −)",
+    })
+    rows = pd.DataFrame({
+        "Payer": result.payer,
+        "Receiver": result.receiver,
+        "Amount": [to_currency(a / scale, currency, decimals) for a in result.amount],
+    })
+    return {"ledger": ledger, "result": result, "show_df": show_df, "rows": rows}
 
-    # Compute balances (positive => should receive, negative => owes)
-    df["share"] = share
-    df["balance"] = (df["paid"] - df["share"]).round(decimals)
+def export_file(split: Dict, what: str, fmt: str) -> io.BytesIO:
+    """Balances/settlements serialised in `fmt`; only called when a download is clicked."""
+    if what == "balances":
+        data = balances_frame(split["ledger"], fmt)
+    else:
+        data = settlements_frame(split["result"], split["ledger"].decimals, fmt)
+    return export_frames(data, fmt)
+
+def render_results(split: Dict, entered_total: float = 0.0, extra_metric: Optional[Tuple[str, str]] = None):
+    """`extra_metric` (label, value) replaces the "Equal share" tile for non-equal splits."""
+    ledger, result = split["ledger"], split["result"]
+    scale = 10 ** decimals
+    pot = ledger.pot / scale
+    paid_total = ledger.paid_total / scale
+    base_share = ledger.pot // len(ledger) if len(ledger) else 0
+    extra_units = ledger.pot - base_share * len(ledger)
 
     # Info & warnings
     info_cols = st.columns(3)
-    info_cols[0].metric("People", len(df))
+    info_cols[0].metric("People", len(ledger))
     info_cols[1].metric("Total to split", to_currency(pot, currency, decimals))
-    info_cols[2].metric("Equal share", to_currency(share, currency, decimals))
+    if extra_metric is None:
+        info_cols[2].metric("Equal share", to_currency(base_share / scale, currency, decimals))
+    else:
+        info_cols[2].metric(*extra_metric)
+    if extra_metric is None and extra_units:
+        st.caption(
+            f"{extra_units} {'person pays' if extra_units == 1 else 'people pay'} an extra "
+            f"{to_currency(1 / scale, currency, decimals)} so the shares add up exactly to the total."
+        )
 
-    if total_amount > 0 and abs(paid_total - total_amount) > (10 ** -decimals):
+    if entered_total > 0 and ledger.paid_total != ledger.pot:
         st.warning(
             f"Note: Sum of contributions ({to_currency(paid_total, currency, decimals)}) "
-            f"differs from entered total ({to_currency(total_amount, currency, decimals)}). "
+            f"differs from entered total ({to_currency(entered_total, currency, decimals)}). "
             "Using the entered total for the split."
         )
 
     st.subheader("Balances")
-    show_df = df[["name", "paid", "share", "balance"]].copy()
-    show_df.columns = ["Name", "Paid", "Fair Share", "Balance (receive + / owe −)"]
-    st.dataframe(show_df, width="stretch", hide_index=True)
-
-    # Build settlements
-    balances_dict = {r["name"]: float(r["balance"]) for _, r in df.iterrows()}
-    settlements = minimal_settlements(balances_dict, decimals=decimals)
+    st.dataframe(split["show_df"], width="stretch", hide_index=True)
 
     st.subheader("Suggested Settlements")
-    if not settlements:
+    st.caption(f"{len(result)} transfer(s) · solved by **{result.method}** in {result.seconds * 1000:.1f} ms")
+    if not len(result):
         st.success("All settled! No transfers needed 🎉")
     else:
-        rows = [{"Payer": a, "Receiver": b, "Amount": to_currency(amt, currency, decimals)}
-                for a, b, amt in settlements]
-        st.dataframe(pd.DataFrame(rows), width="stretch", hide_index=True)
-
-    # Download results (CSV)
-    out = df.copy()
-    out["Amount to Receive (+) / Pay (−)"] = out["balance"]
-    out = out[["name", "paid", "share", "Amount to Receive (+) / Pay (−)"]]
-    out.columns = ["Name", "Paid", "Fair Share", "Balance"]
-    buf = io.StringIO()
-    out.to_csv(buf, index=False)
-    st.download_button(
-        "⬇️ Download Balances (CSV)",
-        data=buf.getvalue().encode("utf-8"),
-        file_name="balances.csv",
-        mime="text/csv",
-        width="stretch",
+        st.dataframe(split["rows"], width="stretch", hide_index=True)
+
+    # Download results (serialised on click, nothing kept in the shared cache)
+    dl_cols = st.columns(2)
+    for col, what in zip(dl_cols, ["balances", "settlements"]):
+        col.download_button(
+            f"⬇️ Download {what.capitalize()} ({export_format.upper()})",
+            data=lambda what=what, fmt=export_format: export_file(split, what, fmt),
+            file_name=f"{what}.{export_format}",
+            mime=MIME_TYPES[export_format],
+            on_click="ignore",
+            width="stretch",
+        )
+
+if split_mode == SINGLE_POT:
+    # Same table + settings => same key, served from the cache instead of recomputed
+    split_key = frame_digest(edited, float(total_amount), int(decimals), currency, share_mode, solver,
+                             budget_ms if solver == EXACT else None, base_currency, fx_token)
+    # Keep showing the split computed by "Compute Split" across reruns (e.g. downloads),
+    # but only for the inputs it was computed from
+    if compute:
+        st.session_state.split_key = split_key
+    shown_key = st.session_state.get("split_key")
+    if shown_key is not None and shown_key != split_key:
+        st.info("Inputs changed since the last split: click **Compute Split** to update it.")
+if split_mode == SINGLE_POT and st.session_state.get("split_key") == split_key:
+    # Prepare participants + balances as int64 minor units (positive => should receive, negative => owes)
+    # - If user entered TOTAL > 0: we use that as ground truth.
+    # - Else: we use the sum of "paid".
+    def compute_split() -> Dict:
+        paid = edited["paid"]
+        if "currency" in edited.columns:
+            # One vectorized FX conversion for the whole table
+            paid = convert_to_base(pd.to_numeric(paid, errors="coerce").fillna(0.0), edited["currency"],
+                                   base_currency, fx_table, edited["date"])
+        return build_split(Ledger.split(edited["name"], paid, total_amount, decimals,
+                                        share_mode, edited["basis"] if share_mode != EQUAL else None))
+
+    try:
+        split = split_cache().get_or_compute(split_key, compute_split)
+    except ValueError as e:
+        st.error(f"Can't split: {e}")
+    else:
+        render_results(split, total_amount,
+                       None if share_mode == EQUAL else ("Share mode", SHARE_MODE_LABELS[share_mode].split(" (")[0]))
+
+# -------------------------------
+# Itemised expenses
+# -------------------------------
+if split_mode == ITEMISED:
+    if "expense_log" not in st.session_state:
+        st.session_state.expense_log = ExpenseLog(decimals)
+    log = st.session_state.expense_log
+    if log.decimals != decimals:
+        # Rebuilt from the amounts as entered, so precision changes never lose cents
+        try:
+            log = st.session_state.expense_log = log.rescaled(decimals)
+        except ValueError as e:
+            st.error(f"Can't change the precision of the expenses: {e}")
+    # Table names first, plus anyone still referenced by an existing expense
+    people = list(dict.fromkeys(list(normalize_names(edited["name"])) + log.names))
+    for person in people:
+        log.person(person)  # keep table order in the balance vectors
+
+    st.subheader("Expenses")
+    with st.form("add_expense", clear_on_submit=True):
+        f1, f2 = st.columns(2)
+        desc = f1.text_input("Description", placeholder="e.g. Dinner on day 1")
+        amount = f2.number_input("Amount", min_value=0.0, value=0.0, step=0.5, format="%.2f")
+        exp_currency = st.text_input("Currency", value=base_currency,
+                                     help="Converted to the base currency at the latest rate") if base_currency else ""
+        payer = st.selectbox("Paid by", people)
+        benef = st.multiselect("Split between", people, default=people)
+        if st.form_submit_button("➕ Add expense", width="stretch"):
+            try:
+                if exp_currency:
+                    amount = float(convert_to_base([amount], [exp_currency], base_currency, fx_table)[0])
+                log.add(payer, amount, benef, desc)
+            except ValueError as e:
+                st.error(str(e))
+
+    if len(log):
+        exp_df = log.to_frame()
+        exp_df.columns = ["#", "Description", "Paid by", "Amount", "Split between"]
+        st.dataframe(exp_df, width="stretch", hide_index=True)
+
+        with st.expander("✏️ Edit or delete an expense"):
+            eid = st.selectbox(
+                "Expense",
+                list(log.expenses),
+                format_func=lambda i: f"#{i} {log.expenses[i].description}".strip(),
+            )
+            exp = log.expenses[eid]
+            with st.form(f"edit_expense_{eid}"):
+                e1, e2 = st.columns(2)
+                e_desc = e1.text_input("Description", value=exp.description)
+                e_amount = e2.number_input("Amount", min_value=0.0, value=exp.entered,
+                                           step=0.5, format="%.2f")
+                e_payer = st.selectbox("Paid by", people, index=people.index(exp.payer))
+                e_benef = st.multiselect("Split between", people, default=list(exp.beneficiaries))
+                b1, b2 = st.columns(2)
+                save = b1.form_submit_button("💾 Save changes", width="stretch")
+                remove = b2.form_submit_button("🗑️ Delete", width="stretch")
+            if save or remove:
+                try:
+                    if remove:
+                        log.delete(eid)
+                    else:
+                        log.edit(eid, e_payer, e_amount, e_benef, e_desc)
+                    st.rerun()
+                except ValueError as e:
+                    st.error(str(e))
+
+    # Balances are kept up to date per expense; settlements are only built on request,
+    # then kept (downloads and other widgets rerun the script) until the log or the settings change
+    settle_key = (len(log.events), len(log.names), currency, solver, budget_ms if solver == EXACT else None)
+    if st.button("Settle up", type="primary", width="stretch", disabled=not len(log)):
+        st.session_state.settled = {"log": log, "key": settle_key, "split": build_split(log.to_ledger())}
+    settled = st.session_state.get("settled")
+    if settled and settled["log"] is log and settled["key"] == settle_key:
+        render_results(settled["split"], extra_metric=("Expenses", len(log)))
+    elif settled and len(log):
+        st.info("Expenses or settings changed since the last settlement: click **Settle up** to update it.")
+
+# -------------------------------
+# Debug: compute cache
+# -------------------------------
+with st.sidebar.expander("🐞 Debug: compute cache"):
+    cache_stats = split_cache().stats()
+    st.write(
+        f"Hits **{cache_stats['hits']}** · misses **{cache_stats['misses']}** · "
+        f"hit rate **{cache_stats['hit_rate']:.0%}**"
     )
+    st.write(f"Entries **{cache_stats['size']}/{cache_stats['maxsize']}** · evictions **{cache_stats['evictions']}**")
+    if st.button("Clear cache"):
+        split_cache().clear()
+        st.rerun()
 
 # -------------------------------
 # Footer
@@ -211,10 +397,17 @@ with st.expander("How it works"):
         """
 - Enter **total amount** and **number of people**.
 - Optionally enter **names** and **how much each person paid**.
-- App computes an **equal fair share** and each person's **balance**:
+- App computes each person's **fair share** — equal by default, or by **weights**, **percentages** or
+  **fixed amounts + remainder** (Share mode in the sidebar) — and each person's **balance**:
   - **Positive** balance → should **receive** money.
   - **Negative** balance → **owes** money.
-- We also compute a **compact set of settlements** using a greedy creditor/debtor match.
-- You can **upload a CSV** with `name,paid` columns or download the results.
+- Amounts are kept in whole minor units (e.g. cents) at the chosen precision, so the shares always add up exactly to the total.
+- We also compute a **compact set of settlements** using a greedy creditor/debtor match,
+  or the **exact** solver, which finds the fewest transfers by splitting the group into zero-sum subgroups.
+- In **Itemised expenses** mode, add each expense with who paid and who it was for; balances update as you go and **Settle up** builds the transfers.
+- Set a **base currency** to mix currencies: each row (or uploaded `currency`/`date` column) is converted with a
+  local FX rates file (`date,from,to,rate`); the currency symbol is only used for display.
+- You can **upload a CSV** with `name,paid` columns or download the results (CSV, gzip CSV, Parquet or Arrow). Large files are read in chunks and
+  rows with the same name are added together; the number of people comes from the file.
         """
     )
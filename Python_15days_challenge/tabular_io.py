@@ -0,0 +1,187 @@
+"""
+Tabular file I/O shared by the expense splitter and the calculator.
+
+Reading: `read_columns` / `iter_columns` stream the wanted columns of a CSV
+(as strings) or Parquet file chunk by chunk, with pyarrow's readers when it
+is installed and pandas' C parser otherwise, so memory is bounded by the
+chunk size, not the file size.
+
+Writing: CSV, gzip-compressed CSV, Parquet and Arrow IPC. `export_frames`
+serialises straight into a binary buffer (no intermediate str, no
+.getvalue() copy), which Streamlit's download button can take as is.
+`ResultWriter` appends frames to one file as they arrive, so batch paths
+can write results without holding them all.
+
+Parquet/Arrow need pyarrow.
+"""
+import csv
+import gzip
+import io
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional, Union
+
+import pandas as pd
+
+# Optional: faster CSV reading/writing, Parquet and Arrow IPC
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except Exception:
+    HAS_PYARROW = False
+
+CHUNK_ROWS = 250_000
+
+CSV = "csv"
+CSV_GZ = "csv.gz"
+PARQUET = "parquet"
+ARROW = "arrow"
+MIME_TYPES = {
+    CSV: "text/csv",
+    CSV_GZ: "application/gzip",
+    PARQUET: "application/vnd.apache.parquet",
+    ARROW: "application/vnd.apache.arrow.file",
+}
+
+Source = Union[str, Path, BinaryIO]
+
+def available_formats() -> List[str]:
+    return [CSV, CSV_GZ, PARQUET, ARROW] if HAS_PYARROW else [CSV, CSV_GZ]
+
+def format_from_path(path: Union[str, Path]) -> str:
+    name = str(path).lower()
+    for fmt in (CSV_GZ, CSV, PARQUET, ARROW):
+        if name.endswith("." + fmt):
+            return fmt
+    raise ValueError(f"Can't tell the export format of {path!r} (use .csv, .csv.gz, .parquet or .arrow)")
+
+# -------------------------------
+# Reading
+# -------------------------------
+def csv_header(source: BinaryIO) -> List[str]:
+    """Column names from the first line, leaving the file position unchanged."""
+    pos = source.tell()
+    header = source.readline().decode("utf-8-sig", errors="ignore")
+    source.seek(pos)
+    return next(csv.reader([header]), [])
+
+def is_parquet(source: Source, name: str = "") -> bool:
+    name = (name or (str(source) if isinstance(source, (str, Path)) else "")).lower()
+    if name.endswith((".parquet", ".pq")):
+        return True
+    if isinstance(source, (str, Path)):
+        with open(source, "rb") as f:
+            return f.read(4) == b"PAR1"
+    pos = source.tell()
+    magic = source.read(4)
+    source.seek(pos)
+    return magic == b"PAR1"
+
+def read_columns(source: Source, name: str = "") -> List[str]:
+    """Column names, without reading the data."""
+    if is_parquet(source, name):
+        if not HAS_PYARROW:
+            raise RuntimeError("Parquet input needs pyarrow (pip install pyarrow)")
+        return list(pq.ParquetFile(source).schema_arrow.names)
+    if isinstance(source, (str, Path)):
+        with open(source, "rb") as f:
+            return csv_header(f)
+    return csv_header(source)
+
+def iter_columns(source: Source, columns: List[str], name: str = "",
+                 chunk_rows: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Chunks of `columns` (unique names): strings for CSV, stored types for Parquet."""
+    if is_parquet(source, name):
+        if not HAS_PYARROW:
+            raise RuntimeError("Parquet input needs pyarrow (pip install pyarrow)")
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_rows, columns=columns):
+            yield batch.to_pandas()
+    elif HAS_PYARROW:
+        reader = pa_csv.open_csv(
+            source,
+            read_options=pa_csv.ReadOptions(block_size=1 << 22),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=columns,
+                column_types={c: pa.string() for c in columns},
+                strings_can_be_null=False,
+            ),
+        )
+        for batch in reader:
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(source, usecols=columns, dtype=str, keep_default_na=False,
+                               chunksize=chunk_rows, engine="c")
+
+# -------------------------------
+# One-shot export (downloads)
+# -------------------------------
+def export_frames(data: Union[pd.DataFrame, "pa.Table"], fmt: str) -> io.BytesIO:
+    """Serialise into a BytesIO positioned at 0, ready for st.download_button."""
+    buf = io.BytesIO()
+    with ResultWriter(buf, fmt) as w:
+        w.write(data)
+    buf.seek(0)
+    return buf
+
+# -------------------------------
+# Streaming writer (batch)
+# -------------------------------
+class ResultWriter:
+    """
+    Append frames (pandas or Arrow) to a single CSV / CSV.gz / Parquet /
+    Arrow IPC output as they arrive. Only the frame being written is held in
+    memory; Parquet gets one row group per write. Arrow tables are written to
+    CSV by pyarrow (nulls empty, strings quoted), DataFrames by pandas.
+
+    The first frame fixes the columns (and, for columnar formats, the schema).
+    """
+
+    def __init__(self, target: Union[str, Path, BinaryIO], fmt: Optional[str] = None):
+        self.fmt = fmt or format_from_path(target)
+        if self.fmt in (PARQUET, ARROW) and not HAS_PYARROW:
+            raise RuntimeError(f"{self.fmt} export needs pyarrow (pip install pyarrow)")
+        self._own = isinstance(target, (str, Path))
+        self._fh: BinaryIO = open(target, "wb") if self._own else target
+        self._gz = gzip.GzipFile(fileobj=self._fh, mode="wb", compresslevel=6) if self.fmt == CSV_GZ else None
+        self._writer = None
+        self._header = True
+        self.rows = 0
+
+    def write(self, data: Union[pd.DataFrame, "pa.Table"]) -> None:
+        if self.fmt in (CSV, CSV_GZ):
+            if HAS_PYARROW and isinstance(data, pa.Table):
+                # Arrow's writer is much faster than DataFrame.to_csv for large numeric tables
+                pa_csv.write_csv(data, self._gz or self._fh,
+                                 pa_csv.WriteOptions(include_header=self._header, quoting_style="needed"))
+            else:
+                data.to_csv(self._gz or self._fh, index=False, header=self._header)
+        else:
+            table = data if isinstance(data, pa.Table) else pa.Table.from_pandas(data, preserve_index=False)
+            if self._writer is None:
+                if self.fmt == PARQUET:
+                    self._writer = pq.ParquetWriter(self._fh, table.schema)
+                else:
+                    self._writer = pa_ipc.new_file(self._fh, table.schema)
+            self._writer.write_table(table)
+        self._header = False
+        self.rows += len(data)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._gz is not None:
+            self._gz.close()
+            self._gz = None
+        if self._own:
+            self._fh.close()
+        else:
+            self._fh.flush()
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
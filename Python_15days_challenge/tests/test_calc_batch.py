@@ -0,0 +1,17 @@
+import numpy as np
+import pandas as pd
+
+from calc_batch import run_batch
+from tabular_io import ResultWriter
+
+def test_same_column_for_a_and_b(tmp_path):
+    # One-column files default to that in the app
+    src, out = tmp_path / "ops.csv", tmp_path / "square.csv"
+    pd.DataFrame({"a": np.round(np.random.default_rng(0).uniform(-1000, 1000, 2500), 2)}).to_csv(src, index=False)
+    with ResultWriter(out) as w:
+        stats = run_batch(src, w, "a", "a", None, "×", chunk_rows=1000)
+
+    got = pd.read_csv(out)
+    assert stats.rows == len(got) == 2500
+    assert list(got.columns) == ["a", "result", "error"]
+    assert np.allclose(got["result"], got["a"] ** 2)
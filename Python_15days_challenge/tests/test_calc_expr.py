@@ -0,0 +1,16 @@
+import pytest
+
+from calc_expr import ExprError, evaluate
+
+@pytest.mark.parametrize("text, expected", [
+    ("max(3)", 3.0),
+    ("min(-2.5)", -2.5),
+    ("max(1, 7, 4)", 7.0),
+    ("min(x, 2) + 1", 1.0),
+])
+def test_min_max_take_one_or_more_arguments(text, expected):
+    assert evaluate(text, {"x": 0}) == expected
+
+def test_min_without_arguments_is_rejected():
+    with pytest.raises(ExprError, match=r"min\(\) takes 1\+ argument"):
+        evaluate("min()")
@@ -0,0 +1,30 @@
+import io
+
+import numpy as np
+import pytest
+
+from expense_core import ExpenseLog, read_contributions
+
+def test_rescale_keeps_entered_amounts():
+    log = ExpenseLog(2)
+    log.add("ann", 12.34, ["ann", "bob"])
+    log.add("bob", 0.40, ["ann", "bob"])
+
+    coarse = log.rescaled(0)  # 0.40 rounds to 0 here; must not raise
+    assert coarse.to_frame()["amount"].tolist() == [12.0, 0.0]
+    assert coarse.to_ledger().balance.sum() == 0
+
+    back = coarse.rescaled(2)
+    assert back.to_frame()["amount"].tolist() == [12.34, 0.40]
+    np.testing.assert_array_equal(back.to_ledger().balance, log.to_ledger().balance)
+    assert back.add("ann", 1, ["bob"]) == 3  # ids keep counting
+
+def test_currency_column_without_base_currency():
+    one = io.BytesIO(b"name,paid,currency\nann,10,inr\nbob,5,INR\nann,1,\n")
+    frame, rows = read_contributions(one, 2)
+    assert rows == 3
+    assert frame.to_dict("list") == {"name": ["ann", "bob"], "paid": [11.0, 5.0]}
+
+    mixed = io.BytesIO(b"name,paid,currency\nann,10,INR\nbob,5,USD\n")
+    with pytest.raises(ValueError, match="set a base currency"):
+        read_contributions(mixed, 2)
@@ -1,95 +1,84 @@
 import time
 import csv
 import io
-from dataclasses import dataclass
-from typing import List, Dict, Optional
+from typing import Dict, Set
 import streamlit as st
 
+from quiz_bank import DEFAULT_QUESTIONS, QuestionBank, cache_info, import_csv, import_questions, open_bank
+from quiz_export import export_html
+from quiz_order import QuizOrder
+from quiz_results import Attempt, ResultsWriter, bank_summary, hardest_questions, leaderboard
+
+# Fragments (Streamlit >= 1.33) let the timer refresh without rerunning the page
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
 # -------------------------------
 # Page setup
 # -------------------------------
 st.set_page_config(page_title="Quiz App", page_icon="📝", layout="centered")
 
 # -------------------------------
-# Data structures
+# Question bank
 # -------------------------------
-@dataclass
-class Question:
-    q: str
-    options: List[str]  # exactly 4 options
-    answer_idx: int     # 0..3
-    explanation: str = ""
+@st.cache_resource
+def default_bank_id() -> str:
+    return import_questions(DEFAULT_QUESTIONS)
 
-# -------------------------------
-# Default questions (sample bank)
-# -------------------------------
-DEFAULT_QUESTIONS = [
-    Question(
-        q="What is the capital of Australia?",
-        options=["Sydney", "Melbourne", "Canberra", "Perth"],
-        answer_idx=2,
-        explanation="Canberra is the capital; Sydney is the largest city."
-    ),
-    Question(
-        q="Which one is not a Python data structure?",
-        options=["List", "Tuple", "Dictionary", "Pointer"],
-        answer_idx=3,
-        explanation="Python doesn't have raw pointers like C/C++."
-    ),
-    Question(
-        q="What does HTTP stand for?",
-        options=["HyperText Transfer Protocol", "High-Time Transfer Path", "HyperTool Text Protocol", "Host Transfer Text Protocol"],
-        answer_idx=0,
-        explanation="HTTP = HyperText Transfer Protocol."
-    ),
-    Question(
-        q="Which library is used for building web apps quickly in Python?",
-        options=["NumPy", "Streamlit", "Matplotlib", "Pandas"],
-        answer_idx=1,
-        explanation="Streamlit is designed for quick data/web apps."
-    ),
-]
+def current_bank() -> QuestionBank:
+    """Shared per process; the session only holds the bank id."""
+    return open_bank(st.session_state.bank_id)
 
-# -------------------------------
-# Helpers
-# -------------------------------
-def parse_csv(file) -> List[Question]:
+def new_order(n: int, shuffled: bool = False) -> QuizOrder:
     """
-    CSV columns required:
-    question, option_a, option_b, option_c, option_d, answer (A/B/C/D or 0-3), explanation
+    Lazy ordering: a seed and sizes, never a list of n ids. Sampling K of N
+    always draws a fresh seed, so each attempt gets its own K questions.
     """
-    text = file.read().decode("utf-8", errors="ignore")
-    reader = csv.DictReader(io.StringIO(text))
-    qs: List[Question] = []
-    for i, row in enumerate(reader, 1):
-        try:
-            q = row.get("question", "").strip()
-            opts = [row.get("option_a",""), row.get("option_b",""), row.get("option_c",""), row.get("option_d","")]
-            opts = [o.strip() for o in opts]
-            ans_raw = (row.get("answer","") or "").strip().upper()
-            if ans_raw in ("A","B","C","D"):
-                ans_idx = "ABCD".index(ans_raw)
-            else:
-                ans_idx = int(ans_raw)
-            exp = (row.get("explanation","") or "").strip()
-            if not q or len(opts) != 4:
-                continue
-            qs.append(Question(q=q, options=opts, answer_idx=ans_idx, explanation=exp))
-        except Exception:
-            st.warning(f"Skipping invalid row {i}.")
-    return qs
+    k = st.session_state.get("quiz_size", 0)
+    return QuizOrder.shuffled(n, k) if shuffled or 0 < k < n else QuizOrder(n, k)
+
+def reset_progress():
+    st.session_state.idx = 0
+    st.session_state.answers = {}
+    st.session_state.submitted = set()
+    st.session_state.n_correct = 0
+    st.session_state.review = None
+    st.session_state.started_at = time.time()
+
+def use_bank(bank_id: str):
+    # Per-session state is just the bank id, the order (seed + sizes), answers and submitted ids
+    st.session_state.bank_id = bank_id
+    st.session_state.order = new_order(len(current_bank()))
+    reset_progress()
+
+@st.cache_resource
+def results_writer() -> ResultsWriter:
+    """One background writer per process, shared by every session."""
+    return ResultsWriter()
+
+@st.cache_data(ttl=5, show_spinner=False)
+def leaderboard_view(bank_id: str, total: int):
+    return leaderboard(bank_id, total), bank_summary(bank_id), hardest_questions(bank_id)
+
+@st.cache_data(max_entries=4, show_spinner="Building the offline quiz...")
+def offline_html(bank_id: str) -> bytes:
+    """Self-grading HTML page for a bank; built once per bank, not per session."""
+    return export_html(open_bank(bank_id), title="Quiz App")
 
 def init_state():
-    if "questions" not in st.session_state:
-        st.session_state.questions: List[Question] = DEFAULT_QUESTIONS.copy()
+    if "bank_id" not in st.session_state:
+        st.session_state.bank_id = default_bank_id()
     if "order" not in st.session_state:
-        st.session_state.order = list(range(len(st.session_state.questions)))
+        st.session_state.order = new_order(len(current_bank()))
     if "idx" not in st.session_state:
         st.session_state.idx = 0
     if "answers" not in st.session_state:
         st.session_state.answers: Dict[int, int] = {}  # question_index -> chosen_idx
     if "submitted" not in st.session_state:
-        st.session_state.submitted: Dict[int, bool] = {}
+        st.session_state.submitted: Set[int] = set()
+    if "n_correct" not in st.session_state:
+        st.session_state.n_correct = 0  # running count, updated in submit()
+    if "review" not in st.session_state:
+        st.session_state.review = None  # (rows, csv bytes), built once on completion
     if "start_time" not in st.session_state:
         st.session_state.start_time = None
     if "time_left" not in st.session_state:
@@ -98,6 +87,10 @@ def init_state():
         st.session_state.timer_on = False
     if "total_seconds" not in st.session_state:
         st.session_state.total_seconds = 0
+    if "full_run" not in st.session_state:
+        st.session_state.full_run = False
+    if "started_at" not in st.session_state:
+        st.session_state.started_at = time.time()
 
 def start_timer(total_seconds: int):
     st.session_state.timer_on = True
@@ -105,37 +98,95 @@ def start_timer(total_seconds: int):
     st.session_state.start_time = time.time()
     st.session_state.time_left = total_seconds
 
-def tick_timer():
+def tick_timer() -> bool:
+    """Advance the countdown; True if time ran out and a question was auto-submitted just now."""
     if not st.session_state.timer_on or st.session_state.start_time is None:
-        return
+        return False
     elapsed = int(time.time() - st.session_state.start_time)
     st.session_state.time_left = max(0, st.session_state.total_seconds - elapsed)
     if st.session_state.time_left == 0:
         # Auto-submit current question if not yet submitted
         qi = st.session_state.order[st.session_state.idx]
-        if qi not in st.session_state.submitted:
-            st.session_state.submitted[qi] = True
+        return submit(qi, st.session_state.answers.get(qi))
+    return False
+
+def timer_panel():
+    """
+    Countdown metric. While the timer runs this is a fragment refreshed every
+    second on its own, so the rest of the page isn't re-executed per tick.
+    """
+    tick_timer()
+    if st.session_state.time_left == 0 and not st.session_state.full_run:
+        # Expired in a fragment-only run: redraw the whole page once (auto-submitted answer, warning).
+        # That run draws the panel without run_every, which ends the per-second refresh.
+        st.rerun()
+    m, s = divmod(st.session_state.time_left, 60)
+    st.metric("Time left", f"{m:02d}:{s:02d}")
+    if st.session_state.time_left == 0:
+        st.warning("⏰ Time is up for this quiz.")
+        # Allow navigation/review but auto-submitted where needed.
 
 def reset_quiz(keep_bank=False):
-    if not keep_bank:
-        st.session_state.questions = DEFAULT_QUESTIONS.copy()
-    st.session_state.order = list(range(len(st.session_state.questions)))
-    st.session_state.idx = 0
-    st.session_state.answers = {}
-    st.session_state.submitted = {}
+    use_bank(st.session_state.bank_id if keep_bank else default_bank_id())
     st.session_state.start_time = None
     st.session_state.time_left = None
     st.session_state.timer_on = False
     st.session_state.total_seconds = 0
 
+def submit(qi: int, choice) -> bool:
+    """Lock in an answer and update the running score; False if it was already submitted."""
+    if qi in st.session_state.submitted:
+        return False
+    if choice is not None:
+        st.session_state.answers[qi] = int(choice)
+    st.session_state.submitted.add(qi)
+    if choice is not None and int(choice) == current_bank()[qi].answer_idx:
+        st.session_state.n_correct += 1
+    return True
+
 def score_summary():
-    correct = 0
-    for qi, q in enumerate(st.session_state.questions):
-        if qi in st.session_state.answers and qi in st.session_state.submitted:
-            if st.session_state.answers[qi] == q.answer_idx:
-                correct += 1
-    total = len(st.session_state.questions)
-    return correct, total
+    return st.session_state.n_correct, len(st.session_state.order)
+
+def review_ids():
+    """Question ids the attempt covered: the sample in quiz order, else the whole bank in bank order."""
+    order = st.session_state.order
+    return list(order) if order.sampled else range(order.n)
+
+def build_review():
+    """Review rows and the results CSV, computed once when the quiz completes."""
+    answers = st.session_state.answers
+    rows = []
+    ids = review_ids()
+    for i, QQ in zip(ids, current_bank().many(ids)):
+        your = answers.get(i, None)
+        rows.append({
+            "Q#": i + 1,
+            "Question": QQ.q,
+            "Your Answer": "" if your is None else QQ.options[your],
+            "Correct Answer": QQ.options[QQ.answer_idx],
+            "Result": "Correct" if your == QQ.answer_idx else "Wrong",
+        })
+    buf = io.StringIO()
+    w = csv.DictWriter(buf, fieldnames=["Q#", "Question", "Your Answer", "Correct Answer", "Result"])
+    w.writeheader()
+    w.writerows(rows)
+    return rows, buf.getvalue().encode("utf-8")
+
+def record_attempt(rows):
+    """Queue the finished attempt for the results store; returns immediately."""
+    answers = st.session_state.answers
+    order = st.session_state.order
+    ids = review_ids()
+    results_writer().record(Attempt(
+        bank_id=st.session_state.bank_id,
+        player=st.session_state.get("player", "").strip() or "Anonymous",
+        correct=st.session_state.n_correct,
+        total=len(rows),
+        seconds=time.time() - st.session_state.started_at,
+        answers="".join("ABCD"[answers[i]] if i in answers else "-" for i in ids),
+        marks="".join("1" if r["Result"] == "Correct" else "0" for r in rows),
+        qids=",".join(map(str, ids)) if order.sampled else "",
+    ))
 
 # -------------------------------
 # Sidebar (settings)
@@ -144,23 +195,52 @@ init_state()
 st.sidebar.header("⚙️ Settings")
 
 uploaded = st.sidebar.file_uploader("Upload CSV (optional)", type=["csv"])
-if uploaded:
-    custom = parse_csv(uploaded)
-    if custom:
-        st.session_state.questions = custom
-        st.session_state.order = list(range(len(custom)))
-        st.session_state.idx = 0
-        st.session_state.answers = {}
-        st.session_state.submitted = {}
-        st.sidebar.success(f"Loaded {len(custom)} questions.")
+# Import each upload once; reruns with the same file keep the quiz progress
+if uploaded and st.session_state.get("upload_id") != uploaded.file_id:
+    st.session_state.upload_id = uploaded.file_id
+    try:
+        custom = open_bank(import_csv(uploaded))
+    except ValueError as e:
+        st.sidebar.error(str(e))
     else:
-        st.sidebar.error("No valid questions found in the CSV.")
+        if len(custom):
+            use_bank(custom.bank_id)
+            st.sidebar.success(f"Loaded {len(custom)} questions.")
+        else:
+            st.sidebar.error("No valid questions found in the CSV.")
+
+# One summary for all skipped rows, with the full report as a download
+bank = current_bank()
+if bank.n_errors:
+    with st.sidebar.expander(f"⚠️ {bank.n_errors:,} invalid row(s) skipped"):
+        st.dataframe([vars(e) for e in bank.errors(limit=200)], hide_index=True, use_container_width=True)
+        st.download_button("⬇️ Error report (CSV)", data=bank.errors_csv(),
+                           file_name="quiz_bank_errors.csv", mime="text/csv")
+
+if st.session_state.get("quiz_size", 0) > len(bank):
+    st.session_state.quiz_size = 0  # left over from a larger bank
+quiz_size = st.sidebar.number_input("Questions per attempt (0 = all)", min_value=0, max_value=len(bank),
+                                    value=0, step=5, key="quiz_size")
+if quiz_size != st.session_state.order.k:
+    # A different sample size is a different attempt
+    st.session_state.order = new_order(len(bank))
+    reset_progress()
 
 shuffle = st.sidebar.checkbox("Shuffle questions", value=True)
 if shuffle and st.sidebar.button("Reshuffle"):
-    import random
-    random.shuffle(st.session_state.order)
-    st.session_state.idx = 0
+    st.session_state.order = new_order(len(bank), shuffled=True)
+    if st.session_state.order.sampled:
+        reset_progress()  # a new seed draws different questions
+    else:
+        st.session_state.idx = 0
+
+with st.sidebar.expander("📦 Offline quiz (HTML)"):
+    st.caption("One self-contained page that grades in the browser; no server needed. "
+               "The answer key is inside the page, so use it for practice only.")
+    if st.button("Build offline quiz") or st.session_state.get("offline_for") == bank.bank_id:
+        st.session_state.offline_for = bank.bank_id
+        st.download_button("⬇️ Download quiz (HTML)", data=offline_html(bank.bank_id),
+                           file_name="quiz.html", mime="text/html")
 
 with st.sidebar.expander("⏱️ Timer (optional)"):
     use_timer = st.checkbox("Enable per-quiz timer", value=False, key="use_timer_key")
@@ -173,58 +253,78 @@ with st.sidebar.expander("⏱️ Timer (optional)"):
         else:
             start_timer(total_seconds)
 
+st.sidebar.text_input("Your name (for the leaderboard)", key="player", max_chars=40)
 st.sidebar.button("🔁 Restart quiz", on_click=reset_quiz)
 
+with st.sidebar.expander("🐞 Debug: bank cache"):
+    info = cache_info()
+    banks, imports = info["banks"], info["imports"]
+    st.write(f"Banks **{banks['size']}/{banks['maxsize']}** · hit rate **{banks['hit_rate']:.0%}** · "
+             f"evictions **{banks['evictions']}** · expired **{banks['expirations']}**")
+    st.write(f"Questions held **{banks['questions_held']:,}** · question LRU "
+             f"**{info['questions']['size']:,}/{info['questions']['maxsize']:,}**")
+    st.write(f"Uploads parsed **{imports['parsed']}** · reused **{imports['reused']}**")
+    writes = results_writer().stats()
+    st.write(f"Results written **{writes['written']}** in **{writes['batches']}** batch(es) · "
+             f"pending **{writes['pending']}** · failed **{writes['failed']}**")
+
 # -------------------------------
 # Header / progress
 # -------------------------------
 st.title("📝 Quiz App")
-q_count = len(st.session_state.questions)
+q_count = len(st.session_state.order)
 current = st.session_state.idx + 1
 st.progress(current / q_count, text=f"Question {current} of {q_count}")
+st.caption(f"Submitted {len(st.session_state.submitted)} · correct {st.session_state.n_correct}")
 
 # Timer display
 col_t1, col_t2 = st.columns([1, 3])
 with col_t1:
     if st.session_state.timer_on:
-        tick_timer()
-        m, s = divmod(st.session_state.time_left, 60)
-        st.metric("Time left", f"{m:02d}:{s:02d}")
-        if st.session_state.time_left == 0:
-            st.warning("⏰ Time is up for this quiz.")
-            # Allow navigation/review but auto-submitted where needed.
+        tick_timer()  # so a countdown that ends in this run is drawn without scheduling a refresh
+        ticking = st.session_state.time_left != 0
+        st.session_state.full_run = True  # fragment-only reruns skip this line
+        if ticking and fragment is not None:
+            fragment(timer_panel, run_every=1)()
+        else:
+            timer_panel()
+        st.session_state.full_run = False
 
 # -------------------------------
 # Question card
 # -------------------------------
 qi = st.session_state.order[st.session_state.idx]
-q = st.session_state.questions[qi]
+q = bank[qi]
 
 st.subheader(q.q)
 options = q.options
 
 # Preserve previously selected choice if any
 prev = st.session_state.answers.get(qi, None)
-choice = st.radio("Select one:", range(4), format_func=lambda i: options[i], index=prev if prev is not None else 0, key=f"radio_{qi}")
+locked = qi in st.session_state.submitted
+choice = st.radio("Select one:", range(4), format_func=lambda i: options[i], index=prev if prev is not None else 0,
+                  key=f"radio_{qi}", disabled=locked)
 
 # Actions
 c1, c2, c3 = st.columns(3)
-submit_clicked = c1.button("✅ Submit", use_container_width=True, disabled=qi in st.session_state.submitted)
+submit_clicked = c1.button("✅ Submit", use_container_width=True, disabled=locked)
 next_clicked   = c2.button("➡️ Next", use_container_width=True)
 prev_clicked   = c3.button("⬅️ Previous", use_container_width=True)
 
 # Handle submit
 if submit_clicked:
-    st.session_state.answers[qi] = int(choice)
-    st.session_state.submitted[qi] = True
+    submit(qi, choice)
 
-# Auto-save selection even if not submitted
-st.session_state.answers[qi] = int(choice)
+# Auto-save selection until it is submitted (then the score has counted it)
+if qi not in st.session_state.submitted:
+    st.session_state.answers[qi] = int(choice)
 
-# Feedback
+# Feedback (a question auto-submitted by the timer may have no answer)
 if qi in st.session_state.submitted:
-    is_correct = st.session_state.answers[qi] == q.answer_idx
-    if is_correct:
+    answer = st.session_state.answers.get(qi)
+    if answer is None:
+        st.warning(f"⏰ Not answered. Correct answer: {q.options[q.answer_idx]}")
+    elif answer == q.answer_idx:
         st.success("✅ Correct!")
     else:
         st.error(f"❌ Incorrect. Correct answer: {q.options[q.answer_idx]}")
@@ -250,31 +350,39 @@ if all_done:
     correct, total = score_summary()
     st.header(f"🏁 Quiz Complete: {correct}/{total} correct")
 
-    # Review table
-    rows = []
-    for i in range(total):
-        QQ = st.session_state.questions[i]
-        your = st.session_state.answers.get(i, None)
-        rows.append({
-            "Q#": i + 1,
-            "Question": QQ.q,
-            "Your Answer": "" if your is None else QQ.options[your],
-            "Correct Answer": QQ.options[QQ.answer_idx],
-            "Result": "Correct" if your == QQ.answer_idx else "Wrong",
-        })
+    # Review table + export, built on the first completed run only
+    if st.session_state.review is None:
+        st.session_state.review = build_review()
+        try:
+            record_attempt(st.session_state.review[0])
+        except RuntimeError as e:
+            st.warning(f"This attempt couldn't be saved to the leaderboard: {e}")
+    rows, results_csv = st.session_state.review
     st.dataframe(rows, use_container_width=True, hide_index=True)
-
-    # Export results
-    buf = io.StringIO()
-    w = csv.writer(buf)
-    w.writerow(["Q#", "Question", "Your Answer", "Correct Answer", "Result"])
-    for r in rows:
-        w.writerow([r["Q#"], r["Question"], r["Your Answer"], r["Correct Answer"], r["Result"]])
-    st.download_button("⬇️ Download Results (CSV)", data=buf.getvalue().encode("utf-8"),
+    st.download_button("⬇️ Download Results (CSV)", data=results_csv,
                        file_name="quiz_results.csv", mime="text/csv")
 
     st.button("🔄 Restart", on_click=lambda: reset_quiz(keep_bank=True))
 
+# Leaderboard + stats, read from the incrementally maintained aggregates
+with st.expander("🏆 Leaderboard & stats"):
+    board, summary, hardest = leaderboard_view(st.session_state.bank_id, q_count)
+    if summary is None:
+        st.write("No completed attempts for this bank yet.")
+    else:
+        m1, m2, m3 = st.columns(3)
+        m1.metric("Attempts", f"{summary['attempts']:,}")
+        m2.metric("Average score", f"{summary['mean_score']:.0%}")
+        m3.metric("Average time", f"{summary['mean_seconds']:.0f}s")
+        st.caption(f"Best scores on {q_count}-question attempts")
+        if board:
+            st.dataframe(board, use_container_width=True, hide_index=True)
+        else:
+            st.write("No completed attempts of this size yet.")
+        if hardest:
+            st.caption("Hardest questions: " + ", ".join(
+                f"Q{h['qid'] + 1} ({h['correct_rate']:.0%} of {h['answered']})" for h in hardest))
+
 # Footer hint
 st.caption("Tip: Upload a CSV to use your own questions. Required headers: "
            "`question, option_a, option_b, option_c, option_d, answer, explanation` (answer A/B/C/D or 0-3).")
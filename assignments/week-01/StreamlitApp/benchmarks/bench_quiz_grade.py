@@ -0,0 +1,90 @@
+"""
+Bulk grading: the app's per-answer comparison vs the vectorized grader.
+
+Generates a bank and a file of answer sheets ("student,answers" layout) and
+grades it twice. "loop" is the Quiz.py path applied sheet by sheet
+(`answers[qi] == bank[qi].answer_idx` for every answer); "vector" is
+`quiz_grade.grade_files`, which also writes scores.csv and the item
+statistics. Both must agree on every score.
+
+Usage:
+    python benchmarks/bench_quiz_grade.py
+    python benchmarks/bench_quiz_grade.py --sheets 50000 --questions 200
+"""
+import argparse
+import csv
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from quiz_bank import import_questions, make_question, open_bank  # noqa: E402
+from quiz_grade import grade_files  # noqa: E402
+
+def make_sheets(path: Path, key: np.ndarray, sheets: int, seed: int = 0) -> None:
+    """Students of varying ability; about 3% blanks."""
+    rng = np.random.default_rng(seed)
+    ability = rng.uniform(0.3, 0.95, size=(sheets, 1))
+    right = rng.random((sheets, len(key))) < ability
+    picks = np.where(right, key, (key + rng.integers(1, 4, size=(sheets, len(key)))) % 4)
+    letters = np.array(list("ABCD-"))[np.where(rng.random(picks.shape) < 0.03, 4, picks)]
+    with open(path, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["student", "answers"])
+        for i, row in enumerate(letters):
+            w.writerow([f"s{i:06d}", "".join(row)])
+
+def loop_grade(bank, path: Path) -> List[int]:
+    """One comparison per answer, as the app grades a single session."""
+    scores = []
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        next(reader)
+        for _, answers in reader:
+            correct = 0
+            for qi, ch in enumerate(answers):
+                if ch in "ABCD" and "ABCD".index(ch) == bank[qi].answer_idx:
+                    correct += 1
+            scores.append(correct)
+    return scores
+
+def main(args) -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        rng = np.random.default_rng(1)
+        questions = [make_question(f"Question {i}?", [f"{c}{i}" for c in "abcd"], int(rng.integers(4)))
+                     for i in range(args.questions)]
+        bank = open_bank(import_questions(questions, tmp), tmp)
+        sheets = tmp / "sheets.csv"
+        make_sheets(sheets, np.frombuffer(bank.answer_key(), dtype=np.uint8), args.sheets)
+        print(f"{args.sheets:,} sheets x {args.questions} questions "
+              f"({sheets.stat().st_size / 2**20:.1f} MiB)\n")
+
+        t0 = time.perf_counter()
+        expected = loop_grade(bank, sheets)
+        loop_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        grade_files(bank, [sheets], tmp / "out")
+        vector_s = time.perf_counter() - t0
+        got = pd.read_csv(tmp / "out" / "scores.csv")["correct"].tolist()
+        if got != expected:
+            print("MISMATCH between loop and vectorized scores")
+            return 1
+
+    print(f"{'path':8} {'seconds':>9} {'sheets/s':>12}")
+    for name, s in (("loop", loop_s), ("vector", vector_s)):
+        print(f"{name:8} {s:>9.2f} {args.sheets / s:>12,.0f}")
+    print(f"\nspeedup {loop_s / vector_s:.0f}x (vector includes writing scores.csv and questions.csv)")
+    return 0
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Benchmark bulk grading of answer sheets")
+    ap.add_argument("--sheets", type=int, default=20_000, help="Answer sheets to grade (default: 20000)")
+    ap.add_argument("--questions", type=int, default=100, help="Questions in the bank (default: 100)")
+    raise SystemExit(main(ap.parse_args()))
@@ -0,0 +1,113 @@
+"""
+Memory per concurrent quiz user, before and after the shared bank.
+
+"legacy" reproduces the original app: every session parses the CSV into its
+own list of plain dataclass Questions (list options) and keeps a list order
+plus dict answers/submitted. "shared" is the current app: one imported
+QuestionBank per process (frozen, slotted Questions with interned tuple
+options) and per-session state of bank id, a lazy QuizOrder (seed and sizes),
+answers and a set of submitted ids.
+
+Usage:
+    python benchmarks/bench_quiz_memory.py
+    python benchmarks/bench_quiz_memory.py --questions 1000,20000 --sessions 50 --answered 30
+"""
+import argparse
+import csv
+import io
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[4] / "benchmarks"))
+import quiz_bank  # noqa: E402
+from quiz_bank import BANKS, import_csv, open_bank  # noqa: E402
+from quiz_order import QuizOrder  # noqa: E402
+from bench_common import legacy_parse_csv  # noqa: E402
+
+# Options that real banks repeat a lot
+COMMON_OPTIONS = ["True", "False", "All of the above", "None of the above", "Both A and B", "Not sure"]
+
+# -------------------------------
+# Synthetic bank
+# -------------------------------
+def make_bank_csv(n: int) -> bytes:
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    w.writerow(["question", "option_a", "option_b", "option_c", "option_d", "answer", "explanation"])
+    for i in range(n):
+        if i % 3 == 0:
+            opts = COMMON_OPTIONS[:4]
+        else:
+            opts = [f"Option {c} for question {i}" for c in "ABCD"]
+        w.writerow([f"Question number {i}: which option is right?", *opts, "ABCD"[i % 4],
+                    "" if i % 2 else f"Because of reason {i % 50}."])
+    return buf.getvalue().encode("utf-8")
+
+# -------------------------------
+# Sessions
+# -------------------------------
+def legacy_session(data: bytes, answered: int) -> Dict:
+    questions = legacy_parse_csv(io.BytesIO(data), lambda _: None)
+    s = {"questions": questions, "order": list(range(len(questions))), "idx": 0, "answers": {}, "submitted": {}}
+    for qi in range(min(answered, len(questions))):
+        s["answers"][qi] = 1
+        s["submitted"][qi] = True
+    return s
+
+def shared_session(bank_id: str, bank_dir: Path, answered: int) -> Dict:
+    bank = open_bank(bank_id, bank_dir)
+    s = {"bank_id": bank_id, "order": QuizOrder.shuffled(len(bank)), "idx": 0, "answers": {}, "submitted": set()}
+    for qi in range(min(answered, len(bank))):
+        bank[qi]
+        s["answers"][qi] = 1
+        s["submitted"].add(qi)
+    return s
+
+def traced(fn: Callable[[], object]) -> tuple:
+    """(retained bytes after fn, result); the result is kept alive while measuring."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = fn()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+def run(n: int, sessions: int, answered: int) -> Dict[str, float]:
+    data = make_bank_csv(n)
+    with tempfile.TemporaryDirectory() as tmp:
+        bank_dir = Path(tmp)
+        BANKS.clear()
+        quiz_bank._fetch.cache_clear()
+        bank_id = import_csv(io.BytesIO(data), bank_dir)
+
+        legacy_bytes, _ = traced(lambda: [legacy_session(data, answered) for _ in range(sessions)])
+        shared_bytes, _ = traced(lambda: open_bank(bank_id, bank_dir))  # one bank per process
+        session_bytes, _ = traced(lambda: [shared_session(bank_id, bank_dir, answered) for _ in range(sessions)])
+        BANKS.clear()
+        quiz_bank._fetch.cache_clear()
+    return {
+        "legacy_per_user": legacy_bytes / sessions,
+        "shared_bank": shared_bytes,
+        "shared_per_user": session_bytes / sessions,
+    }
+
+def main(args) -> int:
+    sizes = [int(s) for s in args.questions.split(",")]
+    print(f"{'questions':>10} {'legacy KiB/user':>16} {'shared KiB/user':>16} {'bank KiB (once)':>16} {'ratio':>7}")
+    for n in sizes:
+        r = run(n, args.sessions, args.answered)
+        ratio = r["legacy_per_user"] / max(r["shared_per_user"], 1)
+        print(f"{n:>10,} {r['legacy_per_user'] / 1024:>16,.1f} {r['shared_per_user'] / 1024:>16,.1f} "
+              f"{r['shared_bank'] / 1024:>16,.1f} {ratio:>6.0f}x")
+    return 0
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Measure quiz memory per concurrent user")
+    ap.add_argument("--questions", default="100,1000,10000", help="Comma-separated bank sizes")
+    ap.add_argument("--sessions", type=int, default=20, help="Concurrent sessions to simulate")
+    ap.add_argument("--answered", type=int, default=20, help="Questions answered per session")
+    raise SystemExit(main(ap.parse_args()))
@@ -0,0 +1,88 @@
+"""
+Quiz bank parsing: original `parse_csv` vs the streaming, validating parser.
+
+Builds a dirty bank CSV (bad answers, out-of-range answers, empty options,
+duplicates) and times, for each path, the best of --repeat runs plus the
+peak traced memory of one run. "legacy" is the original read-all/decode/
+StringIO parser with one warning per bad row (counted, since each one was a
+UI element); "stream" is `read_questions`; "import" is the full
+`import_csv` into a SQLite bank.
+
+Usage:
+    python benchmarks/bench_quiz_parse.py
+    python benchmarks/bench_quiz_parse.py --rows 50000 --dirty 0.2 --repeat 3
+"""
+import argparse
+import csv
+import io
+import random
+import sys
+import tempfile
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[4] / "benchmarks"))
+from bench_common import legacy_parse_csv, measure  # noqa: E402
+from quiz_bank import RowError, import_csv, read_questions  # noqa: E402
+
+# -------------------------------
+# Synthetic dirty bank
+# -------------------------------
+def make_dirty_csv(rows: int, dirty: float, seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    w.writerow(["question", "option_a", "option_b", "option_c", "option_d", "answer", "explanation"])
+    for i in range(rows):
+        row = [f"Question {i}: pick the right option", f"alpha {i}", f"beta {i}", f"gamma {i}", f"delta {i}",
+               "ABCD"[i % 4], f"Explanation for {i}"]
+        if rng.random() < dirty:
+            kind = rng.randrange(4)
+            if kind == 0:
+                row[5] = "E"              # not a letter we know
+            elif kind == 1:
+                row[5] = str(rng.choice([4, 7, -1]))  # out of range
+            elif kind == 2:
+                row[2] = ""               # empty option
+            else:
+                row[0] = f"Question {max(0, i - 1)}: pick the right option"  # duplicate
+        w.writerow(row)
+    return buf.getvalue().encode("utf-8")
+
+def main(args) -> int:
+    data = make_dirty_csv(args.rows, args.dirty)
+    print(f"{len(data) / 2**20:.1f} MiB, {args.rows:,} rows, ~{args.dirty:.0%} dirty\n")
+    print(f"{'path':8} {'ms':>10} {'peak MiB':>9} {'questions':>10} {'reported':>10}")
+
+    def legacy():
+        warnings: List[str] = []
+        qs = legacy_parse_csv(io.BytesIO(data), warnings.append)
+        return len(qs), len(warnings)
+
+    def stream():
+        errors: List[RowError] = []
+        n = sum(1 for _ in read_questions(io.BytesIO(data), errors))
+        return n, len(errors)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        counter = iter(range(1 << 30))
+
+        def full_import():
+            # a fresh directory each run so nothing is reused from the previous import
+            import_csv(io.BytesIO(data), Path(tmp) / str(next(counter)))
+            return "", ""
+
+        for name, fn in (("legacy", legacy), ("stream", stream), ("import", full_import)):
+            t, peak, (n, reported) = measure(fn, args.repeat)
+            print(f"{name:8} {t * 1000:>10.1f} {peak / 2**20:>9.1f} {n:>10} {reported:>10}")
+    print("\nlegacy 'reported' = st.warning calls (one UI element each); "
+          "stream 'reported' = rows in the single error report")
+    return 0
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Benchmark quiz bank CSV parsing")
+    ap.add_argument("--rows", type=int, default=50_000, help="Rows in the synthetic bank (default: 50000)")
+    ap.add_argument("--dirty", type=float, default=0.2, help="Fraction of bad rows (default: 0.2)")
+    ap.add_argument("--repeat", type=int, default=3, help="Timed runs per path; best is kept")
+    raise SystemExit(main(ap.parse_args()))
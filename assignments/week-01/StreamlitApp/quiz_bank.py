@@ -0,0 +1,436 @@
+"""
+SQLite-backed question bank for the Quiz app.
+
+A bank is imported once into an indexed SQLite file named after the hash of
+its source, so the same CSV uploaded by many students (or imported ahead of
+time with the command below) is parsed and stored a single time. Sessions
+keep only the bank id and question ids; `QuestionBank` fetches `Question`
+objects on demand through a small per-process LRU cache (small banks are
+simply held whole, once per process). Opened banks live in `BANKS`, a
+size-bounded LRU with an idle TTL and hit/miss statistics, shared by all
+sessions of the process.
+
+Questions are immutable and slotted with tuple options, and repeated
+strings (options such as "True"/"False", empty explanations) are interned,
+so one copy is shared by every session that shows them.
+
+Usage:
+    python quiz_bank.py certification.csv        # import once, print the bank id
+"""
+import argparse
+import csv
+import hashlib
+import io
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+BANK_DIR = Path(os.environ.get("QUIZ_BANK_DIR", Path(__file__).resolve().parent / "quiz_banks"))
+FETCH_CACHE_SIZE = 4096   # questions kept per process, across all banks and sessions
+PRELOAD_MAX = 20_000      # banks up to this size are held whole instead of fetched
+BANK_CACHE_SIZE = int(os.environ.get("QUIZ_BANK_CACHE_SIZE", 16))     # open banks per process
+BANK_CACHE_TTL = float(os.environ.get("QUIZ_BANK_CACHE_TTL", 3600))   # seconds a bank may sit unused
+INSERT_BATCH = 5_000
+
+# -------------------------------
+# Data structures
+# -------------------------------
+@dataclass(frozen=True, slots=True)
+class Question:
+    q: str
+    options: Tuple[str, str, str, str]
+    answer_idx: int     # 0..3
+    explanation: str = ""
+
+def make_question(q: str, options: Sequence[str], answer_idx: int, explanation: str = "") -> Question:
+    """Question with tuple options and interned option/explanation strings."""
+    return Question(q=q, options=tuple(map(sys.intern, options)), answer_idx=int(answer_idx),
+                    explanation=sys.intern(explanation))
+
+# -------------------------------
+# Default questions (sample bank)
+# -------------------------------
+DEFAULT_QUESTIONS = (
+    make_question(
+        q="What is the capital of Australia?",
+        options=["Sydney", "Melbourne", "Canberra", "Perth"],
+        answer_idx=2,
+        explanation="Canberra is the capital; Sydney is the largest city."
+    ),
+    make_question(
+        q="Which one is not a Python data structure?",
+        options=["List", "Tuple", "Dictionary", "Pointer"],
+        answer_idx=3,
+        explanation="Python doesn't have raw pointers like C/C++."
+    ),
+    make_question(
+        q="What does HTTP stand for?",
+        options=["HyperText Transfer Protocol", "High-Time Transfer Path", "HyperTool Text Protocol", "Host Transfer Text Protocol"],
+        answer_idx=0,
+        explanation="HTTP = HyperText Transfer Protocol."
+    ),
+    make_question(
+        q="Which library is used for building web apps quickly in Python?",
+        options=["NumPy", "Streamlit", "Matplotlib", "Pandas"],
+        answer_idx=1,
+        explanation="Streamlit is designed for quick data/web apps."
+    ),
+)
+
+# -------------------------------
+# CSV parsing
+# -------------------------------
+OPTION_COLUMNS = ("option_a", "option_b", "option_c", "option_d")
+REQUIRED_COLUMNS = ("question", *OPTION_COLUMNS, "answer")
+
+@dataclass(frozen=True)
+class RowError:
+    line: int     # line in the file where the row starts (header is line 1)
+    column: str
+    message: str
+
+class InvalidRow(ValueError):
+    def __init__(self, column: str, message: str):
+        super().__init__(message)
+        self.column = column
+
+def parse_row(values: Sequence[str]) -> Question:
+    """
+    One CSV row as (question, option_a..option_d, answer, explanation)
+    -> Question; InvalidRow names the first bad column.
+    """
+    q, a, b, c, d, ans_raw, exp = [v.strip() for v in values]
+    if not q:
+        raise InvalidRow("question", "question is empty")
+    opts = (a, b, c, d)
+    if not (a and b and c and d):
+        k = OPTION_COLUMNS[opts.index("")]
+        raise InvalidRow(k, f"{k} is empty")
+    ans_idx = _ANSWERS.get(ans_raw.upper())
+    if ans_idx is None:
+        raise InvalidRow("answer", f"answer {ans_raw!r} is not A-D or 0-3")
+    return make_question(q=q, options=opts, answer_idx=ans_idx, explanation=exp)
+
+_ANSWERS = {"A": 0, "B": 1, "C": 2, "D": 3, "0": 0, "1": 1, "2": 2, "3": 3}
+
+def read_questions(file: BinaryIO, errors: List[RowError]) -> Iterator[Question]:
+    """
+    Stream questions out of a CSV file object, decoding as it goes.
+    CSV columns required:
+    question, option_a, option_b, option_c, option_d, answer (A/B/C/D or 0-3), explanation
+    Every invalid or duplicate row is skipped and recorded in `errors`;
+    missing columns raise ValueError before any row is read.
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8", errors="ignore", newline="")
+    try:
+        reader = csv.reader(text)
+        header = [h.strip() for h in next(reader, [])]
+        missing = [c for c in REQUIRED_COLUMNS if c not in header]
+        if missing:
+            raise ValueError(f"CSV is missing column(s): {', '.join(missing)}")
+        cols = [header.index(c) for c in REQUIRED_COLUMNS]
+        exp_col = header.index("explanation") if "explanation" in header else None
+        width = len(header)
+        seen: Dict[str, int] = {}  # normalised question -> line it first appeared on
+        line = reader.line_num + 1
+        for row in reader:
+            if row:  # blank lines are not rows
+                if len(row) < width:
+                    row += [""] * (width - len(row))
+                try:
+                    parsed = parse_row([row[i] for i in cols] + [row[exp_col] if exp_col is not None else ""])
+                    key = " ".join(parsed.q.lower().split())
+                    if key in seen:
+                        raise InvalidRow("question", f"duplicate of the question on line {seen[key]}")
+                    seen[key] = line
+                except InvalidRow as e:
+                    errors.append(RowError(line, e.column, str(e)))
+                else:
+                    yield parsed
+            line = reader.line_num + 1
+    finally:
+        text.detach()  # leave the caller's file open
+
+def errors_csv(errors: Iterable[RowError]) -> bytes:
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    w.writerow(["line", "column", "error"])
+    w.writerows((e.line, e.column, e.message) for e in errors)
+    return buf.getvalue().encode("utf-8")
+
+# -------------------------------
+# Import (once per distinct source)
+# -------------------------------
+SCHEMA = """
+CREATE TABLE questions (
+    id INTEGER PRIMARY KEY,
+    question TEXT NOT NULL,
+    option_a TEXT NOT NULL,
+    option_b TEXT NOT NULL,
+    option_c TEXT NOT NULL,
+    option_d TEXT NOT NULL,
+    answer_idx INTEGER NOT NULL,
+    explanation TEXT NOT NULL
+);
+CREATE TABLE errors (line INTEGER NOT NULL, field TEXT NOT NULL, message TEXT NOT NULL);
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+BANK_FORMAT = "2"  # part of every bank id, so a schema change never reads an old file
+_import_lock = threading.Lock()
+_import_counts = {"parsed": 0, "reused": 0}
+
+def bank_path(bank_id: str, bank_dir: Path = BANK_DIR) -> Path:
+    return Path(bank_dir) / f"{bank_id}.sqlite"
+
+def _write_bank(bank_id: str, questions: Iterable[Question], errors: List[RowError], bank_dir: Path) -> None:
+    """Write to a temp file and rename, so readers never see a half-imported bank."""
+    final = bank_path(bank_id, bank_dir)
+    final.parent.mkdir(parents=True, exist_ok=True)
+    tmp = final.with_name(f"{final.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.executescript(SCHEMA)
+        n = 0
+        batch = []
+        for q in questions:
+            batch.append((n, q.q, *q.options, q.answer_idx, q.explanation))
+            n += 1
+            if len(batch) >= INSERT_BATCH:
+                conn.executemany("INSERT INTO questions VALUES (?, ?, ?, ?, ?, ?, ?, ?)", batch)
+                batch = []
+        conn.executemany("INSERT INTO questions VALUES (?, ?, ?, ?, ?, ?, ?, ?)", batch)
+        conn.executemany("INSERT INTO errors VALUES (?, ?, ?)", ((e.line, e.column, e.message) for e in errors))
+        conn.executemany("INSERT INTO meta VALUES (?, ?)", [("count", str(n)), ("errors", str(len(errors)))])
+        conn.commit()
+    except BaseException:
+        conn.close()
+        tmp.unlink(missing_ok=True)
+        raise
+    conn.close()
+    os.replace(tmp, final)
+
+def import_csv(source: Union[str, Path, BinaryIO], bank_dir: Path = BANK_DIR) -> str:
+    """
+    Import a CSV bank (path or binary file object) and return its bank id.
+    The id is the sha256 of the file bytes; an already imported file is
+    not parsed again. ValueError if required columns are missing.
+    """
+    fh = open(source, "rb") if isinstance(source, (str, Path)) else source
+    try:
+        fh.seek(0)
+        digest = hashlib.sha256(BANK_FORMAT.encode())
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+        bank_id = digest.hexdigest()[:32]
+        with _import_lock:
+            if bank_path(bank_id, bank_dir).exists():
+                _import_counts["reused"] += 1
+            else:
+                fh.seek(0)
+                errors: List[RowError] = []
+                _write_bank(bank_id, read_questions(fh, errors), errors, bank_dir)
+                _import_counts["parsed"] += 1
+        return bank_id
+    finally:
+        if fh is not source:
+            fh.close()
+
+def import_questions(questions: Sequence[Question], bank_dir: Path = BANK_DIR) -> str:
+    """Import in-memory questions (e.g. the sample bank); id is a hash of their content."""
+    digest = hashlib.sha256(BANK_FORMAT.encode())
+    for q in questions:
+        digest.update(repr((q.q, tuple(q.options), q.answer_idx, q.explanation)).encode("utf-8"))
+    bank_id = digest.hexdigest()[:32]
+    with _import_lock:
+        if not bank_path(bank_id, bank_dir).exists():
+            _write_bank(bank_id, questions, [], bank_dir)
+    return bank_id
+
+# -------------------------------
+# Read side
+# -------------------------------
+class QuestionBank:
+    """
+    Read-only view of an imported bank. One instance per bank per process
+    (see `open_bank`), shared by every session; question ids are 0..len-1.
+    """
+
+    def __init__(self, bank_id: str, bank_dir: Path = BANK_DIR):
+        path = bank_path(bank_id, bank_dir)
+        if not path.exists():
+            raise FileNotFoundError(f"No imported bank {bank_id!r} in {bank_dir}")
+        self.bank_id = bank_id
+        self.path = path
+        self._conn = sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True, check_same_thread=False)
+        self._lock = threading.Lock()
+        meta = dict(self._query("SELECT key, value FROM meta"))
+        self._len = int(meta["count"])
+        self.n_errors = int(meta["errors"])
+        self._errors_csv: Optional[bytes] = None
+        self._all: Optional[Tuple[Question, ...]] = None
+        if self._len <= PRELOAD_MAX:
+            self._all = tuple(_to_question(r) for r in self._query("SELECT * FROM questions ORDER BY id"))
+
+    def _query(self, sql: str, params: Sequence = ()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def __len__(self) -> int:
+        return self._len
+
+    @property
+    def held(self) -> int:
+        """Questions this instance keeps in memory (the whole bank, or 0 if fetched on demand)."""
+        return self._len if self._all is not None else 0
+
+    def __getitem__(self, qid: int) -> Question:
+        if not 0 <= qid < self._len:
+            raise IndexError(f"Question {qid} is not in a bank of {self._len}")
+        if self._all is not None:
+            return self._all[qid]
+        return _fetch(self.bank_id, self.path.parent, int(qid))
+
+    def load(self, qid: int) -> Question:
+        """Uncached single-question read; use `bank[qid]` instead."""
+        rows = self._query("SELECT * FROM questions WHERE id = ?", (qid,))
+        return _to_question(rows[0])
+
+    def many(self, ids: Sequence[int], chunk: int = 500) -> List[Question]:
+        """Batch read in id order of `ids`, for reviews/exports; bypasses the LRU so it isn't flushed."""
+        if self._all is not None:
+            return [self._all[int(i)] for i in ids]
+        found: Dict[int, Question] = {}
+        uniq = sorted(set(int(i) for i in ids))
+        for start in range(0, len(uniq), chunk):
+            part = uniq[start:start + chunk]
+            marks = ",".join("?" * len(part))
+            for row in self._query(f"SELECT * FROM questions WHERE id IN ({marks})", part):
+                found[row[0]] = _to_question(row)
+        return [found[int(i)] for i in ids]
+
+    def answer_key(self) -> bytes:
+        """Correct option index (0-3) of every question as one byte each, in id order."""
+        if self._all is not None:
+            return bytes(q.answer_idx for q in self._all)
+        return bytes(r[0] for r in self._query("SELECT answer_idx FROM questions ORDER BY id"))
+
+    def errors(self, limit: Optional[int] = None) -> List[RowError]:
+        """Rows skipped at import, in file order."""
+        sql = "SELECT line, field, message FROM errors ORDER BY rowid"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return [RowError(*r) for r in self._query(sql)]
+
+    def errors_csv(self) -> bytes:
+        """The full error report as CSV bytes (built once per process)."""
+        if self._errors_csv is None:
+            self._errors_csv = errors_csv(self.errors())
+        return self._errors_csv
+
+def _to_question(row: tuple) -> Question:
+    _, q, a, b, c, d, ans, exp = row
+    return make_question(q, (a, b, c, d), ans, exp)
+
+# -------------------------------
+# Process-wide bank cache
+# -------------------------------
+class BankCache:
+    """
+    Opened QuestionBanks keyed by (bank id, directory): least-recently-used
+    eviction beyond `maxsize`, and entries unused for `ttl_s` seconds are
+    reopened on the next lookup. Thread-safe; evicted banks close once the
+    last rerun using them lets go.
+    """
+
+    def __init__(self, maxsize: int = BANK_CACHE_SIZE, ttl_s: float = BANK_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl_s = ttl_s
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._data: "OrderedDict[Tuple[str, Path], Tuple[QuestionBank, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, bank_id: str, bank_dir: Path = BANK_DIR) -> QuestionBank:
+        key = (bank_id, Path(bank_dir))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and now - entry[1] > self.ttl_s:
+                del self._data[key]
+                self.expirations += 1
+                entry = None
+            if entry is not None:
+                self._data[key] = (entry[0], now)
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        bank = QuestionBank(bank_id, Path(bank_dir))  # outside the lock; a concurrent miss just opens twice
+        with self._lock:
+            self._data[key] = (bank, now)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return bank
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        with self._lock:
+            banks = [b for b, _ in self._data.values()]
+        return {
+            "size": len(banks),
+            "maxsize": self.maxsize,
+            "ttl_s": self.ttl_s,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "questions_held": sum(b.held for b in banks),
+        }
+
+BANKS = BankCache()
+
+def open_bank(bank_id: str, bank_dir: Path = BANK_DIR) -> QuestionBank:
+    """The shared QuestionBank for `bank_id` in this process."""
+    return BANKS.get(bank_id, bank_dir)
+
+@lru_cache(maxsize=FETCH_CACHE_SIZE)
+def _fetch(bank_id: str, bank_dir: Path, qid: int) -> Question:
+    return open_bank(bank_id, bank_dir).load(qid)
+
+def cache_info() -> Dict[str, Dict[str, Any]]:
+    """Bank cache, question LRU and import counters, for sizing the caches."""
+    info = _fetch.cache_info()
+    return {
+        "banks": BANKS.stats(),
+        "questions": {"hits": info.hits, "misses": info.misses, "size": info.currsize, "maxsize": info.maxsize},
+        "imports": dict(_import_counts),
+    }
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Import a quiz CSV into the SQLite bank store")
+    ap.add_argument("csv", help="Bank CSV (question, option_a..option_d, answer, explanation)")
+    ap.add_argument("--bank-dir", default=str(BANK_DIR), help=f"Where banks are stored (default: {BANK_DIR})")
+    args = ap.parse_args()
+    bid = import_csv(args.csv, Path(args.bank_dir))
+    bank = open_bank(bid, Path(args.bank_dir))
+    print(f"Bank {bid}: {len(bank):,} questions ({bank.n_errors:,} invalid rows skipped) -> {bank.path}")
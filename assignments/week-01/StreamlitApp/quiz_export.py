@@ -0,0 +1,265 @@
+"""
+Static, self-grading HTML export of a quiz bank.
+
+`export_html` compiles a bank into one self-contained HTML file (no server,
+no network): questions, options, answer keys and explanations are embedded
+and the page shuffles, grades, explains and offers the same results CSV as
+the app, all in the browser. Meant for low-stakes practice quizzes, since
+the answer key ships with the page.
+
+Encoding: every distinct string (question, option, explanation) is stored
+once in a string table, each question is six indexes into it, and the
+answer key is one digit per question; the JSON is then gzipped and base64
+embedded, and decompressed in the browser with DecompressionStream.
+`compress=False` embeds the plain JSON instead (for very old browsers).
+
+Usage:
+    python quiz_export.py certification.csv -o practice.html --title "Cert practice"
+"""
+import argparse
+import base64
+import gzip
+import json
+from pathlib import Path
+from typing import Dict, List
+
+from quiz_bank import BANK_DIR, QuestionBank, import_csv, open_bank
+
+EXPORT_CHUNK = 2_000   # questions read from the bank per batch
+
+def bank_payload(bank: QuestionBank, title: str) -> Dict:
+    """String table + per-question indexes + answer key (see module docstring)."""
+    index: Dict[str, int] = {}
+    strings: List[str] = []
+    refs: List[int] = []
+
+    def ref(s: str) -> int:
+        i = index.get(s)
+        if i is None:
+            i = index[s] = len(strings)
+            strings.append(s)
+        return i
+
+    for start in range(0, len(bank), EXPORT_CHUNK):
+        for q in bank.many(range(start, min(start + EXPORT_CHUNK, len(bank)))):
+            refs.extend((ref(q.q), *map(ref, q.options), ref(q.explanation)))
+    return {"title": title, "strings": strings, "questions": refs,
+            "answers": bank.answer_key().translate(bytes.maketrans(b"\0\1\2\3", b"0123")).decode("ascii")}
+
+def export_html(bank: QuestionBank, title: str = "Quiz", compress: bool = True) -> bytes:
+    """The bank as one self-contained, self-grading HTML page."""
+    data = json.dumps(bank_payload(bank, title), ensure_ascii=False, separators=(",", ":"))
+    if compress:
+        encoding = "gzip"
+        data = base64.b64encode(gzip.compress(data.encode("utf-8"), compresslevel=9, mtime=0)).decode("ascii")
+    else:
+        encoding = "json"
+        data = data.replace("</", "<\\/")  # never end the <script> element early
+    html = (TEMPLATE.replace("__TITLE__", _escape(title))
+            .replace("__ENCODING__", encoding)
+            .replace("__DATA__", data))
+    return html.encode("utf-8")
+
+def _escape(s: str) -> str:
+    return s.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+
+# -------------------------------
+# Page template (all rendering via textContent; the payload is never parsed as HTML)
+# -------------------------------
+TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>__TITLE__</title>
+<style>
+  body { font-family: system-ui, sans-serif; max-width: 46rem; margin: 2rem auto; padding: 0 1rem; color: #222; }
+  h1 { font-size: 1.6rem; }
+  .bar { height: .5rem; background: #eee; border-radius: .25rem; margin: .5rem 0 1rem; }
+  .bar > div { height: 100%; background: #ff4b4b; border-radius: .25rem; }
+  .muted { color: #666; font-size: .9rem; }
+  label.opt { display: block; padding: .4rem .2rem; cursor: pointer; }
+  button { padding: .45rem 1rem; margin: .3rem .3rem .3rem 0; cursor: pointer; }
+  .ok { background: #e6f4ea; padding: .6rem; border-radius: .3rem; }
+  .bad { background: #fdecea; padding: .6rem; border-radius: .3rem; }
+  .info { background: #e8f0fe; padding: .6rem; border-radius: .3rem; margin-top: .5rem; }
+  table { border-collapse: collapse; width: 100%; font-size: .9rem; }
+  td, th { border-bottom: 1px solid #ddd; padding: .3rem; text-align: left; vertical-align: top; }
+  .hidden { display: none; }
+</style>
+</head>
+<body>
+<h1>&#128221; __TITLE__</h1>
+<div id="setup">
+  <p class="muted" id="bank-size"></p>
+  <p><label>Questions per attempt (0 = all) <input id="size" type="number" min="0" value="0" style="width:6rem"></label></p>
+  <p><label><input id="shuffle" type="checkbox" checked> Shuffle questions</label></p>
+  <button id="start">Start quiz</button>
+</div>
+<div id="quiz" class="hidden">
+  <div class="muted" id="progress-text"></div>
+  <div class="bar"><div id="progress"></div></div>
+  <h3 id="question"></h3>
+  <div id="options"></div>
+  <p>
+    <button id="submit">&#9989; Submit</button>
+    <button id="next">&#10145;&#65039; Next</button>
+    <button id="prev">&#11013;&#65039; Previous</button>
+  </p>
+  <div id="feedback"></div>
+</div>
+<div id="done" class="hidden">
+  <h2 id="score"></h2>
+  <button id="download">&#11015;&#65039; Download Results (CSV)</button>
+  <button id="restart">&#128260; Restart</button>
+  <table><thead><tr><th>Q#</th><th>Question</th><th>Your Answer</th><th>Correct Answer</th><th>Result</th></tr></thead>
+  <tbody id="review"></tbody></table>
+</div>
+<script id="bank" type="application/octet-stream" data-encoding="__ENCODING__">__DATA__</script>
+<script>
+"use strict";
+const $ = (id) => document.getElementById(id);
+let S, Q, K, n;               // string table, question refs (6 per question), answer key, bank size
+let order, pos, answers, submitted, correct;
+
+async function loadBank() {
+  const el = $("bank");
+  let text = el.textContent;
+  if (el.dataset.encoding === "gzip") {
+    const bytes = Uint8Array.from(atob(text), (c) => c.charCodeAt(0));
+    const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream("gzip"));
+    text = await new Response(stream).text();
+  }
+  const data = JSON.parse(text);
+  S = data.strings; Q = data.questions; K = data.answers; n = K.length;
+  $("bank-size").textContent = n + " questions in this bank.";
+  $("size").max = n;
+}
+
+const qText = (qi) => S[Q[6 * qi]];
+const qOption = (qi, i) => S[Q[6 * qi + 1 + i]];
+const qExplain = (qi) => S[Q[6 * qi + 5]];
+const qAnswer = (qi) => K.charCodeAt(qi) - 48;
+
+function start() {
+  const k = Math.max(0, Math.min(n, parseInt($("size").value, 10) || 0));
+  const all = new Uint32Array(n);
+  for (let i = 0; i < n; i++) all[i] = i;
+  const size = k > 0 ? k : n;
+  if ($("shuffle").checked || k > 0) {
+    // partial Fisher-Yates: only the first `size` positions are needed
+    for (let i = 0; i < size; i++) {
+      const j = i + Math.floor(Math.random() * (n - i));
+      const t = all[i]; all[i] = all[j]; all[j] = t;
+    }
+  }
+  order = all.subarray(0, size);
+  pos = 0; answers = new Map(); submitted = new Set(); correct = 0;
+  $("setup").classList.add("hidden"); $("done").classList.add("hidden"); $("quiz").classList.remove("hidden");
+  render();
+}
+
+function render() {
+  const qi = order[pos], locked = submitted.has(qi), chosen = answers.has(qi) ? answers.get(qi) : 0;
+  $("progress-text").textContent = "Question " + (pos + 1) + " of " + order.length +
+    " \\u00b7 submitted " + submitted.size + " \\u00b7 correct " + correct;
+  $("progress").style.width = (100 * (pos + 1) / order.length) + "%";
+  $("question").textContent = qText(qi);
+  const box = $("options");
+  box.replaceChildren();
+  for (let i = 0; i < 4; i++) {
+    const label = document.createElement("label"), input = document.createElement("input");
+    label.className = "opt";
+    input.type = "radio"; input.name = "opt"; input.value = i; input.checked = i === chosen; input.disabled = locked;
+    input.addEventListener("change", () => answers.set(qi, i));
+    label.append(input, " ", qOption(qi, i));
+    box.append(label);
+  }
+  $("submit").disabled = locked;
+  const fb = $("feedback");
+  fb.replaceChildren();
+  if (locked) {
+    const ok = answers.get(qi) === qAnswer(qi), msg = document.createElement("div");
+    msg.className = ok ? "ok" : "bad";
+    msg.textContent = ok ? "\\u2705 Correct!" : "\\u274c Incorrect. Correct answer: " + qOption(qi, qAnswer(qi));
+    fb.append(msg);
+    if (qExplain(qi)) {
+      const info = document.createElement("div");
+      info.className = "info";
+      info.textContent = "\\u2139\\ufe0f " + qExplain(qi);
+      fb.append(info);
+    }
+  }
+}
+
+function submit() {
+  const qi = order[pos];
+  if (submitted.has(qi)) return;
+  const picked = document.querySelector("input[name=opt]:checked");
+  const choice = picked ? Number(picked.value) : 0;
+  answers.set(qi, choice);
+  submitted.add(qi);
+  if (choice === qAnswer(qi)) correct++;
+  if (submitted.size === order.length) finish(); else render();
+}
+
+function reviewRows() {
+  const ids = Array.from(order).sort((a, b) => a - b);  // bank order, like the app's review
+  return ids.map((qi) => {
+    const your = answers.has(qi) ? answers.get(qi) : null;
+    return [qi + 1, qText(qi), your === null ? "" : qOption(qi, your), qOption(qi, qAnswer(qi)),
+            your === qAnswer(qi) ? "Correct" : "Wrong"];
+  });
+}
+
+function finish() {
+  $("quiz").classList.add("hidden"); $("done").classList.remove("hidden");
+  $("score").textContent = "\\ud83c\\udfc1 Quiz Complete: " + correct + "/" + order.length + " correct";
+  const body = $("review");
+  body.replaceChildren();
+  for (const row of reviewRows()) {
+    const tr = document.createElement("tr");
+    for (const cell of row) { const td = document.createElement("td"); td.textContent = cell; tr.append(td); }
+    body.append(tr);
+  }
+}
+
+function csvCell(v) {
+  const s = String(v);
+  return /[",\\r\\n]/.test(s) ? '"' + s.replace(/"/g, '""') + '"' : s;
+}
+
+function download() {
+  const lines = [["Q#", "Question", "Your Answer", "Correct Answer", "Result"], ...reviewRows()];
+  const blob = new Blob([lines.map((r) => r.map(csvCell).join(",")).join("\\r\\n") + "\\r\\n"], {type: "text/csv"});
+  const a = document.createElement("a");
+  a.href = URL.createObjectURL(blob); a.download = "quiz_results.csv";
+  a.click();
+  setTimeout(() => URL.revokeObjectURL(a.href), 1000);
+}
+
+$("start").addEventListener("click", start);
+$("submit").addEventListener("click", submit);
+$("next").addEventListener("click", () => { if (pos < order.length - 1) { pos++; render(); } });
+$("prev").addEventListener("click", () => { if (pos > 0) { pos--; render(); } });
+$("download").addEventListener("click", download);
+$("restart").addEventListener("click", () => { $("done").classList.add("hidden"); $("setup").classList.remove("hidden"); });
+loadBank().catch((e) => { $("bank-size").textContent = "Could not load the quiz: " + e; $("start").disabled = true; });
+</script>
+</body>
+</html>
+"""
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Export a quiz bank as a self-grading HTML page")
+    ap.add_argument("bank", help="Bank CSV (imported if needed) or an imported bank id")
+    ap.add_argument("-o", "--out", default="quiz.html", help="Output HTML file (default: quiz.html)")
+    ap.add_argument("--title", default="Quiz", help="Page title (default: Quiz)")
+    ap.add_argument("--plain", action="store_true", help="Embed plain JSON instead of gzip+base64")
+    ap.add_argument("--bank-dir", default=str(BANK_DIR), help=f"Where banks are stored (default: {BANK_DIR})")
+    args = ap.parse_args()
+    bank_id = import_csv(args.bank, Path(args.bank_dir)) if Path(args.bank).is_file() else args.bank
+    bank = open_bank(bank_id, Path(args.bank_dir))
+    html = export_html(bank, args.title, compress=not args.plain)
+    Path(args.out).write_bytes(html)
+    print(f"Bank {bank_id}: {len(bank):,} questions -> {args.out} ({len(html) / 1024:,.1f} KiB)")
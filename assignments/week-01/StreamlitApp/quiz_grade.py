@@ -0,0 +1,212 @@
+"""
+Headless bulk grading of offline/paper answer sheets against a quiz bank.
+
+The bank is loaded once as an answer-key vector (one byte per question) and
+the sheets are read in chunks as a students x questions uint8 matrix, so
+each chunk is scored with a handful of NumPy operations rather than one
+comparison per answer. Two sheet layouts are accepted:
+
+    student,answers             one string per sheet, e.g. "ABD-C...", one
+                                character per question in bank order
+                                ("-" or blank = unanswered; shorter strings
+                                are padded as unanswered)
+    student,<col>,<col>,...     one column per question in bank order
+                                (A-D or 0-3, empty = unanswered)
+
+Written to the output directory:
+
+    scores.csv      student, correct, answered, blank, invalid, score
+    questions.csv   per question: answered, correct, difficulty (share of
+                    sheets correct), discrimination (correlation with the
+                    rest of the sheet's score) and how often each option was picked
+
+Usage:
+    python quiz_grade.py exam.csv sheets.csv -o graded/
+    python quiz_grade.py 3f2a...c1 "scans/*.csv" -o graded/ --chunk 20000
+"""
+import argparse
+import glob
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from quiz_bank import BANK_DIR, QuestionBank, import_csv, open_bank
+
+CHUNK_ROWS = 10_000
+BLANK = 4      # code for an unanswered question
+INVALID = 5    # code for a mark that isn't A-D / 0-3
+
+# byte/code point -> option code; everything unknown is INVALID, blanks are BLANK
+_CODES = np.full(256, INVALID, dtype=np.uint8)
+for _i, _chars in enumerate(("Aa0", "Bb1", "Cc2", "Dd3")):
+    _CODES[[ord(c) for c in _chars]] = _i
+_CODES[[ord(c) for c in "- \0"]] = BLANK
+
+# -------------------------------
+# Reading sheets
+# -------------------------------
+def answer_key(bank: QuestionBank) -> np.ndarray:
+    return np.frombuffer(bank.answer_key(), dtype=np.uint8)
+
+def encode_strings(answers: pd.Series, n: int) -> np.ndarray:
+    """Answer strings -> (sheets, n) option codes. ValueError if a sheet has more than n answers."""
+    answers = answers.fillna("").astype(str)
+    too_long = answers.str.len() > n
+    if too_long.any():
+        raise ValueError(f"{int(too_long.sum())} sheet(s) have more than {n} answers")
+    raw = answers.str.ljust(n, "-").str.cat().encode("latin-1", errors="replace")
+    return _CODES[np.frombuffer(raw, dtype=np.uint8)].reshape(len(answers), n)
+
+def encode_columns(frame: pd.DataFrame) -> np.ndarray:
+    """One column per question -> option codes, from the first non-blank character of each cell."""
+    chars = frame.fillna("-").apply(lambda col: col.str.strip()).to_numpy(dtype="U1")
+    chars[chars == ""] = "-"
+    return _CODES[np.minimum(chars.view(np.uint32), 255)]
+
+def read_sheets(path: Path, n: int, chunk: int = CHUNK_ROWS) -> Iterator[Tuple[pd.Series, np.ndarray]]:
+    """(student ids, option codes) per chunk of `path`. ValueError if the layout doesn't match the bank."""
+    header = pd.read_csv(path, nrows=0).columns
+    if len(header) < 2:
+        raise ValueError(f"{path.name}: expected a student column and answers")
+    if [c.strip().lower() for c in header] == ["student", "answers"]:
+        for frame in pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=chunk):
+            yield frame.iloc[:, 0], encode_strings(frame.iloc[:, 1], n)
+    else:
+        if len(header) - 1 != n:
+            raise ValueError(f"{path.name}: {len(header) - 1} answer columns, but the bank has {n} questions")
+        for frame in pd.read_csv(path, dtype=str, chunksize=chunk):
+            yield frame.iloc[:, 0], encode_columns(frame.iloc[:, 1:])
+
+# -------------------------------
+# Grading
+# -------------------------------
+class ItemStats:
+    """
+    Per-question totals accumulated chunk by chunk, so item statistics need
+    only O(questions) memory however many sheets there are.
+    """
+
+    def __init__(self, n: int):
+        self.sheets = 0
+        self.sum_score = 0.0
+        self.sum_score_sq = 0.0
+        self.correct = np.zeros(n, dtype=np.int64)
+        self.correct_x_score = np.zeros(n, dtype=np.float64)   # sum of sheet score over sheets that got it right
+        self.picks = np.zeros((n, 6), dtype=np.int64)          # A, B, C, D, blank, invalid
+
+    def add(self, hits: np.ndarray, codes: np.ndarray, score: np.ndarray) -> None:
+        self.sheets += len(score)
+        self.sum_score += float(score.sum())
+        self.sum_score_sq += float(score @ score)
+        self.correct += hits.sum(axis=0)
+        self.correct_x_score += score @ hits
+        n = codes.shape[1]
+        flat = codes.astype(np.int64) + 6 * np.arange(n)   # (question, code) -> one bin per pair
+        self.picks += np.bincount(flat.ravel(), minlength=6 * n).reshape(n, 6)
+
+    def frame(self) -> pd.DataFrame:
+        """Item analysis; discrimination is the corrected item-total (point-biserial) correlation."""
+        m = max(self.sheets, 1)
+        c = self.correct.astype(np.float64)
+        # "rest" = sheet score without this question; all sums follow from the totals above
+        sum_rest = self.sum_score - c
+        sum_rest_sq = self.sum_score_sq - 2 * self.correct_x_score + c
+        sum_x_rest = self.correct_x_score - c
+        cov = sum_x_rest / m - (c / m) * (sum_rest / m)
+        var_x = c / m - (c / m) ** 2
+        var_rest = sum_rest_sq / m - (sum_rest / m) ** 2
+        denom = np.sqrt(var_x * var_rest)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            disc = np.where(denom > 0, cov / denom, np.nan)
+        answered = self.picks[:, :4].sum(axis=1)
+        return pd.DataFrame({
+            "q#": np.arange(1, len(c) + 1),
+            "answered": answered,
+            "correct": self.correct,
+            "difficulty": np.round(c / m, 4),
+            "discrimination": np.round(disc, 4),
+            "pick_a": self.picks[:, 0], "pick_b": self.picks[:, 1],
+            "pick_c": self.picks[:, 2], "pick_d": self.picks[:, 3],
+            "blank": self.picks[:, 4], "invalid": self.picks[:, 5],
+        })
+
+def grade(key: np.ndarray, codes: np.ndarray) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """(hits matrix, per-sheet counts) for one chunk of option codes against the key."""
+    hits = codes == key
+    counts = {
+        "correct": hits.sum(axis=1),
+        "answered": (codes < BLANK).sum(axis=1),
+        "blank": (codes == BLANK).sum(axis=1),
+        "invalid": (codes == INVALID).sum(axis=1),
+    }
+    return hits, counts
+
+def grade_files(bank: QuestionBank, files: List[Path], out_dir: Path, chunk: int = CHUNK_ROWS) -> Dict:
+    """Grade every sheet in `files`, streaming scores.csv and writing questions.csv at the end."""
+    key = answer_key(bank)
+    n = len(key)
+    items = ItemStats(n)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    scores_path = out_dir / "scores.csv"
+    first = True
+    for path in files:
+        for students, codes in read_sheets(path, n, chunk):
+            hits, counts = grade(key, codes)
+            items.add(hits, codes, counts["correct"].astype(np.float64))
+            pd.DataFrame({"student": students.to_numpy(), **counts,
+                          "score": np.round(counts["correct"] / n, 4)}).to_csv(
+                scores_path, mode="w" if first else "a", header=first, index=False)
+            first = False
+    items.frame().to_csv(out_dir / "questions.csv", index=False)
+    return {"sheets": items.sheets, "questions": n,
+            "mean_correct": items.sum_score / items.sheets if items.sheets else 0.0}
+
+def find_sheet_files(targets: List[str]) -> List[Path]:
+    files: List[Path] = []
+    for t in targets:
+        p = Path(t)
+        if p.is_dir():
+            files.extend(sorted(p.glob("*.csv")))
+        else:
+            files.extend(sorted(Path(f) for f in glob.glob(t, recursive=True)))
+    return files
+
+def main(bank_ref: str, targets: List[str], out_dir: Path, bank_dir: Path, chunk: int) -> int:
+    try:
+        bank_id = import_csv(bank_ref, bank_dir) if Path(bank_ref).is_file() else bank_ref
+        bank = open_bank(bank_id, bank_dir)
+    except (ValueError, FileNotFoundError, KeyError) as e:
+        print(f"Error: {e.args[0] if e.args else e}")
+        return 2
+    files = find_sheet_files(targets)
+    if not files:
+        print(f"No answer sheets found for {targets!r}")
+        return 1
+    start = time.perf_counter()
+    try:
+        result = grade_files(bank, files, out_dir, chunk)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 2
+    wall = time.perf_counter() - start
+    sheets, n = result["sheets"], result["questions"]
+    print(f"Bank       : {bank_id} ({n:,} questions)")
+    print(f"Sheets     : {sheets:,} from {len(files)} file(s)")
+    print(f"Mean score : {result['mean_correct']:.1f}/{n} ({result['mean_correct'] / max(n, 1):.1%})")
+    print(f"Wall time  : {wall:.2f}s")
+    print(f"Throughput : {sheets / wall:,.0f} sheets/s, {sheets * n / wall:,.0f} answers/s")
+    print(f"Saved      : {out_dir.resolve()}")
+    return 0
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Grade answer sheets against a quiz bank")
+    ap.add_argument("bank", help="Bank CSV (imported if needed) or an imported bank id")
+    ap.add_argument("sheets", nargs="+", help="Answer sheet CSVs, directories or glob patterns")
+    ap.add_argument("-o", "--out", default="grading_out", help="Output directory (default: grading_out)")
+    ap.add_argument("--bank-dir", default=str(BANK_DIR), help=f"Where banks are stored (default: {BANK_DIR})")
+    ap.add_argument("--chunk", type=int, default=CHUNK_ROWS, help=f"Sheets per chunk (default: {CHUNK_ROWS})")
+    args = ap.parse_args()
+    raise SystemExit(main(args.bank, args.sheets, Path(args.out), Path(args.bank_dir), args.chunk))
@@ -0,0 +1,70 @@
+"""
+Lazy question orderings for the Quiz app.
+
+A `QuizOrder` is (bank size, sample size, seed) and nothing else: the i-th
+question id is computed on demand in O(1) time and memory by a keyed
+Feistel permutation of 0..n-1 (cycle-walking maps the power-of-four Feistel
+domain back onto n). "Sample K of N" is simply the first K positions of that
+permutation, so no session ever materialises or shuffles a list of n ids.
+"""
+import random
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterator, Optional, Tuple
+
+FEISTEL_ROUNDS = 4
+_M64 = (1 << 64) - 1
+
+def _mix64(x: int) -> int:
+    """splitmix64 finaliser: a cheap, well-distributed 64-bit mixer."""
+    x = (x + 0x9E3779B97F4A7C15) & _M64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _M64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _M64
+    return x ^ (x >> 31)
+
+@lru_cache(maxsize=1024)
+def _round_keys(seed: int, rounds: int = FEISTEL_ROUNDS) -> Tuple[int, ...]:
+    return tuple(_mix64(seed * (rounds + 1) + r) for r in range(rounds))
+
+def permute(i: int, n: int, seed: int) -> int:
+    """Position i -> index in a seeded permutation of range(n)."""
+    half = max(1, ((n - 1).bit_length() + 1) // 2)  # domain 4**half covers n, at most ~4n
+    mask = (1 << half) - 1
+    keys = _round_keys(seed)
+    x = i
+    while True:
+        left, right = x >> half, x & mask
+        for k in keys:
+            left, right = right, left ^ (_mix64(right ^ k) & mask)
+        x = (left << half) | right
+        if x < n:  # cycle-walk: re-encrypt until we land back inside range(n)
+            return x
+
+@dataclass(frozen=True)
+class QuizOrder:
+    """
+    Question ids for one attempt. seed=None keeps bank order; k=0 (or k >= n)
+    means every question, otherwise the first k of the permutation.
+    """
+    n: int
+    k: int = 0
+    seed: Optional[int] = None
+
+    @classmethod
+    def shuffled(cls, n: int, k: int = 0) -> "QuizOrder":
+        return cls(n, k, random.getrandbits(63))
+
+    @property
+    def sampled(self) -> bool:
+        return 0 < self.k < self.n
+
+    def __len__(self) -> int:
+        return self.k if self.sampled else self.n
+
+    def __getitem__(self, pos: int) -> int:
+        if not 0 <= pos < len(self):
+            raise IndexError(f"Position {pos} is outside an order of {len(self)}")
+        return pos if self.seed is None else permute(pos, self.n, self.seed)
+
+    def __iter__(self) -> Iterator[int]:
+        return (self[pos] for pos in range(len(self)))
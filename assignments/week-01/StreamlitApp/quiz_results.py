@@ -0,0 +1,299 @@
+"""
+Append-only results store and leaderboard for the Quiz app.
+
+Every completed attempt is queued with `ResultsWriter.record` (a queue put,
+so reruns never wait on disk) and a background thread writes queued
+attempts to SQLite in batches, one transaction per batch. The same
+transaction updates the aggregates the app reads: per-player bests for
+each quiz size, per-bank totals and per-question answered/correct counts.
+The leaderboard and stats are plain lookups on those tables, never a scan
+of all attempts.
+
+Attempt rows are only ever inserted, never updated or deleted.
+"""
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from quiz_bank import BANK_DIR
+
+RESULTS_DB = Path(os.environ.get("QUIZ_RESULTS_DB", BANK_DIR / "results.sqlite"))   # next to the banks by default
+WRITE_BATCH = 200      # attempts per transaction at most
+FLUSH_SECONDS = 0.5    # how long a partial batch may wait for company
+
+@dataclass(frozen=True)
+class Attempt:
+    bank_id: str
+    player: str
+    correct: int
+    total: int
+    seconds: float
+    answers: str       # chosen option per question: "A".."D", "-" if none
+    marks: str         # "1" correct / "0" wrong per question
+    finished_at: float = 0.0
+    qids: str = ""     # comma-separated question ids for a sampled attempt; "" = every id in bank order
+
+    def question_ids(self) -> List[int]:
+        return [int(q) for q in self.qids.split(",")] if self.qids else list(range(len(self.marks)))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY,
+    bank_id TEXT NOT NULL,
+    player TEXT NOT NULL,
+    correct INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    finished_at REAL NOT NULL,
+    answers TEXT NOT NULL,
+    marks TEXT NOT NULL,
+    qids TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS leaderboard (
+    bank_id TEXT NOT NULL,
+    total INTEGER NOT NULL,          -- questions per attempt: sampled and full attempts rank separately
+    player TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    best_correct INTEGER NOT NULL,
+    best_seconds REAL NOT NULL,
+    last_at REAL NOT NULL,
+    PRIMARY KEY (bank_id, total, player)
+);
+CREATE INDEX IF NOT EXISTS leaderboard_rank ON leaderboard (bank_id, total, best_correct DESC, best_seconds);
+CREATE TABLE IF NOT EXISTS bank_stats (
+    bank_id TEXT PRIMARY KEY,
+    attempts INTEGER NOT NULL,
+    sum_correct INTEGER NOT NULL,
+    sum_total INTEGER NOT NULL,
+    sum_seconds REAL NOT NULL,
+    best_correct INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS question_stats (
+    bank_id TEXT NOT NULL,
+    qid INTEGER NOT NULL,
+    answered INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    PRIMARY KEY (bank_id, qid)
+);
+"""
+
+def connect(path: Union[str, Path] = RESULTS_DB) -> sqlite3.Connection:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")  # readers don't block the writer (or each other)
+    board = {row[1] for row in conn.execute("PRAGMA table_info(leaderboard)")}
+    rebuild = bool(board) and "total" not in board  # a store from before per-size ranking
+    if rebuild:
+        conn.execute("DROP TABLE leaderboard")
+    conn.executescript(SCHEMA)
+    if "qids" not in {row[1] for row in conn.execute("PRAGMA table_info(attempts)")}:
+        conn.execute("ALTER TABLE attempts ADD COLUMN qids TEXT NOT NULL DEFAULT ''")  # stores from before sampling
+    if rebuild:
+        _fill_leaderboard(conn)
+    return conn
+
+def _fill_leaderboard(conn: sqlite3.Connection) -> None:
+    """Rebuild the (empty) leaderboard aggregate from the append-only attempts."""
+    with conn:
+        conn.execute(
+            """INSERT INTO leaderboard
+               SELECT bank_id, total, player, COUNT(*), MAX(correct),
+                      MIN(CASE WHEN correct = best THEN seconds END), MAX(finished_at)
+               FROM (SELECT *, MAX(correct) OVER (PARTITION BY bank_id, total, player) AS best FROM attempts)
+               GROUP BY bank_id, total, player""")
+
+# -------------------------------
+# Writing
+# -------------------------------
+def write_batch(conn: sqlite3.Connection, batch: List[Attempt]) -> None:
+    """Insert attempts and fold them into the aggregates, in one transaction."""
+    with conn:
+        conn.executemany(
+            "INSERT INTO attempts (bank_id, player, correct, total, seconds, finished_at, answers, marks, qids) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(a.bank_id, a.player, a.correct, a.total, a.seconds, a.finished_at, a.answers, a.marks, a.qids)
+             for a in batch],
+        )
+        conn.executemany(
+            """INSERT INTO leaderboard VALUES (?, ?, ?, 1, ?, ?, ?)
+               ON CONFLICT (bank_id, total, player) DO UPDATE SET
+                   attempts = attempts + 1,
+                   best_seconds = CASE
+                       WHEN excluded.best_correct > best_correct
+                            OR (excluded.best_correct = best_correct AND excluded.best_seconds < best_seconds)
+                       THEN excluded.best_seconds ELSE best_seconds END,
+                   best_correct = MAX(best_correct, excluded.best_correct),
+                   last_at = MAX(last_at, excluded.last_at)""",
+            [(a.bank_id, a.total, a.player, a.correct, a.seconds, a.finished_at) for a in batch],
+        )
+        conn.executemany(
+            """INSERT INTO bank_stats VALUES (?, 1, ?, ?, ?, ?)
+               ON CONFLICT (bank_id) DO UPDATE SET
+                   attempts = attempts + 1,
+                   sum_correct = sum_correct + excluded.sum_correct,
+                   sum_total = sum_total + excluded.sum_total,
+                   sum_seconds = sum_seconds + excluded.sum_seconds,
+                   best_correct = MAX(best_correct, excluded.best_correct)""",
+            [(a.bank_id, a.correct, a.total, a.seconds, a.correct) for a in batch],
+        )
+        # Per-question counts: sum the batch first so each question is one upsert
+        answered: Counter = Counter()
+        correct: Counter = Counter()
+        for a in batch:
+            for qid, answer, mark in zip(a.question_ids(), a.answers, a.marks):
+                if answer != "-":
+                    answered[a.bank_id, qid] += 1
+                    if mark == "1":
+                        correct[a.bank_id, qid] += 1
+        conn.executemany(
+            """INSERT INTO question_stats VALUES (?, ?, ?, ?)
+               ON CONFLICT (bank_id, qid) DO UPDATE SET
+                   answered = answered + excluded.answered,
+                   correct = correct + excluded.correct""",
+            [(bank_id, qid, n, correct[bank_id, qid]) for (bank_id, qid), n in answered.items()],
+        )
+
+class ResultsWriter:
+    """
+    Background, batching writer. `record` only enqueues; one daemon thread
+    owns the SQLite connection and commits up to WRITE_BATCH attempts per
+    transaction. Pending attempts are flushed at interpreter exit.
+    """
+
+    def __init__(self, path: Union[str, Path] = RESULTS_DB, batch_size: int = WRITE_BATCH,
+                 flush_s: float = FLUSH_SECONDS):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_s = flush_s
+        self.written = 0
+        self.batches = 0
+        self.failed = 0
+        self.last_error = ""
+        self._queue: "queue.Queue[Optional[Attempt]]" = queue.Queue()
+        connect(self.path).close()  # create the schema up front, so readers never see a missing table
+        self._thread = threading.Thread(target=self._run, name="quiz-results-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def record(self, attempt: Attempt) -> None:
+        """Queue an attempt; RuntimeError if the writer thread is gone (nothing would store it)."""
+        if not self._thread.is_alive():
+            raise RuntimeError(f"The results writer has stopped ({self.last_error or 'closed'})")
+        if not attempt.finished_at:
+            attempt = Attempt(**{**vars(attempt), "finished_at": time.time()})
+        self._queue.put(attempt)
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def flush(self) -> None:
+        """Block until everything recorded so far is committed."""
+        self._queue.join()
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _write(self, conn: sqlite3.Connection, batch: List[Attempt]) -> None:
+        """Commit a batch; if it fails, retry its attempts one by one so only bad ones are lost."""
+        try:
+            write_batch(conn, batch)
+        except Exception as e:  # not only sqlite3.Error: a malformed attempt must not kill the thread
+            if len(batch) > 1:
+                for attempt in batch:
+                    self._write(conn, [attempt])
+                return
+            self.failed += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+        else:
+            self.written += len(batch)
+            self.batches += 1
+
+    def _run(self) -> None:
+        try:
+            conn = connect(self.path)
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            return
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            batch: List[Attempt] = []
+            taken = 1
+            if item is None:
+                stop = True
+            else:
+                batch.append(item)
+            deadline = time.monotonic() + self.flush_s
+            while not stop and len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                taken += 1
+                if item is None:
+                    stop = True
+                else:
+                    batch.append(item)
+            try:
+                if batch:
+                    self._write(conn, batch)
+            finally:
+                for _ in range(taken):
+                    self._queue.task_done()
+        conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"written": self.written, "batches": self.batches, "pending": self.pending(),
+                "failed": self.failed, "last_error": self.last_error}
+
+# -------------------------------
+# Reading (aggregates only)
+# -------------------------------
+def _read(sql: str, params: tuple, path: Union[str, Path]) -> List[tuple]:
+    path = Path(path)
+    if not path.exists():
+        return []
+    conn = sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True)
+    try:
+        return conn.execute(sql, params).fetchall()
+    except sqlite3.OperationalError:
+        return []  # schema not created yet
+    finally:
+        conn.close()
+
+def leaderboard(bank_id: str, total: int, limit: int = 10, path: Union[str, Path] = RESULTS_DB) -> List[Dict[str, Any]]:
+    """Best scores among attempts of `total` questions: a sampled attempt never competes with a full one."""
+    rows = _read("SELECT player, best_correct, best_seconds, attempts FROM leaderboard WHERE bank_id = ? AND total = ? "
+                 "ORDER BY best_correct DESC, best_seconds LIMIT ?", (bank_id, total, limit), path)
+    return [{"Rank": i + 1, "Player": p, "Best": c, "Time (s)": round(s, 1), "Attempts": n}
+            for i, (p, c, s, n) in enumerate(rows)]
+
+def bank_summary(bank_id: str, path: Union[str, Path] = RESULTS_DB) -> Optional[Dict[str, float]]:
+    rows = _read("SELECT attempts, sum_correct, sum_total, sum_seconds, best_correct FROM bank_stats "
+                 "WHERE bank_id = ?", (bank_id,), path)
+    if not rows:
+        return None
+    attempts, sum_correct, sum_total, sum_seconds, best = rows[0]
+    return {
+        "attempts": attempts,
+        "mean_score": sum_correct / sum_total if sum_total else 0.0,
+        "mean_seconds": sum_seconds / attempts,
+        "best_correct": best,
+    }
+
+def hardest_questions(bank_id: str, limit: int = 5, min_answered: int = 3,
+                      path: Union[str, Path] = RESULTS_DB) -> List[Dict[str, Any]]:
+    rows = _read("SELECT qid, answered, correct FROM question_stats WHERE bank_id = ? AND answered >= ? "
+                 "ORDER BY CAST(correct AS REAL) / answered, answered DESC LIMIT ?",
+                 (bank_id, min_answered, limit), path)
+    return [{"qid": q, "answered": a, "correct_rate": c / a} for q, a, c in rows]
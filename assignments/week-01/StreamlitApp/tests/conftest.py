@@ -0,0 +1,14 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parents[1]
+
+# Banks and results go to a throwaway folder, never the app's own (read at import time)
+_tmp = tempfile.mkdtemp(prefix="quiz_tests_")
+os.environ["QUIZ_BANK_DIR"] = _tmp
+os.environ["QUIZ_RESULTS_DB"] = str(Path(_tmp) / "results.sqlite")
+
+# The app modules live next to this folder, not in an installed package
+sys.path.insert(0, str(APP_DIR))
@@ -0,0 +1,51 @@
+import time
+
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+
+from conftest import APP_DIR
+
+def start_app() -> AppTest:
+    return AppTest.from_file(str(APP_DIR / "Quiz.py"), default_timeout=30).run()
+
+def button(at: AppTest, label: str):
+    return next(b for b in at.button if label in b.label)
+
+def test_timer_expiry_then_next_shows_unanswered_question():
+    at = start_app()
+    at.checkbox(key="use_timer_key").check().run()
+    minutes, seconds = (n for n in at.number_input if n.label in ("Minutes", "Seconds"))
+    minutes.set_value(0)
+    seconds.set_value(1)
+    button(at, "Start timer").click().run()
+    time.sleep(1.2)
+    at.run()  # time is up: the current question is auto-submitted with its saved choice
+
+    button(at, "Next").click().run()  # the next question is auto-submitted without an answer
+
+    assert not at.exception
+    assert at.session_state["submitted"] == {at.session_state["order"][0], at.session_state["order"][1]}
+    assert any(w.value.startswith("Not answered") for w in at.warning)
+
+def test_timer_refresh_stops_once_time_is_up(monkeypatch):
+    scheduled = []  # per run: did the page schedule the 1 s timer refresh?
+    original = LocalScriptRunner.run
+
+    def run(self, *args, **kwargs):
+        tree = original(self, *args, **kwargs)
+        scheduled.append(any(m.HasField("auto_rerun") for m in self.forward_msgs()))
+        return tree
+
+    monkeypatch.setattr(LocalScriptRunner, "run", run)
+    at = start_app()
+    at.session_state["timer_on"] = True
+    at.session_state["start_time"] = time.time()
+    at.session_state["total_seconds"] = at.session_state["time_left"] = 1
+    at.run()
+    assert scheduled[-1]
+
+    time.sleep(1.2)
+    at.run()
+    assert not scheduled[-1]
+    assert at.session_state["time_left"] == 0
+    assert not at.exception
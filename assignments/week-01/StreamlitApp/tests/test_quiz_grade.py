@@ -0,0 +1,17 @@
+import pandas as pd
+
+from quiz_grade import BLANK, INVALID, encode_columns, main
+
+def test_padded_cells_keep_their_answer():
+    frame = pd.DataFrame({"q1": [" B", "a", None], "q2": ["c ", "  ", "x"], "q3": ["", " d ", "-"]})
+    assert encode_columns(frame).tolist() == [[1, 2, BLANK], [0, BLANK, 3], [BLANK, INVALID, BLANK]]
+
+def test_unknown_bank_is_a_clean_error(tmp_path, capsys):
+    assert main("no-such-bank", [str(tmp_path)], tmp_path, tmp_path, 100) != 0
+    assert capsys.readouterr().out.startswith("Error: No imported bank 'no-such-bank'")
+
+def test_malformed_bank_csv_is_a_clean_error(tmp_path, capsys):
+    bad = tmp_path / "bank.csv"
+    bad.write_text("question,answer\nWhat?,A\n")
+    assert main(str(bad), [str(tmp_path)], tmp_path, tmp_path, 100) != 0
+    assert capsys.readouterr().out.startswith("Error: CSV is missing column(s)")
@@ -0,0 +1,58 @@
+import pytest
+
+from quiz_results import Attempt, ResultsWriter, connect, leaderboard
+
+def attempt(player: str, correct: int, answers="AB", marks="10") -> Attempt:
+    return Attempt(bank_id="bank", player=player, correct=correct, total=2, seconds=5.0,
+                   answers=answers, marks=marks)
+
+def test_writer_survives_a_bad_attempt(tmp_path):
+    db = tmp_path / "results.sqlite"
+    writer = ResultsWriter(db, flush_s=0.05)
+    writer.record(attempt("ann", 1))
+    writer.record(attempt("bad", 1, marks=10))  # stored fine, then a TypeError while folding into the stats
+    writer.record(attempt("bob", 2, marks="11"))
+    writer.flush()
+
+    stats = writer.stats()
+    assert (stats["written"], stats["failed"]) == (2, 1)
+    assert stats["last_error"].startswith("TypeError")
+    assert {row["Player"] for row in leaderboard("bank", 2, path=db)} == {"ann", "bob"}
+
+    writer.record(attempt("cy", 0, marks="00"))  # still draining
+    writer.flush()
+    assert writer.stats()["written"] == 3
+
+    writer.close()
+    with pytest.raises(RuntimeError):
+        writer.record(attempt("late", 1))
+
+def test_leaderboard_ranks_each_quiz_size_separately(tmp_path):
+    db = tmp_path / "results.sqlite"
+    writer = ResultsWriter(db, flush_s=0.05)
+    writer.record(Attempt("bank", "full", correct=12, total=20, seconds=60, answers="A" * 20, marks="1" * 12 + "0" * 8))
+    writer.record(Attempt("bank", "sampled", correct=5, total=5, seconds=9, answers="A" * 5, marks="1" * 5))
+    writer.flush()
+    writer.close()
+
+    assert [r["Player"] for r in leaderboard("bank", 5, path=db)] == ["sampled"]
+    assert [r["Player"] for r in leaderboard("bank", 20, path=db)] == ["full"]
+
+def test_old_leaderboard_is_rebuilt_per_size(tmp_path):
+    db = tmp_path / "results.sqlite"
+    conn = connect(db)
+    conn.executescript("""
+        DROP TABLE leaderboard;
+        CREATE TABLE leaderboard (bank_id TEXT NOT NULL, player TEXT NOT NULL, attempts INTEGER NOT NULL,
+            best_correct INTEGER NOT NULL, best_seconds REAL NOT NULL, last_at REAL NOT NULL,
+            PRIMARY KEY (bank_id, player));
+    """)
+    rows = [("ann", 3, 5, 40.0), ("ann", 5, 5, 30.0), ("ann", 5, 5, 20.0), ("ann", 8, 10, 50.0)]
+    conn.executemany("INSERT INTO attempts (bank_id, player, correct, total, seconds, finished_at, answers, marks) "
+                     "VALUES ('bank', ?, ?, ?, ?, 0, '', '')", rows)
+    conn.commit()
+    conn.close()
+
+    connect(db).close()
+    assert leaderboard("bank", 5, path=db) == [{"Rank": 1, "Player": "ann", "Best": 5, "Time (s)": 20.0, "Attempts": 3}]
+    assert leaderboard("bank", 10, path=db)[0]["Best"] == 8
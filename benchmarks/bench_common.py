@@ -0,0 +1,73 @@
+"""
+Helpers shared by the per-app benchmarks (`*/benchmarks/bench_*.py`).
+
+Timing: `best_time` keeps the best wall time of several runs; `measure` adds
+the peak traced memory of one extra run.
+
+Reference code: the quiz app's original CSV parser (plain dataclass
+questions with list options), which the quiz parse and memory benchmarks
+compare against.
+
+The app benchmarks put this folder on sys.path themselves, so they keep
+running as plain scripts from their own app directory.
+"""
+import csv
+import io
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, List, Tuple
+
+# -------------------------------
+# Measurement
+# -------------------------------
+def best_time(fn: Callable[[], object], repeat: int) -> Tuple[float, object]:
+    """(best wall seconds of `repeat` runs, last result)."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+def measure(fn: Callable[[], object], repeat: int) -> Tuple[float, int, object]:
+    """(best wall seconds, peak traced bytes of one run, last result)."""
+    best, result = best_time(fn, repeat)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, result
+
+# -------------------------------
+# Reference: original quiz parser
+# -------------------------------
+@dataclass
+class LegacyQuestion:
+    q: str
+    options: List[str]
+    answer_idx: int
+    explanation: str = ""
+
+def legacy_parse_csv(file, warn: Callable[[str], None]) -> List[LegacyQuestion]:
+    text = file.read().decode("utf-8", errors="ignore")
+    reader = csv.DictReader(io.StringIO(text))
+    qs: List[LegacyQuestion] = []
+    for i, row in enumerate(reader, 1):
+        try:
+            q = row.get("question", "").strip()
+            opts = [row.get("option_a", ""), row.get("option_b", ""), row.get("option_c", ""), row.get("option_d", "")]
+            opts = [o.strip() for o in opts]
+            ans_raw = (row.get("answer", "") or "").strip().upper()
+            if ans_raw in ("A", "B", "C", "D"):
+                ans_idx = "ABCD".index(ans_raw)
+            else:
+                ans_idx = int(ans_raw)
+            exp = (row.get("explanation", "") or "").strip()
+            if not q or len(opts) != 4:
+                continue
+            qs.append(LegacyQuestion(q=q, options=opts, answer_idx=ans_idx, explanation=exp))
+        except Exception:
+            warn(f"Skipping invalid row {i}.")
+    return qs
@@ -0,0 +1,335 @@
+"""
+Rerun-latency and load harness for the Streamlit apps in this repo.
+
+Each app gets a scripted interaction (answer/submit/next for the quiz,
+Compute Split for the splitter, CALCULATE for the calculator, ...) that
+`--sessions` simulated users run concurrently, `--steps` times each, through
+Streamlit's testing API (`streamlit.testing.v1.AppTest`). Every script run
+is one sample.
+
+AppTest is not thread-safe, so script runs execute one at a time, much as a
+GIL-bound Streamlit server executes Python. Latency is measured from the
+moment a session asks for a rerun, so it includes the time spent queued
+behind other sessions. Per app it reports:
+
+    p50 / p95 / p99   rerun latency as a user sees it (queue + run), in ms
+    run ms            mean time spent executing the script itself
+    cpu ms            process CPU time per rerun (all sessions together)
+    session KiB       deep size of one session's st.session_state at the end
+    errors            reruns that raised inside the app
+
+Results can be stored as a baseline and later runs checked against it, the
+same way as the expense benchmark.
+
+Usage:
+    python benchmarks/streamlit_load.py                          # all apps
+    python benchmarks/streamlit_load.py --apps quiz,expense --sessions 20 --steps 10
+    python benchmarks/streamlit_load.py --save-baseline
+    python benchmarks/streamlit_load.py --check                  # exit 1 on regressions
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+HERE = Path(__file__).resolve().parent
+DEFAULT_BASELINE = HERE / "streamlit_load_baseline.json"
+QUIZ_DIR = ROOT / "assignments" / "week-01" / "StreamlitApp"
+DAYS_DIR = ROOT / "Python_15days_challenge"
+
+# Keep the harness's quiz banks and synthetic attempts out of the app folder (and its leaderboard)
+os.environ.setdefault("QUIZ_BANK_DIR", str(Path(tempfile.gettempdir()) / "streamlit_load_banks"))
+os.environ["QUIZ_RESULTS_DB"] = str(Path(os.environ["QUIZ_BANK_DIR"]) / "results.sqlite")
+sys.path.insert(0, str(QUIZ_DIR))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+_run_lock = threading.Lock()  # AppTest runs must not overlap
+
+# -------------------------------
+# Helpers
+# -------------------------------
+def click(at: AppTest, label: str) -> None:
+    """Click the first enabled button whose label contains `label`."""
+    for b in at.button:
+        if label in b.label and not b.disabled:
+            b.click()
+            return
+    raise LookupError(f"No enabled button labelled {label!r}")
+
+def quiet_streamlit() -> None:
+    """Silence Streamlit's own logging; app errors are counted in the report instead."""
+    for name, logger in list(logging.root.manager.loggerDict.items()):
+        if name.startswith("streamlit") and isinstance(logger, logging.Logger):
+            logger.setLevel(logging.CRITICAL)
+
+def has_button(at: AppTest, label: str) -> bool:
+    return any(label in b.label and not b.disabled for b in at.button)
+
+def deep_sizeof(obj: Any, seen: Optional[set] = None) -> int:
+    """Approximate retained size of a session-state value (containers, objects, frames)."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float, bool, array)) or obj is None:
+        return size
+    if isinstance(obj, dict):
+        return size + sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(deep_sizeof(v, seen) for v in obj)
+    if hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    for slot in getattr(type(obj), "__slots__", ()):
+        if hasattr(obj, slot):
+            size += deep_sizeof(getattr(obj, slot), seen)
+    return size
+
+# -------------------------------
+# Scripted interactions
+# -------------------------------
+@dataclass
+class App:
+    name: str
+    path: Path
+    setup: Callable[[AppTest], None]          # before the first run (e.g. seed session state)
+    step: Callable[[AppTest, int], List[Callable[[AppTest], None]]]  # actions, each followed by a rerun
+
+def no_setup(at: AppTest) -> None:
+    pass
+
+def quiz_setup(n_questions: int) -> Callable[[AppTest], None]:
+    import quiz_bank
+
+    bank_id = quiz_bank.import_questions([
+        quiz_bank.make_question(f"Load-test question {i}?", (f"a{i}", f"b{i}", f"c{i}", f"d{i}"), i % 4,
+                                f"Because {i % 4}.")
+        for i in range(n_questions)
+    ])
+
+    def setup(at: AppTest) -> None:
+        at.session_state["bank_id"] = bank_id
+    return setup
+
+def quiz_step(at: AppTest, i: int) -> List[Callable[[AppTest], None]]:
+    if has_button(at, "🔄 Restart"):
+        return [lambda a: click(a, "🔄 Restart")]
+    actions = []
+    if at.radio and not at.radio[0].disabled:
+        actions.append(lambda a: a.radio[0].set_value(i % 4))
+        actions.append(lambda a: click(a, "Submit"))
+    actions.append(lambda a: click(a, "Next"))
+    return actions
+
+def expense_step(at: AppTest, i: int) -> List[Callable[[AppTest], None]]:
+    def compute(a: AppTest) -> None:
+        a.number_input[0].set_value(100.0 + i)
+        click(a, "Compute Split")
+    return [compute]
+
+def calculator_step(at: AppTest, i: int) -> List[Callable[[AppTest], None]]:
+    def calculate(a: AppTest) -> None:
+        a.text_input[0].set_value(str(i + 1))
+        a.text_input[1].set_value("3")
+        a.selectbox[0].set_value(a.selectbox[0].options[i % len(a.selectbox[0].options)])
+        click(a, "CALCULATE")
+    return [calculate]
+
+def bmi_step(at: AppTest, i: int) -> List[Callable[[AppTest], None]]:
+    def calculate(a: AppTest) -> None:
+        a.number_input[0].set_value(50.0 + i % 60)
+        a.number_input[1].set_value(170.0)
+        click(a, "Calculate BMI")
+    return [calculate]
+
+def greetings_step(at: AppTest, i: int) -> List[Callable[[AppTest], None]]:
+    def greet(a: AppTest) -> None:
+        a.text_input[0].set_value(f"User {i}")
+        a.slider[0].set_value(i % 100)
+        click(a, "Show Greeting")
+    return [greet]
+
+def make_apps(quiz_questions: int) -> Dict[str, App]:
+    return {
+        "quiz": App("quiz", QUIZ_DIR / "Quiz.py", quiz_setup(quiz_questions), quiz_step),
+        "expense": App("expense", DAYS_DIR / "expense_splitter_Day2.py", no_setup, expense_step),
+        "calculator": App("calculator", DAYS_DIR / "Awful_Calculator_Day3.py", no_setup, calculator_step),
+        "bmi": App("bmi", DAYS_DIR / "BMI_Calculation_Day4.py", no_setup, bmi_step),
+        "greetings": App("greetings", DAYS_DIR / "Greetings_Day1.py", no_setup, greetings_step),
+    }
+
+# -------------------------------
+# Load run
+# -------------------------------
+def run_session(app: App, steps: int, timeout: float) -> Dict[str, Any]:
+    """One simulated user: first load, then `steps` scripted interactions."""
+    latencies: List[float] = []
+    run_times: List[float] = []
+    errors: List[str] = []
+
+    def rerun(at: AppTest) -> None:
+        t0 = time.perf_counter()
+        with _run_lock:
+            t1 = time.perf_counter()
+            at.run(timeout=timeout)
+            t2 = time.perf_counter()
+        latencies.append(t2 - t0)
+        run_times.append(t2 - t1)
+        quiet_streamlit()  # modules imported by the run may have added loggers
+        if at.exception:
+            errors.append(at.exception[0].message)
+
+    at = AppTest.from_file(str(app.path), default_timeout=timeout)
+    with _run_lock:
+        app.setup(at)
+    rerun(at)
+    for i in range(steps):
+        if errors:
+            break  # the app is broken in this environment; one error is enough
+        try:
+            actions = app.step(at, i)
+        except (LookupError, IndexError) as e:
+            errors.append(f"interaction failed: {e}")
+            break
+        for act in actions:
+            try:
+                act(at)
+            except (LookupError, IndexError) as e:
+                errors.append(f"interaction failed: {e}")
+                break
+            rerun(at)
+    with _run_lock:
+        state_bytes = deep_sizeof(at.session_state.to_dict())
+    return {"latencies": latencies, "run_times": run_times, "errors": errors, "state_bytes": state_bytes}
+
+def run_app(app: App, sessions: int, steps: int, timeout: float) -> Dict[str, Any]:
+    quiet_streamlit()
+    cpu0 = time.process_time()
+    wall0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        results = list(pool.map(lambda _: run_session(app, steps, timeout), range(sessions)))
+    wall = time.perf_counter() - wall0
+    cpu = time.process_time() - cpu0
+
+    lat = np.array([t for r in results for t in r["latencies"]]) * 1000
+    run_ms = np.array([t for r in results for t in r["run_times"]]) * 1000
+    errors = [e for r in results for e in r["errors"]]
+    reruns = len(lat)
+    return {
+        "sessions": sessions,
+        "reruns": reruns,
+        "p50_ms": float(np.percentile(lat, 50)) if reruns else 0.0,
+        "p95_ms": float(np.percentile(lat, 95)) if reruns else 0.0,
+        "p99_ms": float(np.percentile(lat, 99)) if reruns else 0.0,
+        "run_ms": float(run_ms.mean()) if reruns else 0.0,
+        "cpu_ms": cpu * 1000 / reruns if reruns else 0.0,
+        "reruns_per_s": reruns / wall if wall else 0.0,
+        "session_kib": float(np.mean([r["state_bytes"] for r in results])) / 1024,
+        "errors": len(errors),
+        "first_error": errors[0] if errors else "",
+    }
+
+# -------------------------------
+# Baseline comparison
+# -------------------------------
+def compare(current: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float, min_ms: float) -> List[str]:
+    """Regressions in tail latency, CPU per rerun, session memory or error count."""
+    problems = []
+    for name, base in baseline.items():
+        cur = current.get(name)
+        if cur is None:
+            continue
+        for key in ("p95_ms", "run_ms", "cpu_ms"):
+            if cur[key] > base[key] * (1 + tolerance) and cur[key] - base[key] > min_ms:
+                problems.append(f"{name}: {key} {base[key]:.1f} -> {cur[key]:.1f}")
+        if cur["session_kib"] > base["session_kib"] * (1 + tolerance) and cur["session_kib"] - base["session_kib"] > 16:
+            problems.append(f"{name}: session {base['session_kib']:.1f} KiB -> {cur['session_kib']:.1f} KiB")
+        if cur["errors"] > base["errors"]:
+            problems.append(f"{name}: errors {base['errors']} -> {cur['errors']} ({cur['first_error']})")
+    return problems
+
+def main(args) -> int:
+    if args.check and not args.save_baseline and not Path(args.baseline).exists():
+        print(f"No baseline at {args.baseline}; run with --save-baseline first.")
+        return 2
+    apps = make_apps(args.quiz_questions)
+    names = args.apps.split(",") if args.apps else list(apps)
+    unknown = [n for n in names if n not in apps]
+    if unknown:
+        print(f"Unknown app(s): {', '.join(unknown)} (choose from {', '.join(apps)})")
+        return 2
+
+    print(f"{args.sessions} concurrent session(s) x {args.steps} interaction(s) per app\n")
+    print(f"{'app':11} {'reruns':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'run ms':>8} {'cpu ms':>8} "
+          f"{'reruns/s':>9} {'session KiB':>12} {'errors':>7}")
+    results: Dict[str, Dict] = {}
+    for name in names:
+        r = run_app(apps[name], args.sessions, args.steps, args.timeout)
+        results[name] = r
+        print(f"{name:11} {r['reruns']:>7} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} "
+              f"{r['run_ms']:>8.1f} {r['cpu_ms']:>8.1f} {r['reruns_per_s']:>9.1f} {r['session_kib']:>12.1f} {r['errors']:>7}")
+        if r["first_error"]:
+            print(f"  ! {name}: {r['first_error'].splitlines()[0][:120]}")
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "streamlit": __import__("streamlit").__version__,
+            "machine": platform.machine(),
+            "sessions": args.sessions,
+            "steps": args.steps,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2))
+        print(f"\nSaved: {Path(args.out).resolve()}")
+    if args.save_baseline:
+        Path(args.baseline).write_text(json.dumps(report, indent=2))
+        print(f"\nBaseline saved: {Path(args.baseline).resolve()}")
+        return 0
+    if args.check:
+        baseline = json.loads(Path(args.baseline).read_text())["results"]
+        problems = compare(results, baseline, args.tolerance, args.min_ms)
+        if problems:
+            print(f"\nREGRESSIONS vs {args.baseline} (tolerance {args.tolerance:.0%}):")
+            for p in problems:
+                print("  -", p)
+            return 1
+        print(f"\nNo regressions vs {args.baseline}.")
+    return 0
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Simulate concurrent users of the Streamlit apps")
+    ap.add_argument("--apps", help="Comma-separated apps (default: quiz,expense,calculator,bmi,greetings)")
+    ap.add_argument("--sessions", type=int, default=10, help="Concurrent simulated sessions per app")
+    ap.add_argument("--steps", type=int, default=10, help="Scripted interactions per session")
+    ap.add_argument("--quiz-questions", type=int, default=200, help="Size of the synthetic quiz bank")
+    ap.add_argument("--timeout", type=float, default=60.0, help="Per-rerun timeout, seconds")
+    ap.add_argument("--out", help="Write this run's results to a JSON file")
+    ap.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON path")
+    ap.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    ap.add_argument("--check", action="store_true", help="Compare against the baseline; exit 1 on regressions")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown/growth (default: 0.25)")
+    ap.add_argument("--min-ms", type=float, default=2.0, help="Ignore latency/CPU differences smaller than this")
+    raise SystemExit(main(ap.parse_args()))